@@ -0,0 +1,83 @@
+"""
+Benchmark dos chunkers: TextChunker (caracteres e tokens) x RecursiveCharacterTextSplitter.
+
+Uso:
+    python scripts/benchmark_chunking.py [arquivo] [--mb 8] [--chunk-size 1000] [--overlap 200]
+
+Sem arquivo, gera um texto sintético com parágrafos, linhas longas e trechos sem espaços.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from src.utils.text_chunker import TextChunker, get_encoding
+
+WORDS = (
+    "épico história usuário critério aceitação sistema documento processamento "
+    "integração requisito entrega valor negócio equipe sprint backlog tarefa"
+).split()
+
+def generate_text(size_mb: float) -> str:
+    """Gera texto sintético com quebras irregulares e sequências longas sem espaço."""
+    rng = random.Random(42)
+    target = int(size_mb * 1024 * 1024)
+    parts = []
+    written = 0
+    while written < target:
+        roll = rng.random()
+        if roll < 0.02:
+            part = rng.choice("abcdef0123456789") * rng.randint(2000, 20000)
+        else:
+            part = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 200)))
+        parts.append(part)
+        written += len(part) + 2
+    return "\n\n".join(parts)
+
+def measure(name: str, split, text: str) -> None:
+    start = time.perf_counter()
+    chunks = split(text)
+    elapsed = time.perf_counter() - start
+    mb = len(text) / 1024 / 1024
+    print(f"{name:<34}{elapsed:>10.2f}{len(chunks):>10}{mb / elapsed:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", nargs="?", help="Arquivo de texto a dividir")
+    parser.add_argument("--mb", type=float, default=8, help="Tamanho do texto sintético em MB")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Tamanho do chunk em caracteres")
+    parser.add_argument("--overlap", type=int, default=200, help="Sobreposição em caracteres")
+    parser.add_argument("--token-chunk-size", type=int, default=256, help="Tamanho do chunk em tokens")
+    parser.add_argument("--token-overlap", type=int, default=32, help="Sobreposição em tokens")
+    args = parser.parse_args()
+
+    if args.file:
+        text = Path(args.file).read_text(encoding="utf-8")
+    else:
+        text = generate_text(args.mb)
+
+    # Carrega o tokenizador fora da medição
+    get_encoding()
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.overlap,
+        length_function=len,
+    )
+    char_chunker = TextChunker(args.chunk_size, args.overlap, count_tokens=False)
+    counted_chunker = TextChunker(args.chunk_size, args.overlap)
+    token_chunker = TextChunker(args.token_chunk_size, args.token_overlap, length_unit="tokens")
+
+    print(f"Texto: {len(text) / 1024 / 1024:.1f} MB")
+    print(f"{'chunker':<34}{'tempo (s)':>10}{'chunks':>10}{'MB/s':>10}")
+    measure("RecursiveCharacterTextSplitter", splitter.split_text, text)
+    measure("TextChunker (caracteres)", char_chunker.split, text)
+    measure("TextChunker (caracteres + tokens)", counted_chunker.split, text)
+    measure("TextChunker (tokens)", token_chunker.split, text)
+
+if __name__ == "__main__":
+    main()
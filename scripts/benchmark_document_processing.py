@@ -0,0 +1,75 @@
+"""
+Benchmark do processamento de diretórios: sequencial x pool de processos.
+
+Uso:
+    python scripts/benchmark_document_processing.py [diretorio] [--workers 1,2,4,8]
+
+Sem diretório, gera um conjunto sintético de arquivos .txt de tamanhos variados.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.rag.document_processor import DocumentProcessor
+
+WORDS = (
+    "épico história usuário critério aceitação sistema documento processamento "
+    "integração requisito entrega valor negócio equipe sprint backlog tarefa"
+).split()
+
+def generate_corpus(directory: Path, files: int, max_kb: int) -> None:
+    """Gera arquivos de texto sintéticos com tamanhos entre 1/8 e max_kb."""
+    rng = random.Random(42)
+    for i in range(files):
+        size = rng.randint(max_kb * 128, max_kb * 1024)
+        lines = []
+        written = 0
+        while written < size:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+            if rng.random() < 0.1:
+                line += "\n"
+            lines.append(line)
+            written += len(line) + 1
+        (directory / f"doc_{i:03d}.txt").write_text("\n".join(lines), encoding="utf-8")
+
+def run(processor: DocumentProcessor, directory: str, workers: int) -> tuple:
+    start = time.perf_counter()
+    if workers == 0:
+        chunks = processor.process_directory(directory)
+    else:
+        chunks = processor.process_directory(directory, parallel=True, max_workers=workers)
+    return time.perf_counter() - start, len(chunks)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", help="Diretório com documentos reais")
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}", help="Números de processos a testar")
+    parser.add_argument("--files", type=int, default=64, help="Arquivos sintéticos a gerar")
+    parser.add_argument("--max-kb", type=int, default=2048, help="Tamanho máximo dos arquivos sintéticos")
+    args = parser.parse_args()
+
+    worker_counts = sorted({int(w) for w in args.workers.split(",") if w.strip()})
+    processor = DocumentProcessor()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.directory
+        if directory is None:
+            print(f"Gerando {args.files} arquivos sintéticos em {tmp}...")
+            generate_corpus(Path(tmp), args.files, args.max_kb)
+            directory = tmp
+
+        baseline, total = run(processor, directory, 0)
+        print(f"{'modo':<14}{'tempo (s)':>12}{'chunks':>10}{'speedup':>10}")
+        print(f"{'sequencial':<14}{baseline:>12.2f}{total:>10}{1.0:>10.2f}")
+        for workers in worker_counts:
+            elapsed, total = run(processor, directory, workers)
+            print(f"{f'{workers} processos':<14}{elapsed:>12.2f}{total:>10}{baseline / elapsed:>10.2f}")
+
+if __name__ == "__main__":
+    main()
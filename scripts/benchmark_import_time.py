@@ -0,0 +1,112 @@
+"""
+Benchmark do tempo de importação e de inicialização do processamento de documentos.
+
+Para cada módulo, executa um interpretador novo com -X importtime e reporta o
+tempo total de importação e os módulos mais caros. Em seguida mede, também em
+processos novos, o custo da primeira resolução de cada loader do registro.
+
+Uso:
+    python scripts/benchmark_import_time.py [modulo ...] [--top 15] [--runs 3]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["src.rag", "src.rag.loader_registry", "src.rag.document_processor", "src.api.app"]
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def run_python(code: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", code]
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+
+def parse_importtime(stderr: str):
+    """Retorna [(cumulativo ms, profundidade, módulo)] da saída de -X importtime."""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((int(match.group(2)) / 1000, len(match.group(3)) // 2, match.group(4)))
+    return entries
+
+def import_profile(module: str, startup: set):
+    """
+    Retorna (tempo total em ms, [(cumulativo ms, módulo)]) da importação.
+
+    Módulos carregados na inicialização do próprio interpretador são ignorados.
+    """
+    result = run_python(f"import {module}", importtime=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    entries = [entry for entry in parse_importtime(result.stderr) if entry[2] not in startup]
+    total = sum(cumulative for cumulative, depth, _ in entries if depth == 0)
+    root = module.split(".")[0]
+    heaviest = sorted(
+        ((cumulative, name) for cumulative, _, name in entries if name.split(".")[0] != root),
+        reverse=True
+    )
+    return total, heaviest
+
+def first_use_ms(extension: str, runs: int) -> float:
+    """Mede, em processos novos, o custo de resolver o loader de uma extensão."""
+    code = (
+        "import time\n"
+        "from src.rag.loader_registry import loader_registry\n"
+        "start = time.perf_counter()\n"
+        f"loader_registry[{extension!r}]\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    samples = []
+    for _ in range(runs):
+        result = run_python(code)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        samples.append(float(result.stdout.strip()))
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Módulos a importar")
+    parser.add_argument("--top", type=int, default=15, help="Módulos mais caros a listar")
+    parser.add_argument("--runs", type=int, default=3, help="Execuções por medição")
+    args = parser.parse_args()
+
+    startup = {name for _, _, name in parse_importtime(run_python("pass", importtime=True).stderr)}
+
+    for module in args.modules:
+        try:
+            totals = []
+            for _ in range(args.runs):
+                total, heaviest = import_profile(module, startup)
+                totals.append(total)
+        except RuntimeError as e:
+            print(f"\n{module}: falha na importação ({e})")
+            continue
+        print(f"\nimport {module}: {statistics.median(totals):.0f} ms (mediana de {args.runs})")
+        for cumulative, name in heaviest[:args.top]:
+            print(f"  {cumulative:>8.1f} ms  {name}")
+
+    print("\nPrimeiro uso de cada loader:")
+    result = run_python(
+        "from src.rag.loader_registry import loader_registry\n"
+        "print(' '.join(sorted(loader_registry)))"
+    )
+    if result.returncode != 0:
+        print(f"  falha ao ler o registro ({result.stderr.strip().splitlines()[-1]})")
+        return
+    for extension in result.stdout.split():
+        try:
+            print(f"  {extension:<6}{first_use_ms(extension, args.runs):>10.1f} ms")
+        except RuntimeError as e:
+            print(f"  {extension:<6}{'falhou':>10} ({e})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Migra os arquivos enviados de data/uploads para o armazenamento por conteúdo (SHA-256).
+
+Para cada registro de processamento cujo file_path ainda está fora do
+armazenamento, move o arquivo para {BLOB_STORE_DIR}/ab/cd/{sha256}{ext} e
+atualiza file_path (e file_hash, quando ausente). O nome original continua
+no campo filename do registro. Registros cujo arquivo não existe mais são
+apenas reportados.
+
+Uso:
+    python scripts/migrate_uploads_to_blobs.py [--dry-run] [--copy]
+"""
+import argparse
+import hashlib
+import shutil
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymongo import MongoClient
+from pymongo.errors import DuplicateKeyError
+from src.config.settings import get_settings
+from src.services.blob_store import get_blob_store
+from src.services.bulk_upload import COPY_BLOCK_SIZE
+
+def hash_file(path: Path) -> str:
+    """Calcula o SHA-256 de um arquivo."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(COPY_BLOCK_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="apenas lista o que seria migrado")
+    parser.add_argument("--copy", action="store_true", help="copia em vez de mover (mantém os originais)")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    store = get_blob_store()
+    client = MongoClient(settings.MONGODB_URI)
+    collection = client[settings.MONGODB_DB_NAME][settings.MONGODB_COLLECTION_NAME]
+
+    migrated = missing = already = 0
+    try:
+        for record in collection.find({}, {"filename": 1, "file_path": 1, "file_hash": 1}):
+            file_path = record.get("file_path")
+            if not file_path:
+                continue
+            if store.contains(file_path):
+                already += 1
+                continue
+
+            source = Path(file_path)
+            if not source.is_file():
+                print(f"Arquivo não encontrado: {file_path} (registro {record['_id']})")
+                missing += 1
+                continue
+
+            # O hash é recalculado: o arquivo pode ter mudado desde o upload
+            file_hash = hash_file(source)
+            if record.get("file_hash") and record["file_hash"] != file_hash:
+                print(f"Aviso: hash diferente do registrado para {file_path} (registro {record['_id']})")
+            suffix = source.suffix
+            target = store.path_for(file_hash, suffix)
+            print(f"{file_path} -> {target}")
+            if args.dry_run:
+                migrated += 1
+                continue
+
+            if args.copy:
+                temp_path = store.temp_dir / f"temp_{uuid.uuid4().hex}"
+                shutil.copy2(source, temp_path)
+                source = temp_path
+            blob_path = store.put(source, file_hash, suffix)
+            update = {"file_path": str(blob_path)}
+            if not record.get("file_hash"):
+                update["file_hash"] = file_hash
+            try:
+                collection.update_one({"_id": record["_id"]}, {"$set": update})
+            except DuplicateKeyError:
+                # Outro registro já tem este conteúdo; o blob é compartilhado
+                print(f"Aviso: conteúdo duplicado de outro registro em {file_path} (registro {record['_id']})")
+                collection.update_one({"_id": record["_id"]}, {"$set": {"file_path": str(blob_path)}})
+            migrated += 1
+    finally:
+        client.close()
+
+    action = "Seriam migrados" if args.dry_run else "Migrados"
+    print(f"\n{action}: {migrated} | Já no armazenamento: {already} | Arquivos ausentes: {missing}")
+
+if __name__ == "__main__":
+    main()
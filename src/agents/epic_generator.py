@@ -4,6 +4,7 @@ from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from src.models.epic import Epic, UserStory
+from src.rag.llm_cache import get_llm_cache, llm_cache_disabled
 import os
 
 class EpicData(BaseModel):
@@ -26,7 +27,8 @@ class EpicGenerator:
         self.llm = ChatOpenAI(
             model_name="gpt-4",
             temperature=0.7,
-            openai_api_key=openai_api_key
+            openai_api_key=openai_api_key,
+            cache=get_llm_cache()
         )
         self.parser = PydanticOutputParser(pydantic_object=EpicData)
         self._setup_prompt()
@@ -78,12 +80,17 @@ class EpicGenerator:
             }
         )
 
-    def generate(self, idea: str) -> Epic:
-        """Generate an epic from an idea."""
+    def generate(self, idea: str, use_cache: bool = True) -> Epic:
+        """Generate an epic from an idea.
+
+        Identical ideas are answered from the LLM response cache unless
+        use_cache is False.
+        """
         try:
             # Generate content using LangChain
             messages = self.prompt.format_messages(idea=idea)
-            response = self.llm.invoke(messages)
+            with llm_cache_disabled(not use_cache):
+                response = self.llm.invoke(messages)
             
             # Parse the response
             data = self.parser.parse(response.content)
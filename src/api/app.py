@@ -3,7 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 import os
 from datetime import datetime
-from src.api.routers import epics, documents
+from src.api.lifespan import lifespan
+from src.api.middleware.upload_limit import UploadSizeLimitMiddleware
+from src.api.routers import epics, documents, rag, monitoring
+from src.config import get_settings
 
 # Configuração de logging
 logging.basicConfig(
@@ -17,7 +20,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Ada API",
     description="API para processamento assíncrono de documentos e geração de épicos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configuração CORS
@@ -29,9 +33,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Rejeita uploads acima do limite antes de o corpo ser armazenado
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=get_settings().MAX_UPLOAD_SIZE,
+    paths=["/api/documents/documents/upload"]
+)
+
 # Incluir routers
 app.include_router(epics.router, prefix="/api/epics", tags=["epics"])
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
+app.include_router(rag.router, prefix="/api/rag", tags=["rag"])
+app.include_router(monitoring.router, prefix="/api")
 
 # Middleware para logging e tratamento de erros
 @app.middleware("http")
@@ -69,6 +82,8 @@ async def root():
         "endpoints": {
             "epics": "/api/epics",
             "documents": "/api/documents",
+            "rag": "/api/rag",
+            "monitoring": "/api/monitoring",
             "docs": "/docs",
             "openapi": "/openapi.json"
         }
@@ -0,0 +1,39 @@
+from contextlib import asynccontextmanager
+import logging
+from fastapi import FastAPI
+from src.api.routers import documents
+from src.config import MongoDB, get_settings
+from src.services.process_worker import create_document_worker
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown shared by every app that serves the API routers.
+
+    Connects to MongoDB and runs the document job worker in-process, so
+    uploads enqueued by the documents router are processed whichever
+    entrypoint (src.main or src.api.app) is served.
+    """
+    settings = get_settings()
+    logger.info("Starting up Ada API...")
+    await MongoDB.connect()
+    logger.info("Connected to MongoDB")
+
+    document_worker = None
+    if settings.JOB_WORKER_ENABLED:
+        # Share the router's service so /documents/pipeline reports this worker
+        document_worker = create_document_worker(documents.document_service)
+        document_worker.start()
+        logger.info("Started document job worker")
+    try:
+        yield
+    finally:
+        logger.info("Shutting down Ada API...")
+        if document_worker is not None:
+            document_worker.stop(timeout=30)
+            documents.document_service.pipeline.shutdown()
+            logger.info("Stopped document job worker")
+        await MongoDB.disconnect()
+        logger.info("Disconnected from MongoDB")
@@ -1,25 +1,23 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends, Request, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 import logging
 import os
 import time
-import aiofiles
 from pathlib import Path
 from motor.motor_asyncio import AsyncIOMotorCollection
 from src.config.database import get_epic_collection
 from src.models.document import DocumentProcessingResponse, ProcessingStatus
 from src.services.document_service import DocumentService
+from src.services.bulk_upload import UploadTooLarge, stream_to_disk
+from src.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 document_service = DocumentService()
 
-# Ensure upload directory exists
-UPLOAD_DIR = Path("data/uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 @router.get("/processing")
 async def list_processing():
     """Lista documentos em processamento"""
@@ -70,7 +68,8 @@ async def get_processing_status(processing_id: str) -> DocumentProcessingRespons
             id=record.id,
             filename=record.filename,
             status=record.status,
-            message=f"Document processing {record.status}"
+            message=f"Document processing {record.status}",
+            progress=record.progress
         )
     except HTTPException as he:
         raise he
@@ -81,6 +80,48 @@ async def get_processing_status(processing_id: str) -> DocumentProcessingRespons
             detail=f"Error getting processing status: {str(e)}"
         )
 
+@router.get("/documents/processing/{processing_id}/events")
+async def stream_processing_events(processing_id: str, request: Request):
+    """
+    Stream processing status and progress (chunks, bytes, stage timings, ETA)
+    as Server-Sent Events until the document reaches a final status
+    """
+    record = await document_service.get_processing_status(processing_id)
+    if not record:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Processing record not found: {processing_id}"
+        )
+
+    keepalive_interval = get_settings().PROGRESS_KEEPALIVE_INTERVAL
+
+    async def events():
+        last_sent = time.monotonic()
+        async for update in document_service.watch_processing(processing_id):
+            if await request.is_disconnected():
+                logger.info(f"[PROGRESS] Client disconnected from {processing_id}")
+                break
+            if update is None:
+                if time.monotonic() - last_sent >= keepalive_interval:
+                    last_sent = time.monotonic()
+                    yield ": keep-alive\n\n"
+                continue
+            last_sent = time.monotonic()
+            response = DocumentProcessingResponse(
+                id=update.id,
+                filename=update.filename,
+                status=update.status,
+                message=f"Document processing {update.status}",
+                progress=update.progress
+            )
+            yield f"event: progress\ndata: {response.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/documents/retry-failed")
 async def retry_failed_documents():
     """
@@ -96,14 +137,58 @@ async def retry_failed_documents():
             detail=f"Error retrying failed documents: {str(e)}"
         )
 
+@router.get("/documents/jobs")
+async def get_job_stats():
+    """
+    Get job queue counters by job type and status
+    """
+    try:
+        return document_service.get_job_stats()
+    except Exception as e:
+        logger.error(f"Error getting job stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting job stats: {str(e)}"
+        )
+
+@router.get("/documents/lanes")
+async def get_lane_stats():
+    """
+    Get queue depth, recent throughput and expected wait per priority lane
+    """
+    try:
+        return document_service.get_lane_stats()
+    except Exception as e:
+        logger.error(f"Error getting lane stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting lane stats: {str(e)}"
+        )
+
+@router.get("/documents/pipeline")
+async def get_pipeline_stats():
+    """
+    Get per-stage throughput, utilisation and queue depth of the ingestion pipeline
+    """
+    try:
+        return document_service.get_pipeline_stats()
+    except Exception as e:
+        logger.error(f"Error getting pipeline stats: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting pipeline stats: {str(e)}"
+        )
+
 @router.post("/documents/upload")
 async def upload_document(
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    request: Request = Request
+    request: Request = Request,
+    tenant: Optional[str] = Header(None, alias="X-Tenant-ID")
 ):
     """
-    Upload a new document and initiate asynchronous processing
+    Upload a new document and initiate asynchronous processing.
+
+    Uploads are scheduled fairly across the X-Tenant-ID values.
     """
     start_time = time.time()
     logger.info(f"[UPLOAD] Started upload request for file: {file.filename}")
@@ -118,23 +203,26 @@ async def upload_document(
                 detail=f"Unsupported file extension: {file_extension}"
             )
         
-        # Save uploaded file to temporary location first
-        temp_file_path = UPLOAD_DIR / f"temp_{file.filename}"
-        logger.info(f"[UPLOAD] Saving file to temporary location: {temp_file_path}")
+        # Oversized bodies were already cut off by UploadSizeLimitMiddleware
+        # while arriving; this copy checks the exact file size and hashes the
+        # spooled upload into a temporary file in large blocks
+        max_size = get_settings().MAX_UPLOAD_SIZE
         save_start = time.time()
-        
-        # Salvar arquivo de forma assíncrona
-        content = await file.read()
-        async with aiofiles.open(str(temp_file_path), "wb") as buffer:
-            await buffer.write(content)
+        try:
+            temp_file_path, file_hash, file_size = await run_in_threadpool(
+                stream_to_disk, file.file, document_service.blob_store.temp_dir, max_size
+            )
+        except UploadTooLarge as e:
+            logger.warning(f"[UPLOAD] Rejected {file.filename}: {str(e)}")
+            raise HTTPException(status_code=413, detail=str(e))
             
-        logger.info(f"[UPLOAD] File saved in {time.time() - save_start:.2f} seconds")
+        logger.info(f"[UPLOAD] File saved to {temp_file_path} ({file_size} bytes) in {time.time() - save_start:.2f} seconds")
         
         # Check for duplicates
         try:
             is_duplicate, existing_id, message = await document_service.check_duplicate_document(
                 filename=file.filename,
-                file_path=str(temp_file_path)
+                file_hash=file_hash
             )
             
             if is_duplicate:
@@ -163,9 +251,8 @@ async def upload_document(
             temp_file_path.unlink()
             raise e
         
-        # Move file to final location
-        final_file_path = UPLOAD_DIR / file.filename
-        temp_file_path.rename(final_file_path)
+        # Move file into the content-addressed store; the record keeps the filename
+        final_file_path = document_service.blob_store.put(temp_file_path, file_hash, file_extension)
         
         # Create processing record
         logger.info("[UPLOAD] Creating processing record...")
@@ -173,14 +260,18 @@ async def upload_document(
         try:
             processing_record = await document_service.create_processing_record(
                 filename=file.filename,
-                file_path=str(final_file_path)
+                file_path=str(final_file_path),
+                tenant=tenant,
+                file_hash=file_hash,
+                file_size=file_size
             )
             logger.info(f"[UPLOAD] Processing record created in {time.time() - record_start:.2f} seconds. ID: {processing_record.id}")
         except ValueError as ve:
             # If we get a duplicate error here, it means another request uploaded the same file
             # between our check and insert
+            # The blob is left in place: it may be shared with the existing
+            # record, otherwise garbage collection removes it
             logger.warning(f"[UPLOAD] Duplicate detected during record creation: {str(ve)}")
-            final_file_path.unlink()  # Remove the uploaded file
             return {
                 "status": "duplicate",
                 "message": str(ve),
@@ -194,12 +285,9 @@ async def upload_document(
                 }
             }
         
-        # Queue document for background processing
+        # Queue document for background processing (persisted in the job queue)
         logger.info(f"[UPLOAD] Queueing document for processing: {processing_record.id}")
-        background_tasks.add_task(
-            document_service.process_document,
-            str(processing_record.id)
-        )
+        await document_service.process_document(str(processing_record.id))
 
         total_time = time.time() - start_time
         logger.info(f"[UPLOAD] Request completed in {total_time:.2f} seconds")
@@ -233,6 +321,68 @@ async def upload_document(
             detail=error_msg
         )
 
+@router.post("/documents/upload/bulk")
+async def upload_documents_bulk(
+    files: List[UploadFile] = File(...),
+    request: Request = Request,
+    tenant: Optional[str] = Header(None, alias="X-Tenant-ID")
+):
+    """
+    Upload several documents, or zip/tar archives of documents, as one batch.
+
+    Archive members are streamed to disk one at a time; duplicates are
+    reported in the response instead of failing the batch.
+    """
+    start_time = time.time()
+    logger.info(f"[BULK] Started bulk upload with {len(files)} files")
+
+    try:
+        batch = await run_in_threadpool(
+            document_service.create_batch,
+            [(file.filename, file.file) for file in files],
+            tenant
+        )
+    except Exception as e:
+        error_msg = f"Error uploading documents: {str(e)}"
+        logger.error(f"[BULK] Error after {time.time() - start_time:.2f} seconds: {error_msg}")
+        raise HTTPException(
+            status_code=500,
+            detail=error_msg
+        )
+
+    logger.info(
+        f"[BULK] Batch {batch['batch_id']} created in {time.time() - start_time:.2f} seconds: "
+        f"{len(batch['documents'])} queued, {len(batch['skipped'])} skipped"
+    )
+    base_url = str(request.base_url)
+    return {
+        "status": "success",
+        "message": f"{len(batch['documents'])} documents queued for processing",
+        "batch_id": batch["batch_id"],
+        "documents": batch["documents"],
+        "skipped": batch["skipped"],
+        "links": {
+            "progress": f"{base_url}api/documents/batches/{batch['batch_id']}"
+        }
+    }
+
+@router.get("/documents/batches/{batch_id}")
+async def get_batch_progress(batch_id: str):
+    """
+    Get aggregate status, progress and ETA of a bulk upload batch
+    """
+    try:
+        progress = await run_in_threadpool(document_service.get_batch_progress, batch_id)
+    except Exception as e:
+        logger.error(f"Error getting batch progress: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting batch progress: {str(e)}"
+        )
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return progress
+
 @router.post("/")
 async def upload_document(
     file: UploadFile = File(...),
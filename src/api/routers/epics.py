@@ -117,12 +117,14 @@ async def search_similar_epics(
 
 @router.post("/generate", response_model=Epic)
 async def generate_epic(
-    idea: str = Query(..., min_length=10)
+    idea: str = Query(..., min_length=10),
+    use_cache: bool = Query(True, description="Reutiliza a resposta em cache para a mesma ideia")
 ) -> Epic:
     """
     Gera um novo épico a partir de uma ideia usando IA
+    - use_cache: false força uma nova geração, ignorando o cache de respostas
     """
     try:
-        return epic_generator.generate(idea)
+        return epic_generator.generate(idea, use_cache=use_cache)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao gerar épico: {str(e)}")
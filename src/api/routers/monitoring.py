@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from datetime import datetime, timedelta
 from typing import Optional
 from src.services.tracking_service import TrackingService
+from src.rag.ocr import get_ocr_engine
 
 router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
@@ -28,6 +29,8 @@ async def get_metrics(
     return {
         "api_metrics": await tracking_service.get_api_metrics(start_date, end_date),
         "azure_metrics": await tracking_service.get_azure_metrics(start_date, end_date),
+        "cache_metrics": await tracking_service.get_cache_metrics(start_date, end_date),
+        "ocr": get_ocr_engine().get_stats(),
         "performance": await tracking_service.get_performance_metrics(start_date, end_date)
     }
 
@@ -45,6 +48,25 @@ async def get_azure_costs(
 
     return await tracking_service.get_azure_metrics(start_date, end_date)
 
+@router.get("/cache")
+async def get_cache_metrics(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    tracking_service: TrackingService = Depends(get_tracking_service)
+):
+    """Get cache hit/miss, size and latency metrics per namespace"""
+    if not start_date:
+        start_date = datetime.utcnow() - timedelta(days=1)
+    if not end_date:
+        end_date = datetime.utcnow()
+
+    return await tracking_service.get_cache_metrics(start_date, end_date)
+
+@router.get("/ocr")
+async def get_ocr_metrics():
+    """Get OCR queue depth and throughput for this process"""
+    return get_ocr_engine().get_stats()
+
 @router.get("/errors")
 async def get_recent_errors(
     limit: int = Query(10, ge=1, le=100),
@@ -0,0 +1,87 @@
+"""
+Router for RAG query endpoints
+"""
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from functools import lru_cache
+import json
+import logging
+from src.config.settings import get_settings
+from src.rag.rag_engine import RAGEngine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+class QueryRequest(BaseModel):
+    """Request body for RAG queries"""
+    question: str = Field(..., min_length=3, description="Pergunta do usuário")
+    max_results: int = Field(5, ge=1, le=20)
+    similarity_threshold: float = Field(0.7, ge=0, le=1)
+    use_cache: bool = Field(True, description="Reutiliza respostas em cache do LLM")
+
+@lru_cache()
+def get_rag_engine() -> RAGEngine:
+    """Returns a shared RAG engine instance"""
+    settings = get_settings()
+    return RAGEngine(mongodb_uri=settings.MONGODB_URI)
+
+def _sse_event(event: str, data) -> str:
+    """Formats a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@router.post("/query")
+async def query(
+    request: QueryRequest,
+    engine: RAGEngine = Depends(get_rag_engine)
+) -> dict:
+    """
+    Query the indexed documents and return the full answer
+    """
+    try:
+        return await engine.query(
+            request.question,
+            max_results=request.max_results,
+            similarity_threshold=request.similarity_threshold,
+            use_cache=request.use_cache
+        )
+    except Exception as e:
+        logger.error(f"Error querying documents: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error querying documents: {str(e)}"
+        )
+
+@router.post("/query/stream")
+async def stream_query(
+    request: QueryRequest,
+    engine: RAGEngine = Depends(get_rag_engine)
+) -> StreamingResponse:
+    """
+    Query the indexed documents streaming the answer as Server-Sent Events.
+
+    Events, in order: `sources` (once retrieval finishes), `token` (one per
+    answer fragment) and `done` (timings and token usage). Failures after the
+    stream has started are reported as an `error` event.
+    """
+    async def event_stream():
+        try:
+            async for event in engine.stream_query(
+                request.question,
+                max_results=request.max_results,
+                similarity_threshold=request.similarity_threshold
+            ):
+                yield _sse_event(event["event"], event["data"])
+        except Exception as e:
+            logger.error(f"Error streaming query: {str(e)}")
+            yield _sse_event("error", {"detail": f"Error querying documents: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -3,11 +3,19 @@ from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
 from src.api.models.epics import Epic, UserStory
+from src.rag.memoize import invalidates, memoize
+
+# TTL curto como rede de segurança; as tags invalidam as leituras a cada escrita
+EPIC_CACHE_TTL = 300
+
+def _collection_scope(service: "EpicService") -> str:
+    return service.collection.full_name
 
 class EpicService:
     def __init__(self, collection: AsyncIOMotorCollection):
         self.collection = collection
         
+    @invalidates(["epics"])
     async def create_epic(self, epic: Epic) -> str:
         epic_dict = epic.model_dump(exclude_none=True)
         epic_dict["created_at"] = datetime.utcnow()
@@ -16,6 +24,7 @@ class EpicService:
         result = await self.collection.insert_one(epic_dict)
         return str(result.inserted_id)
     
+    @memoize("epics.get", tags=["epic:{epic_id}"], ttl=EPIC_CACHE_TTL, scope=_collection_scope)
     async def get_epic(self, epic_id: str) -> Optional[Epic]:
         if not ObjectId.is_valid(epic_id):
             return None
@@ -25,6 +34,7 @@ class EpicService:
             return Epic(**epic_dict)
         return None
     
+    @invalidates(["epics", "epic:{epic_id}"])
     async def update_epic(self, epic_id: str, epic_update: Epic) -> Optional[Epic]:
         if not ObjectId.is_valid(epic_id):
             return None
@@ -43,12 +53,14 @@ class EpicService:
             return Epic(**result)
         return None
     
+    @invalidates(["epics", "epic:{epic_id}"])
     async def delete_epic(self, epic_id: str) -> bool:
         if not ObjectId.is_valid(epic_id):
             return False
         result = await self.collection.delete_one({"_id": ObjectId(epic_id)})
         return result.deleted_count > 0
         
+    @memoize("epics.list", tags=["epics"], ttl=EPIC_CACHE_TTL, scope=_collection_scope)
     async def list_epics(
         self,
         skip: int = 0,
@@ -39,6 +39,61 @@ class Settings(BaseSettings):
     PROCESSED_DIR: str = "data/processed"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB em bytes
     ALLOWED_EXTENSIONS: str = ".txt,.pdf,.md,.csv,.xlsx,.xls"
+    BULK_UPLOAD_MAX_FILES: int = 5000  # Arquivos por lote de upload (incluindo membros de arquivos compactados)
+    DOCUMENT_PROCESSING_WORKERS: int = 0  # 0 = número de CPUs
+    PDF_PAGES_PER_TASK: int = 8
+    PDF_PAGE_CACHE_TTL: int = 604800  # 7 dias em segundos
+    PARSED_TEXT_CACHE_TTL: int = 2592000  # 30 dias em segundos
+    TABLE_CHUNK_MAX_TOKENS: int = 512
+    BLOB_STORE_DIR: str = "data/blobs"  # Arquivos enviados, endereçados pelo SHA-256
+    BLOB_STORE_FANOUT: int = 2  # Níveis de subdiretórios (2 caracteres hex cada)
+    BLOB_GC_INTERVAL: int = 86400  # Intervalo da coleta de arquivos órfãos (segundos)
+    BLOB_GC_GRACE_PERIOD: int = 3600  # Idade mínima para remover um arquivo órfão (segundos)
+
+    # Pipeline de ingestão (parse -> embed -> write)
+    INGESTION_PARSE_WORKERS: int = 0  # 0 = DOCUMENT_PROCESSING_WORKERS
+    INGESTION_EMBED_WORKERS: int = 4  # Chamadas simultâneas ao modelo de embeddings
+    INGESTION_EMBED_BATCH_SIZE: int = 64
+    INGESTION_WRITE_BATCH_SIZE: int = 256
+    INGESTION_QUEUE_SIZE: int = 8  # Capacidade das filas entre estágios
+    PROGRESS_POLL_INTERVAL: float = 1.0  # Sem change streams, intervalo de consulta do progresso
+    PROGRESS_KEEPALIVE_INTERVAL: float = 15.0  # Keep-alive do stream de progresso (SSE)
+
+    # OCR de PDFs digitalizados
+    OCR_ENABLED: bool = True
+    OCR_MAX_WORKERS: int = 2
+    OCR_MAX_PENDING: int = 8
+    OCR_DPI: int = 300
+    OCR_LANGUAGE: str = "por+eng"
+    OCR_MIN_TEXT_CHARS: int = 20
+
+    # Fila de jobs
+    JOB_QUEUE_COLLECTION: str = "jobs"
+    JOB_WORKER_ENABLED: bool = True  # Executa um worker junto com a API
+    JOB_WORKER_CONCURRENCY: int = 3  # Jobs simultâneos por processo
+    JOB_VISIBILITY_TIMEOUT: int = 300  # Lease em segundos, renovado enquanto o job executa
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: int = 10  # Segundos; dobra a cada tentativa
+    JOB_RETRY_MAX_DELAY: int = 3600
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_RETENTION: int = 604800  # Jobs concluídos são removidos após 7 dias
+    JOB_FAST_LANE_MAX_BYTES: int = 1048576  # Arquivos até 1MB vão para a fila rápida
+    JOB_STANDARD_LANE_MAX_BYTES: int = 20971520  # Acima de 20MB: fila bulk
+    JOB_BULK_LANE_MAX_RUNNING: int = 1  # Jobs bulk simultâneos por processo
+    JOB_TENANT_WEIGHTS: str = ""  # Pesos por tenant, ex.: "time-a:2,time-b:1"
+    JOB_WAIT_ESTIMATE_WINDOW: int = 900  # Janela da vazão usada na estimativa de espera
+
+    # Cache
+    CACHE_DEFAULT_TTL: int = 3600  # 1 hora em segundos
+    CACHE_MAX_BYTES: int = 536870912  # 512MB em bytes
+    CACHE_MAX_ENTRY_BYTES: int = 8388608  # 8MB em bytes
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    CACHE_RETRY_INTERVAL: int = 60  # Segundos sem cache opcional após falha ao conectar
+
+    # LLM Response Cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL: int = 86400  # 24 horas em segundos
+    LLM_CACHE_MAX_ENTRIES: int = 10000
     
     @validator("MAX_UPLOAD_SIZE", pre=True)
     def validate_max_upload_size(cls, v):
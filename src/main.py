@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-from src.api.routers import epics, documents
-from src.config import MongoDB, get_settings
+from src.api.lifespan import lifespan
+from src.api.middleware.upload_limit import UploadSizeLimitMiddleware
+from src.api.routers import epics, documents, rag, monitoring
+from src.config import get_settings
 
 # Configure logging
 logging.basicConfig(
@@ -18,7 +20,8 @@ app = FastAPI(
     title=settings.APP_NAME,
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -30,23 +33,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Reject oversized single uploads before the body is spooled
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE,
+    paths=["/api/documents/documents/upload"]
+)
+
 # Include routers
 app.include_router(epics.router, prefix="/api/epics", tags=["epics"])
 app.include_router(documents.router, prefix="/api/documents", tags=["documents"])
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    logger.info("Starting up Ada API...")
-    await MongoDB.connect()
-    logger.info("Connected to MongoDB")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Clean up resources on shutdown."""
-    logger.info("Shutting down Ada API...")
-    await MongoDB.disconnect()
-    logger.info("Disconnected from MongoDB")
+app.include_router(rag.router, prefix="/api/rag", tags=["rag"])
+app.include_router(monitoring.router, prefix="/api")
 
 @app.get("/")
 async def root():
@@ -59,6 +57,8 @@ async def root():
         "endpoints": {
             "epics": "/api/epics",
             "documents": "/api/documents",
+            "rag": "/api/rag",
+            "monitoring": "/api/monitoring",
             "docs": "/docs",
             "openapi": "/openapi.json"
         }
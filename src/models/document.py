@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from enum import Enum
 from pydantic import BaseModel
 
@@ -10,6 +10,17 @@ class ProcessingStatus(str, Enum):
     FAILED = "failed"
     DUPLICATE = "duplicate"
 
+class ProcessingProgress(BaseModel):
+    """Progress of a document through the ingestion stages"""
+    stage: str = "queued"
+    bytes_total: Optional[int] = None
+    bytes_parsed: int = 0
+    chunks_total: Optional[int] = None
+    chunks_embedded: int = 0
+    stage_timings: Dict[str, float] = {}
+    eta_seconds: Optional[float] = None
+    started_at: Optional[datetime] = None
+
 class DocumentProcessing(BaseModel):
     """Model for tracking document processing status"""
     id: str
@@ -22,6 +33,10 @@ class DocumentProcessing(BaseModel):
     chunks_processed: Optional[int] = None
     embeddings_stored: Optional[int] = None
     file_hash: Optional[str] = None
+    file_size: Optional[int] = None
+    tenant: Optional[str] = None
+    batch_id: Optional[str] = None
+    progress: Optional[ProcessingProgress] = None
 
 class DocumentProcessingResponse(BaseModel):
     """Response model for document processing status"""
@@ -29,3 +44,4 @@ class DocumentProcessingResponse(BaseModel):
     filename: str
     status: ProcessingStatus
     message: str
+    progress: Optional[ProcessingProgress] = None
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from enum import Enum
+from pydantic import BaseModel
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+class JobLane(str, Enum):
+    FAST = "fast"
+    STANDARD = "standard"
+    BULK = "bulk"
+
+class Job(BaseModel):
+    """Model for a job in the persistent job queue"""
+    id: str
+    type: str
+    payload: Dict[str, Any]
+    status: JobStatus
+    lane: JobLane = JobLane.STANDARD
+    tenant: str = "default"
+    cost: float = 1.0
+    attempts: int = 0
+    max_attempts: int
+    run_at: datetime
+    created_at: datetime
+    updated_at: datetime
+    key: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
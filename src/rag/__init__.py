@@ -1,15 +1,30 @@
 """
 Ada RAG System - Sistema de Retrieval-Augmented Generation
 """
+from importlib import import_module
 
-from .document_processor import DocumentProcessor
-from .embeddings_manager import EmbeddingsManager
-from .rag_engine import RAGEngine
-from .cache_manager import CacheManager
-
-__all__ = [
-    'DocumentProcessor',
-    'EmbeddingsManager',
-    'RAGEngine',
-    'CacheManager'
-]
\ No newline at end of file
+# Exportações importadas sob demanda: importar um submódulo (por exemplo,
+# src.rag.loader_registry) não carrega langchain_openai, pymongo ou motor
+_EXPORTS = {
+    'DocumentProcessor': '.document_processor',
+    'EmbeddingsManager': '.embeddings_manager',
+    'RAGEngine': '.rag_engine',
+    'CacheManager': '.cache_manager',
+    'AsyncCacheManager': '.async_cache_manager',
+    'MongoLLMCache': '.llm_cache',
+    'memoize': '.memoize',
+    'invalidates': '.memoize'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
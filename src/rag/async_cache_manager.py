@@ -0,0 +1,463 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from pymongo import ReturnDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
+from src.config.database import MongoDB
+from src.config.settings import get_settings
+from .cache_manager import BaseCacheManager, generate_cache_key
+from .cache_metrics import CacheMetrics
+from .memory_cache import CacheEntry
+
+logger = logging.getLogger(__name__)
+
+class AsyncCacheManager(BaseCacheManager):
+    """Gerencia o cache do sistema RAG para código assíncrono (motor).
+    
+    Usa o pool de conexões único da aplicação (MongoDB) e grava na mesma
+    coleção e no mesmo formato de chave do CacheManager síncrono, de modo que
+    os dois compartilham entradas e invalidações.
+    """
+    
+    def __init__(
+        self,
+        collection_name: str = "cache",
+        default_ttl: int = 3600,  # 1 hora em segundos
+        **kwargs
+    ):
+        """
+        Inicializa o gerenciador de cache assíncrono.
+        
+        Args:
+            collection_name: Nome da coleção
+            default_ttl: Tempo padrão de vida do cache em segundos
+            **kwargs: Opções da camada em memória (ver BaseCacheManager)
+        """
+        super().__init__(default_ttl=default_ttl, **kwargs)
+        self.collection_name = collection_name
+        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.generations: Optional[AsyncIOMotorCollection] = None
+        self.metrics_collection: Optional[AsyncIOMotorCollection] = None
+        # Locks por chave (lock, interessados) para o single-flight
+        self._key_locks: Dict[str, list] = {}
+
+    async def initialize(self):
+        """Obtém as coleções do pool da aplicação e garante os índices."""
+        if self.collection is None:
+            collection = await MongoDB.get_collection(self.collection_name)
+            self.generations = await MongoDB.get_collection(f"{self.collection_name}_generations")
+            self.metrics_collection = await MongoDB.get_collection(CacheMetrics.COLLECTION_NAME)
+            await collection.create_index("key", unique=True)
+            await collection.create_index([("namespace", 1), ("generation", 1)])
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+            await collection.create_index("last_accessed_at")
+            self.collection = collection
+
+    async def _maybe_flush_metrics(self) -> None:
+        """Grava as métricas pendentes se o intervalo de flush já passou."""
+        if self.metrics.flush_due():
+            await self.metrics.aflush(self.metrics_collection)
+
+    async def _enforce_budget(self) -> int:
+        """
+        Remove entradas se a coleção ultrapassou o orçamento de bytes.
+        
+        Returns:
+            Número de entradas removidas
+        """
+        stats = await self.collection.aggregate(
+            [{"$collStats": {"storageStats": {}}}]
+        ).to_list(1)
+        self._stored_bytes = stats[0]["storageStats"]["size"] if stats else 0
+        if self._stored_bytes <= self.max_bytes:
+            return 0
+        
+        bytes_to_free = self._stored_bytes - int(self.max_bytes * self.EVICTION_LOW_WATERMARK)
+        candidates = await self.collection.find(
+            {},
+            {"key": 1, "namespace": 1, "size": 1, "hits": 1, "last_accessed_at": 1}
+        ).sort("last_accessed_at", 1).limit(self.eviction_sample).to_list(None)
+        evicted = self._select_evictions(candidates, bytes_to_free)
+        if not evicted:
+            return 0
+        keys = [doc["key"] for doc in evicted]
+        for key in keys:
+            self.local_cache.delete(key)
+        result = await self.collection.delete_many({"key": {"$in": keys}})
+        self._record_evictions(evicted)
+        logger.info(f"Cache evicted: {result.deleted_count} items to stay within {self.max_bytes} bytes")
+        return result.deleted_count
+
+    async def _after_write(self) -> None:
+        """Tarefas periódicas após gravações: orçamento e flush de métricas."""
+        if self._budget_check_due():
+            try:
+                await self._enforce_budget()
+            except Exception as e:
+                logger.error(f"Erro ao aplicar o orçamento do cache: {str(e)}")
+        await self._maybe_flush_metrics()
+
+    async def _get_generation(self, namespace: str) -> int:
+        """
+        Retorna a geração atual de um namespace.
+        
+        Args:
+            namespace: Namespace da chave
+            
+        Returns:
+            Contador de geração (0 se o namespace nunca foi invalidado)
+        """
+        generation = self._cached_generation(namespace)
+        if generation is None:
+            doc = await self.generations.find_one({"_id": namespace})
+            generation = doc["generation"] if doc else 0
+            self._remember_generation(namespace, generation)
+        return generation
+
+    async def get_generations(self, namespaces: List[str]) -> Dict[str, int]:
+        """
+        Retorna a geração atual de vários namespaces com uma única consulta.
+        
+        Args:
+            namespaces: Namespaces a consultar
+            
+        Returns:
+            Geração de cada namespace
+        """
+        generations = {}
+        missing = []
+        for namespace in namespaces:
+            generation = self._cached_generation(namespace)
+            if generation is None:
+                missing.append(namespace)
+            else:
+                generations[namespace] = generation
+        if missing:
+            await self.initialize()
+            found = {
+                doc["_id"]: doc["generation"]
+                async for doc in self.generations.find({"_id": {"$in": missing}})
+            }
+            for namespace in missing:
+                generations[namespace] = found.get(namespace, 0)
+                self._remember_generation(namespace, generations[namespace])
+        return generations
+
+    async def _generate_keys(self, prefix: str, params_list: List[Dict]) -> List[str]:
+        """Gera as chaves de vários parâmetros com uma única leitura de geração."""
+        generation = await self._get_generation(prefix)
+        return [generate_cache_key(prefix, generation, params) for params in params_list]
+
+    async def _get_entries(self, prefix: str, keys: List[str]) -> Dict[str, CacheEntry]:
+        """
+        Busca entradas nas duas camadas com uma única consulta ao MongoDB.
+        
+        Args:
+            prefix: Prefixo das chaves
+            keys: Chaves do cache
+            
+        Returns:
+            Dicionário chave -> entrada com as chaves encontradas
+        """
+        start = time.perf_counter()
+        found = {}
+        for key in keys:
+            entry = self._lookup_local(prefix, key)
+            if entry is not None:
+                found[key] = entry
+        missing = [key for key in keys if key not in found]
+        if missing:
+            from_mongo = []
+            async for doc in self.collection.find({"key": {"$in": missing}}):
+                entry = self._promote(prefix, doc)
+                if entry is not None:
+                    found[doc["key"]] = entry
+                    from_mongo.append(doc["key"])
+            if from_mongo:
+                await self.collection.update_many(
+                    {"key": {"$in": from_mongo}},
+                    self._access_update()
+                )
+        self.metrics.increment(prefix, "misses", len(set(keys) - set(found)))
+        self._observe_get(prefix, start)
+        await self._maybe_flush_metrics()
+        return found
+
+    async def _set_entries(
+        self,
+        prefix: str,
+        entries: List[Tuple[str, Any, float]],
+        ttl: int
+    ) -> bool:
+        """
+        Grava entradas nas duas camadas com um único bulk_write.
+        
+        Args:
+            prefix: Prefixo das chaves
+            entries: Lista de tuplas (chave, valor, tempo de cálculo)
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            False se nenhum valor foi admitido por tamanho
+        """
+        start = time.perf_counter()
+        generation = await self._get_generation(prefix)
+        documents = [
+            (key, self._build_document(prefix, generation, value, ttl, compute_time), value)
+            for key, value, compute_time in entries
+        ]
+        documents = [document for document in documents if document[1] is not None]
+        if not documents:
+            return False
+        await self.collection.bulk_write(
+            [self._upsert_operation(key, document) for key, document, _ in documents],
+            ordered=False
+        )
+        for key, document, value in documents:
+            self._store_local(key, document, value, ttl)
+        self._observe_set(prefix, start)
+        await self._after_write()
+        return True
+
+    async def get(self, prefix: str, params: Dict) -> Optional[Any]:
+        """
+        Recupera um item do cache.
+        
+        Args:
+            prefix: Prefixo da chave
+            params: Parâmetros da chave
+            
+        Returns:
+            Item do cache ou None se não encontrado
+        """
+        return (await self.get_many(prefix, [params]))[0]
+
+    async def get_many(self, prefix: str, params_list: List[Dict]) -> List[Optional[Any]]:
+        """
+        Recupera vários itens do cache com uma única consulta $in.
+        
+        Args:
+            prefix: Prefixo das chaves
+            params_list: Lista de parâmetros das chaves
+            
+        Returns:
+            Lista alinhada com params_list, com None nos itens não encontrados
+        """
+        try:
+            await self.initialize()
+            keys = await self._generate_keys(prefix, params_list)
+            found = await self._get_entries(prefix, keys)
+            return [found[key].value if key in found else None for key in keys]
+            
+        except Exception as e:
+            logger.error(f"Erro ao recuperar do cache: {str(e)}")
+            return [None] * len(params_list)
+
+    async def set(
+        self,
+        prefix: str,
+        params: Dict,
+        value: Any,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Armazena um item no cache.
+        
+        Args:
+            prefix: Prefixo da chave
+            params: Parâmetros da chave
+            value: Valor a ser armazenado
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            True se armazenado com sucesso
+        """
+        return await self.set_many(prefix, [(params, value)], ttl)
+
+    async def set_many(
+        self,
+        prefix: str,
+        items: List[Tuple[Dict, Any]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Armazena vários itens no cache com um único bulk_write.
+        
+        Args:
+            prefix: Prefixo das chaves
+            items: Lista de pares (parâmetros, valor)
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            True se armazenados com sucesso
+        """
+        if not items:
+            return True
+        try:
+            await self.initialize()
+            keys = await self._generate_keys(prefix, [params for params, _ in items])
+            return await self._set_entries(
+                prefix,
+                [(key, value, 0.0) for key, (_, value) in zip(keys, items)],
+                ttl or self.default_ttl
+            )
+            
+        except Exception as e:
+            logger.error(f"Erro ao armazenar no cache: {str(e)}")
+            return False
+
+    async def get_or_set(
+        self,
+        prefix: str,
+        params: Dict,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Recupera um item do cache ou o calcula e armazena.
+        
+        Em uma chave fria apenas uma task do processo executa compute; as
+        demais aguardam e reutilizam o resultado. Perto da expiração uma única
+        task recalcula o valor enquanto as outras seguem usando o atual.
+        
+        Args:
+            prefix: Prefixo da chave
+            params: Parâmetros da chave
+            compute: Corrotina que calcula o valor em caso de miss
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            Valor do cache ou recém-calculado
+        """
+        ttl = ttl or self.default_ttl
+        try:
+            await self.initialize()
+            key = (await self._generate_keys(prefix, [params]))[0]
+            entry = (await self._get_entries(prefix, [key])).get(key)
+        except Exception as e:
+            logger.error(f"Erro ao recuperar do cache: {str(e)}")
+            return await compute()
+        if entry is not None and not self._should_refresh_early(entry):
+            return entry.value
+        
+        holder = self._key_locks.get(key)
+        if holder is None:
+            holder = self._key_locks[key] = [asyncio.Lock(), 0]
+        lock = holder[0]
+        if entry is not None and lock.locked():
+            # Renovação antecipada já em andamento em outra task
+            return entry.value
+        holder[1] += 1
+        try:
+            async with lock:
+                if entry is None:
+                    # Outra task pode ter calculado enquanto esperávamos
+                    entry = self.local_cache.get(key)
+                    if entry is not None:
+                        return entry.value
+                
+                start = time.perf_counter()
+                value = await compute()
+                compute_time = time.perf_counter() - start
+                
+                try:
+                    await self._set_entries(prefix, [(key, value, compute_time)], ttl)
+                except Exception as e:
+                    logger.error(f"Erro ao armazenar no cache: {str(e)}")
+                return value
+        finally:
+            holder[1] -= 1
+            if holder[1] == 0:
+                del self._key_locks[key]
+
+    async def delete(self, prefix: str, params: Dict) -> bool:
+        """
+        Remove um item do cache.
+        
+        Args:
+            prefix: Prefixo da chave
+            params: Parâmetros da chave
+            
+        Returns:
+            True se removido com sucesso
+        """
+        return await self.delete_many(prefix, [params]) > 0
+
+    async def delete_many(self, prefix: str, params_list: List[Dict]) -> int:
+        """
+        Remove vários itens do cache com uma única operação.
+        
+        Args:
+            prefix: Prefixo das chaves
+            params_list: Lista de parâmetros das chaves
+            
+        Returns:
+            Número de itens removidos do MongoDB
+        """
+        try:
+            await self.initialize()
+            keys = await self._generate_keys(prefix, params_list)
+            for key in keys:
+                self.local_cache.delete(key)
+            result = await self.collection.delete_many({"key": {"$in": keys}})
+            self.metrics.increment(prefix, "deletes", result.deleted_count)
+            return result.deleted_count
+            
+        except Exception as e:
+            logger.error(f"Erro ao remover do cache: {str(e)}")
+            return 0
+
+    async def invalidate(self, prefix: str) -> int:
+        """
+        Invalida todas as entradas de um namespace em O(1).
+        
+        Args:
+            prefix: Namespace a invalidar
+            
+        Returns:
+            Nova geração do namespace
+        """
+        await self.initialize()
+        doc = await self.generations.find_one_and_update(
+            {"_id": prefix},
+            {"$inc": {"generation": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._remember_generation(prefix, doc["generation"])
+        self.metrics.increment(prefix, "invalidations")
+        logger.info(f"Cache invalidated: {prefix} (generation {doc['generation']})")
+        return doc["generation"]
+
+    async def get_stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache.
+        
+        Returns:
+            Dicionário com estatísticas
+        """
+        try:
+            await self.initialize()
+            return self._build_stats(await self.collection.estimated_document_count())
+            
+        except Exception as e:
+            logger.error(f"Erro ao obter estatísticas do cache: {str(e)}")
+            raise
+
+@lru_cache()
+def get_async_cache_manager() -> AsyncCacheManager:
+    """
+    Retorna o cache assíncrono compartilhado pela aplicação.
+    
+    Returns:
+        Instância única do AsyncCacheManager
+    """
+    settings = get_settings()
+    return AsyncCacheManager(
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        max_entry_bytes=settings.CACHE_MAX_ENTRY_BYTES,
+        compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD
+    )
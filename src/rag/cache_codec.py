@@ -0,0 +1,157 @@
+from typing import Any, Tuple
+from datetime import date, datetime
+from importlib import import_module
+import base64
+import json
+import zlib
+import logging
+from pydantic import BaseModel
+
+try:
+    from bson import ObjectId
+except ImportError:  # bson vem com o pymongo
+    ObjectId = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_RAW = "raw"  # valor BSON sem serialização (entradas antigas)
+CODEC_JSON = "json"
+CODEC_JSON_ZLIB = "json+zlib"
+
+DEFAULT_COMPRESSION_LEVEL = 3
+
+# Campo que marca os tipos sem equivalente em JSON
+TYPE_TAG = "$t"
+
+# Modelos pydantic só são reconstruídos a partir de módulos da aplicação
+MODEL_MODULE_PREFIX = "src."
+
+def _to_json(value: Any) -> Any:
+    """Converte um valor em estrutura JSON, marcando os tipos não nativos."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value) and TYPE_TAG not in value:
+            return {key: _to_json(item) for key, item in value.items()}
+        return {TYPE_TAG: "dict", "v": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if isinstance(value, tuple):
+        return {TYPE_TAG: "tuple", "v": [_to_json(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {TYPE_TAG: "set", "v": [_to_json(item) for item in value]}
+    if isinstance(value, datetime):
+        return {TYPE_TAG: "datetime", "v": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: "date", "v": value.isoformat()}
+    if isinstance(value, (bytes, bytearray)):
+        return {TYPE_TAG: "bytes", "v": base64.b64encode(bytes(value)).decode("ascii")}
+    if ObjectId is not None and isinstance(value, ObjectId):
+        return {TYPE_TAG: "oid", "v": str(value)}
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        if not cls.__module__.startswith(MODEL_MODULE_PREFIX):
+            raise TypeError(f"Modelo fora da aplicação não pode ir para o cache: {cls.__module__}.{cls.__qualname__}")
+        return {
+            TYPE_TAG: "model",
+            "cls": f"{cls.__module__}:{cls.__qualname__}",
+            "v": value.model_dump(mode="json")
+        }
+    raise TypeError(f"Tipo não suportado pelo cache: {type(value).__name__}")
+
+def _load_model_class(path: str) -> type:
+    """Resolve a classe de um modelo pydantic da aplicação."""
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(MODEL_MODULE_PREFIX):
+        raise ValueError(f"Modelo fora da aplicação: {path}")
+    cls = import_module(module_name)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+        raise ValueError(f"Não é um modelo pydantic: {path}")
+    return cls
+
+def _from_json(value: Any) -> Any:
+    """Reverte _to_json."""
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    tag = value.get(TYPE_TAG)
+    if tag is None:
+        return {key: _from_json(item) for key, item in value.items()}
+    data = value["v"]
+    if tag == "dict":
+        return {_from_json(key): _from_json(item) for key, item in data}
+    if tag == "tuple":
+        return tuple(_from_json(item) for item in data)
+    if tag == "set":
+        return {_from_json(item) for item in data}
+    if tag == "datetime":
+        return datetime.fromisoformat(data)
+    if tag == "date":
+        return date.fromisoformat(data)
+    if tag == "bytes":
+        return base64.b64decode(data)
+    if tag == "oid" and ObjectId is not None:
+        return ObjectId(data)
+    if tag == "model":
+        return _load_model_class(value["cls"]).model_validate(data)
+    raise ValueError(f"Tipo desconhecido no cache: {tag}")
+
+def encode_value(
+    value: Any,
+    compression_threshold: int = 1024,
+    level: int = DEFAULT_COMPRESSION_LEVEL
+) -> Tuple[bytes, str, int]:
+    """
+    Serializa um valor em JSON binário, comprimindo-o acima do limite.
+    
+    Só dados são gravados (nada que execute código ao ser lido): tipos
+    nativos do JSON, tuplas, conjuntos, datas, bytes, ObjectId e modelos
+    pydantic da aplicação.
+    
+    Args:
+        value: Valor a ser serializado
+        compression_threshold: Tamanho mínimo em bytes para comprimir
+        level: Nível de compressão
+    
+    Returns:
+        Tupla (bytes armazenados, codec, tamanho sem compressão)
+    
+    Raises:
+        TypeError: Se o valor contiver um tipo não suportado
+    """
+    payload = json.dumps(_to_json(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    raw_size = len(payload)
+    if raw_size < compression_threshold:
+        return payload, CODEC_JSON, raw_size
+
+    compressed = zlib.compress(payload, level)
+    # Dados pouco compressíveis podem crescer; guarda o original
+    if len(compressed) >= raw_size:
+        return payload, CODEC_JSON, raw_size
+    return compressed, CODEC_JSON_ZLIB, raw_size
+
+def decode_value(data: Any, codec: str) -> Any:
+    """
+    Restaura um valor serializado por encode_value.
+    
+    Entradas gravadas por versões anteriores com pickle não são lidas
+    (ValueError): o chamador as trata como ausentes.
+    
+    Args:
+        data: Bytes armazenados (ou o valor BSON, para o codec raw)
+        codec: Codec usado na gravação
+    
+    Returns:
+        Valor original
+    """
+    if codec == CODEC_RAW:
+        return data
+    payload = bytes(data)
+    if codec == CODEC_JSON_ZLIB:
+        payload = zlib.decompress(payload)
+    elif codec != CODEC_JSON:
+        raise ValueError(f"Codec de cache não suportado: {codec}")
+    return _from_json(json.loads(payload))
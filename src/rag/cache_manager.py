@@ -1,12 +1,366 @@
-from typing import Dict, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import hashlib
 import json
-from datetime import datetime, timedelta
-from pymongo import MongoClient
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from src.config.settings import get_settings
 import logging
+from .cache_codec import CODEC_RAW, decode_value, encode_value
+from .cache_metrics import CacheMetrics
+from .memory_cache import CacheEntry, MemoryCache
 
 logger = logging.getLogger(__name__)
 
-class CacheManager:
+def generate_cache_key(prefix: str, generation: int, params: Dict) -> str:
+    """
+    Gera uma chave única e de tamanho fixo para o cache.
+    
+    Args:
+        prefix: Prefixo (namespace) da chave
+        generation: Geração atual do namespace
+        params: Parâmetros para gerar a chave
+        
+    Returns:
+        Hash SHA-256 do namespace, da geração e dos parâmetros
+    """
+    # Ordena os parâmetros para garantir consistência
+    sorted_params = json.dumps(
+        params,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    raw_key = f"{prefix}\x00{generation}\x00{sorted_params}"
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+def to_timestamp(value: datetime) -> float:
+    """Converte um datetime UTC ingênuo (como retornado pelo MongoDB) em timestamp."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+class BaseCacheManager:
+    """Lógica comum aos gerenciadores de cache síncrono e assíncrono.
+    
+    O cache tem duas camadas: uma LRU em memória do processo, consultada
+    primeiro, e a coleção do MongoDB, compartilhada entre processos.
+    
+    O prefixo de cada chave é o seu namespace. Cada namespace tem um contador
+    de geração que faz parte do hash da chave: invalidar o namespace apenas
+    incrementa o contador, e as entradas antigas deixam de ser alcançáveis
+    até expirarem pelo TTL.
+    
+    Os valores são gravados serializados em binário e comprimidos acima de
+    compression_threshold. Quando a coleção passa de max_bytes, as entradas
+    com menor valor por byte (poucos acessos, grandes e antigas) são
+    removidas até voltar a 90% do orçamento.
+    """
+    
+    # Fração do orçamento a que a remoção por tamanho retorna
+    EVICTION_LOW_WATERMARK = 0.9
+    
+    def __init__(
+        self,
+        default_ttl: int = 3600,  # 1 hora em segundos
+        local_max_items: int = 1024,
+        local_max_bytes: int = 64 * 1024 * 1024,  # 64 MB
+        local_ttl: int = 60,
+        early_refresh_beta: float = 1.0,
+        generation_ttl: int = 5,
+        max_bytes: int = 512 * 1024 * 1024,  # 512 MB
+        max_entry_bytes: int = 8 * 1024 * 1024,  # 8 MB
+        compression_threshold: int = 1024,
+        budget_check_interval: int = 100,
+        eviction_sample: int = 500
+    ):
+        """
+        Inicializa o estado em memória do cache.
+        
+        Args:
+            default_ttl: Tempo padrão de vida do cache em segundos
+            local_max_items: Número máximo de entradas na camada em memória
+            local_max_bytes: Tamanho máximo em bytes da camada em memória
+            local_ttl: Tempo máximo de vida na camada em memória em segundos
+            early_refresh_beta: Agressividade da renovação antecipada em
+                get_or_set (0 desativa)
+            generation_ttl: Segundos que a geração de um namespace fica em
+                memória antes de ser relida (atraso máximo de uma invalidação
+                feita por outro processo)
+            max_bytes: Orçamento total em bytes da coleção do MongoDB
+            max_entry_bytes: Tamanho máximo (já comprimido) de uma entrada;
+                valores maiores não são armazenados
+            compression_threshold: Tamanho serializado a partir do qual o
+                valor é comprimido
+            budget_check_interval: Número de gravações entre verificações
+                do orçamento
+            eviction_sample: Entradas menos acessadas recentemente avaliadas
+                a cada rodada de remoção
+        """
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.compression_threshold = compression_threshold
+        self.budget_check_interval = budget_check_interval
+        self.eviction_sample = eviction_sample
+        self._sets_since_budget_check = 0
+        self._stored_bytes: Optional[int] = None
+        self.generation_ttl = generation_ttl
+        self.local_ttl = local_ttl
+        self.early_refresh_beta = early_refresh_beta
+        self.metrics = CacheMetrics()
+        self.local_cache = MemoryCache(
+            max_items=local_max_items,
+            max_bytes=local_max_bytes,
+            on_evict=self._on_local_evict
+        )
+        
+        # Gerações dos namespaces: namespace -> (geração, lida em)
+        self._generations: Dict[str, Tuple[int, float]] = {}
+
+    def _on_local_evict(self, key: str, entry: CacheEntry) -> None:
+        """Contabiliza entradas removidas da camada em memória por falta de espaço."""
+        namespace = entry.namespace or "unknown"
+        self.metrics.increment(namespace, "evictions")
+        self.metrics.increment(namespace, "bytes_evicted", entry.size)
+
+    def _observe_get(self, namespace: str, start: float) -> None:
+        """Registra a latência de uma leitura iniciada em start (perf_counter)."""
+        self.metrics.observe_get(namespace, (time.perf_counter() - start) * 1000)
+
+    def _observe_set(self, namespace: str, start: float) -> None:
+        """Registra a latência de uma gravação iniciada em start (perf_counter)."""
+        self.metrics.observe_set(namespace, (time.perf_counter() - start) * 1000)
+
+    def _cached_generation(self, namespace: str) -> Optional[int]:
+        """Retorna a geração em memória do namespace, se ainda válida."""
+        cached = self._generations.get(namespace)
+        if cached is not None and time.time() - cached[1] < self.generation_ttl:
+            return cached[0]
+        return None
+
+    def _remember_generation(self, namespace: str, generation: int) -> None:
+        """Guarda em memória a geração lida ou gravada de um namespace."""
+        self._generations[namespace] = (generation, time.time())
+
+    def _build_document(
+        self,
+        namespace: str,
+        generation: int,
+        value: Any,
+        ttl: int,
+        compute_time: float = 0.0
+    ) -> Optional[Dict]:
+        """
+        Monta os campos gravados no MongoDB para uma entrada.
+        
+        Args:
+            namespace: Namespace da chave
+            generation: Geração do namespace
+            value: Valor a ser armazenado
+            ttl: Tempo de vida em segundos
+            compute_time: Segundos gastos para calcular o valor
+            
+        Returns:
+            Campos da entrada, ou None se o valor for grande demais para o cache
+        """
+        data, codec, raw_size = encode_value(value, self.compression_threshold)
+        if len(data) > self.max_entry_bytes:
+            self.metrics.increment(namespace, "rejections")
+            logger.debug(f"Cache rejected: {namespace} ({len(data)} bytes)")
+            return None
+        
+        now = datetime.utcnow()
+        return {
+            "namespace": namespace,
+            "generation": generation,
+            "value": data,
+            "codec": codec,
+            "size": len(data),
+            "raw_size": raw_size,
+            "hits": 0,
+            "expires_at": now + timedelta(seconds=ttl),
+            "last_accessed_at": now,
+            "compute_time": compute_time,
+            "updated_at": now
+        }
+
+    def _upsert_operation(
+        self,
+        key: str,
+        document: Dict
+    ) -> UpdateOne:
+        """Cria a operação de upsert de uma entrada para bulk_write."""
+        return UpdateOne({"key": key}, {"$set": document}, upsert=True)
+
+    def _lookup_local(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """Consulta a camada em memória, contabilizando o acerto."""
+        entry = self.local_cache.get(key)
+        if entry is not None:
+            self.metrics.increment(namespace, "memory_hits")
+            logger.debug(f"Cache hit (memory): {key}")
+        return entry
+
+    def _promote(self, namespace: str, doc: Optional[Dict]) -> Optional[CacheEntry]:
+        """
+        Converte um documento do MongoDB em entrada e o copia para a memória.
+        
+        Args:
+            namespace: Namespace da chave
+            doc: Documento lido do MongoDB (ou None)
+            
+        Returns:
+            Entrada do cache ou None se ausente ou expirada
+        """
+        if not doc or doc.get("expires_at") <= datetime.utcnow():
+            return None
+        
+        try:
+            value = decode_value(doc["value"], doc.get("codec", CODEC_RAW))
+        except Exception as e:
+            logger.error(f"Erro ao decodificar entrada do cache: {str(e)}")
+            return None
+        
+        self.metrics.increment(namespace, "hits")
+        logger.debug(f"Cache hit: {doc['key']}")
+        expires_at = to_timestamp(doc["expires_at"])
+        entry = CacheEntry(
+            value=value,
+            expires_at=expires_at,
+            compute_time=doc.get("compute_time", 0.0)
+        )
+        # A expiração real segue na entrada (usada pelo XFetch); local_ttl
+        # só limita a permanência na memória
+        self.local_cache.set(
+            doc["key"],
+            entry.value,
+            expires_at,
+            entry.compute_time,
+            doc.get("raw_size"),
+            namespace,
+            evict_at=time.time() + self.local_ttl
+        )
+        return entry
+
+    def _store_local(self, key: str, document: Dict, value: Any, ttl: int) -> None:
+        """Copia para a memória uma entrada recém-gravada no MongoDB."""
+        namespace = document["namespace"]
+        self.metrics.increment(namespace, "sets")
+        self.metrics.increment(namespace, "bytes_stored", document["size"])
+        self._sets_since_budget_check += 1
+        now = time.time()
+        self.local_cache.set(
+            key,
+            value,
+            now + ttl,
+            document["compute_time"],
+            document["raw_size"],
+            namespace,
+            evict_at=now + self.local_ttl
+        )
+
+    def _access_update(self) -> Dict:
+        """Atualização que registra um acesso à entrada no MongoDB."""
+        return {
+            "$inc": {"hits": 1},
+            "$set": {"last_accessed_at": datetime.utcnow()}
+        }
+
+    def _budget_check_due(self) -> bool:
+        """Indica se já houve gravações suficientes para verificar o orçamento."""
+        if self._sets_since_budget_check < self.budget_check_interval:
+            return False
+        self._sets_since_budget_check = 0
+        return True
+
+    def _select_evictions(self, candidates: List[Dict], bytes_to_free: int) -> List[Dict]:
+        """
+        Escolhe as entradas a remover para liberar espaço.
+        
+        A prioridade de cada entrada é (acessos + 1) / tamanho, reduzida com o
+        tempo desde o último acesso (LFU ponderado por tamanho e recência);
+        as de menor prioridade saem primeiro.
+        
+        Args:
+            candidates: Entradas menos acessadas recentemente
+            bytes_to_free: Quantidade de bytes a liberar
+            
+        Returns:
+            Entradas escolhidas para remoção
+        """
+        now = datetime.utcnow()
+        
+        def priority(doc: Dict) -> float:
+            age_hours = (now - doc.get("last_accessed_at", now)).total_seconds() / 3600
+            return (doc.get("hits", 0) + 1) / max(doc.get("size", 1), 1) / (1 + max(age_hours, 0))
+        
+        selected = []
+        freed = 0
+        for doc in sorted(candidates, key=priority):
+            if freed >= bytes_to_free:
+                break
+            selected.append(doc)
+            freed += doc.get("size", 0)
+        return selected
+
+    def _record_evictions(self, evicted: List[Dict]) -> None:
+        """Contabiliza nas métricas as entradas removidas por tamanho."""
+        for doc in evicted:
+            namespace = doc.get("namespace", "unknown")
+            self.metrics.increment(namespace, "evictions")
+            self.metrics.increment(namespace, "bytes_evicted", doc.get("size", 0))
+
+    def _should_refresh_early(self, entry: CacheEntry) -> bool:
+        """
+        Decide se uma entrada ainda válida deve ser recalculada antes de expirar.
+        
+        Usa expiração antecipada probabilística (XFetch): a chance cresce à
+        medida que a expiração se aproxima e com o custo de recalcular o valor,
+        evitando que muitos processos recalculem a mesma chave ao mesmo tempo.
+        
+        Args:
+            entry: Entrada do cache
+            
+        Returns:
+            True se o valor deve ser recalculado agora
+        """
+        if self.early_refresh_beta <= 0 or entry.compute_time <= 0:
+            return False
+        jitter = -entry.compute_time * self.early_refresh_beta * math.log(
+            1.0 - random.random()
+        )
+        return time.time() + jitter >= entry.expires_at
+
+    def _build_stats(self, total_items: int) -> Dict:
+        """
+        Monta as estatísticas a partir dos contadores do processo.
+        
+        Args:
+            total_items: Contagem estimada de entradas no MongoDB
+            
+        Returns:
+            Dicionário com estatísticas
+        """
+        counters = self.metrics.totals()
+        hits = counters["memory_hits"] + counters["hits"]
+        lookups = hits + counters["misses"]
+        return {
+            "total_items": total_items,
+            "stored_bytes": self._stored_bytes,
+            "max_bytes": self.max_bytes,
+            "default_ttl": self.default_ttl,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "counters": counters,
+            "generations": {
+                namespace: generation
+                for namespace, (generation, _) in self._generations.items()
+            },
+            "memory": self.local_cache.get_stats()
+        }
+
+class CacheManager(BaseCacheManager):
     """Gerencia o cache do sistema RAG."""
     
     def __init__(
@@ -14,7 +368,8 @@ class CacheManager:
         mongodb_uri: str,
         database_name: str = "ada",
         collection_name: str = "cache",
-        default_ttl: int = 3600  # 1 hora em segundos
+        default_ttl: int = 3600,  # 1 hora em segundos
+        **kwargs
     ):
         """
         Inicializa o gerenciador de cache.
@@ -24,30 +379,212 @@ class CacheManager:
             database_name: Nome do banco de dados
             collection_name: Nome da coleção
             default_ttl: Tempo padrão de vida do cache em segundos
+            **kwargs: Opções da camada em memória (ver BaseCacheManager)
         """
+        super().__init__(default_ttl=default_ttl, **kwargs)
         self.client = MongoClient(mongodb_uri)
         self.db = self.client[database_name]
         self.collection = self.db[collection_name]
-        self.default_ttl = default_ttl
+        self.generations = self.db[f"{collection_name}_generations"]
+        self.metrics_collection = self.db[CacheMetrics.COLLECTION_NAME]
+        
+        # Locks por chave para que uma chave fria seja calculada uma única vez
+        self._key_locks: Dict[str, list] = {}
+        self._key_locks_guard = threading.Lock()
         
         # Criar índices
         self.collection.create_index("key", unique=True)
+        self.collection.create_index([("namespace", 1), ("generation", 1)])
         self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("last_accessed_at")
+
+    def _maybe_flush_metrics(self) -> None:
+        """
+        Grava as métricas pendentes se o intervalo de flush já passou.
+        
+        Chamado após leituras e gravações, para que namespaces só de leitura
+        também persistam seus acertos e falhas.
+        """
+        if self.metrics.flush_due():
+            self.metrics.flush(self.metrics_collection)
+
+    def _enforce_budget(self) -> int:
+        """
+        Remove entradas se a coleção ultrapassou o orçamento de bytes.
+        
+        Returns:
+            Número de entradas removidas
+        """
+        stats = next(self.collection.aggregate([{"$collStats": {"storageStats": {}}}]), None)
+        self._stored_bytes = stats["storageStats"]["size"] if stats else 0
+        if self._stored_bytes <= self.max_bytes:
+            return 0
+        
+        bytes_to_free = self._stored_bytes - int(self.max_bytes * self.EVICTION_LOW_WATERMARK)
+        candidates = list(
+            self.collection.find(
+                {},
+                {"key": 1, "namespace": 1, "size": 1, "hits": 1, "last_accessed_at": 1}
+            )
+            .sort("last_accessed_at", 1)
+            .limit(self.eviction_sample)
+        )
+        evicted = self._select_evictions(candidates, bytes_to_free)
+        if not evicted:
+            return 0
+        keys = [doc["key"] for doc in evicted]
+        for key in keys:
+            self.local_cache.delete(key)
+        result = self.collection.delete_many({"key": {"$in": keys}})
+        self._record_evictions(evicted)
+        logger.info(f"Cache evicted: {result.deleted_count} items to stay within {self.max_bytes} bytes")
+        return result.deleted_count
+
+    def _after_write(self) -> None:
+        """Tarefas periódicas após gravações: orçamento e flush de métricas."""
+        if self._budget_check_due():
+            try:
+                self._enforce_budget()
+            except Exception as e:
+                logger.error(f"Erro ao aplicar o orçamento do cache: {str(e)}")
+        self._maybe_flush_metrics()
+
+    def _get_generation(self, namespace: str) -> int:
+        """
+        Retorna a geração atual de um namespace.
+        
+        Args:
+            namespace: Namespace da chave
+            
+        Returns:
+            Contador de geração (0 se o namespace nunca foi invalidado)
+        """
+        generation = self._cached_generation(namespace)
+        if generation is None:
+            doc = self.generations.find_one({"_id": namespace})
+            generation = doc["generation"] if doc else 0
+            self._remember_generation(namespace, generation)
+        return generation
+
+    def get_generations(self, namespaces: List[str]) -> Dict[str, int]:
+        """
+        Retorna a geração atual de vários namespaces com uma única consulta.
+        
+        Args:
+            namespaces: Namespaces a consultar
+            
+        Returns:
+            Geração de cada namespace
+        """
+        generations = {}
+        missing = []
+        for namespace in namespaces:
+            generation = self._cached_generation(namespace)
+            if generation is None:
+                missing.append(namespace)
+            else:
+                generations[namespace] = generation
+        if missing:
+            found = {
+                doc["_id"]: doc["generation"]
+                for doc in self.generations.find({"_id": {"$in": missing}})
+            }
+            for namespace in missing:
+                generations[namespace] = found.get(namespace, 0)
+                self._remember_generation(namespace, generations[namespace])
+        return generations
 
     def _generate_key(self, prefix: str, params: Dict) -> str:
         """
-        Gera uma chave única para o cache.
+        Gera uma chave única e de tamanho fixo para o cache.
         
         Args:
-            prefix: Prefixo da chave
+            prefix: Prefixo (namespace) da chave
             params: Parâmetros para gerar a chave
             
         Returns:
-            Chave única
+            Hash SHA-256 do namespace, da geração e dos parâmetros
         """
-        # Ordena os parâmetros para garantir consistência
-        sorted_params = json.dumps(params, sort_keys=True)
-        return f"{prefix}:{sorted_params}"
+        return generate_cache_key(prefix, self._get_generation(prefix), params)
+
+    def _get_entry(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        """
+        Busca uma entrada nas duas camadas, promovendo-a para a memória.
+        
+        Args:
+            namespace: Namespace da chave
+            key: Chave do cache
+            
+        Returns:
+            Entrada do cache ou None se não encontrada
+        """
+        start = time.perf_counter()
+        entry = self._lookup_local(namespace, key)
+        if entry is None:
+            entry = self._promote(
+                namespace,
+                self.collection.find_one_and_update({"key": key}, self._access_update())
+            )
+            if entry is None:
+                self.metrics.increment(namespace, "misses")
+                logger.debug(f"Cache miss: {key}")
+        self._observe_get(namespace, start)
+        self._maybe_flush_metrics()
+        return entry
+
+    def _set_entry(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: int,
+        compute_time: float = 0.0
+    ) -> bool:
+        """
+        Grava uma entrada nas duas camadas.
+        
+        Args:
+            namespace: Namespace da chave
+            key: Chave do cache
+            value: Valor a ser armazenado
+            ttl: Tempo de vida em segundos
+            compute_time: Segundos gastos para calcular o valor
+            
+        Returns:
+            False se o valor não foi admitido por ser grande demais
+        """
+        start = time.perf_counter()
+        document = self._build_document(
+            namespace,
+            self._get_generation(namespace),
+            value,
+            ttl,
+            compute_time
+        )
+        if document is None:
+            return False
+        self.collection.update_one({"key": key}, {"$set": document}, upsert=True)
+        self._store_local(key, document, value, ttl)
+        self._observe_set(namespace, start)
+        self._after_write()
+        return True
+
+    def _acquire_key_lock(self, key: str) -> threading.Lock:
+        """Retorna o lock da chave, registrando mais um interessado."""
+        with self._key_locks_guard:
+            holder = self._key_locks.get(key)
+            if holder is None:
+                holder = self._key_locks[key] = [threading.Lock(), 0]
+            holder[1] += 1
+            return holder[0]
+
+    def _release_key_lock(self, key: str) -> None:
+        """Libera o registro da chave, descartando o lock sem interessados."""
+        with self._key_locks_guard:
+            holder = self._key_locks[key]
+            holder[1] -= 1
+            if holder[1] == 0:
+                del self._key_locks[key]
 
     def get(self, prefix: str, params: Dict) -> Optional[Any]:
         """
@@ -61,15 +598,8 @@ class CacheManager:
             Item do cache ou None se não encontrado
         """
         try:
-            key = self._generate_key(prefix, params)
-            doc = self.collection.find_one({"key": key})
-            
-            if doc and doc.get("expires_at") > datetime.utcnow():
-                logger.debug(f"Cache hit: {key}")
-                return doc["value"]
-            
-            logger.debug(f"Cache miss: {key}")
-            return None
+            entry = self._get_entry(prefix, self._generate_key(prefix, params))
+            return entry.value if entry is not None else None
             
         except Exception as e:
             logger.error(f"Erro ao recuperar do cache: {str(e)}")
@@ -96,28 +626,194 @@ class CacheManager:
         """
         try:
             key = self._generate_key(prefix, params)
-            ttl = ttl or self.default_ttl
-            expires_at = datetime.utcnow() + timedelta(seconds=ttl)
-            
-            self.collection.update_one(
-                {"key": key},
-                {
-                    "$set": {
-                        "value": value,
-                        "expires_at": expires_at,
-                        "updated_at": datetime.utcnow()
-                    }
-                },
-                upsert=True
-            )
+            stored = self._set_entry(prefix, key, value, ttl or self.default_ttl)
             
             logger.debug(f"Cache set: {key}")
+            return stored
+            
+        except Exception as e:
+            logger.error(f"Erro ao armazenar no cache: {str(e)}")
+            return False
+
+    def get_or_set(
+        self,
+        prefix: str,
+        params: Dict,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Recupera um item do cache ou o calcula e armazena.
+        
+        Em uma chave fria apenas uma thread do processo executa compute; as
+        demais aguardam e reutilizam o resultado. Perto da expiração uma única
+        thread recalcula o valor enquanto as outras seguem usando o atual.
+        
+        Args:
+            prefix: Prefixo da chave
+            params: Parâmetros da chave
+            compute: Função que calcula o valor em caso de miss
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            Valor do cache ou recém-calculado
+        """
+        key = self._generate_key(prefix, params)
+        ttl = ttl or self.default_ttl
+        
+        try:
+            entry = self._get_entry(prefix, key)
+        except Exception as e:
+            logger.error(f"Erro ao recuperar do cache: {str(e)}")
+            entry = None
+        if entry is not None and not self._should_refresh_early(entry):
+            return entry.value
+        
+        lock = self._acquire_key_lock(key)
+        try:
+            if entry is not None:
+                # Renovação antecipada: se outra thread já está recalculando,
+                # serve o valor atual sem esperar
+                if not lock.acquire(blocking=False):
+                    return entry.value
+            else:
+                lock.acquire()
+            try:
+                if entry is None:
+                    # Outra thread pode ter calculado enquanto esperávamos
+                    entry = self.local_cache.get(key)
+                    if entry is not None:
+                        return entry.value
+                
+                start = time.perf_counter()
+                value = compute()
+                compute_time = time.perf_counter() - start
+                
+                try:
+                    self._set_entry(prefix, key, value, ttl, compute_time)
+                    logger.debug(f"Cache set: {key}")
+                except Exception as e:
+                    logger.error(f"Erro ao armazenar no cache: {str(e)}")
+                return value
+            finally:
+                lock.release()
+        finally:
+            self._release_key_lock(key)
+
+    def get_many(self, prefix: str, params_list: List[Dict]) -> List[Optional[Any]]:
+        """
+        Recupera vários itens do cache com uma única consulta ao MongoDB.
+        
+        Args:
+            prefix: Prefixo das chaves
+            params_list: Lista de parâmetros das chaves
+            
+        Returns:
+            Lista alinhada com params_list, com None nos itens não encontrados
+        """
+        try:
+            start = time.perf_counter()
+            generation = self._get_generation(prefix)
+            keys = [generate_cache_key(prefix, generation, params) for params in params_list]
+            found = {}
+            for key in keys:
+                entry = self._lookup_local(prefix, key)
+                if entry is not None:
+                    found[key] = entry
+            missing = [key for key in keys if key not in found]
+            if missing:
+                from_mongo = []
+                for doc in self.collection.find({"key": {"$in": missing}}):
+                    entry = self._promote(prefix, doc)
+                    if entry is not None:
+                        found[doc["key"]] = entry
+                        from_mongo.append(doc["key"])
+                if from_mongo:
+                    self.collection.update_many(
+                        {"key": {"$in": from_mongo}},
+                        self._access_update()
+                    )
+            self.metrics.increment(prefix, "misses", len(set(keys) - set(found)))
+            self._observe_get(prefix, start)
+            self._maybe_flush_metrics()
+            return [found[key].value if key in found else None for key in keys]
+            
+        except Exception as e:
+            logger.error(f"Erro ao recuperar do cache: {str(e)}")
+            return [None] * len(params_list)
+
+    def set_many(
+        self,
+        prefix: str,
+        items: List[Tuple[Dict, Any]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Armazena vários itens no cache com um único bulk_write.
+        
+        Args:
+            prefix: Prefixo das chaves
+            items: Lista de pares (parâmetros, valor)
+            ttl: Tempo de vida em segundos
+            
+        Returns:
+            True se armazenados com sucesso
+        """
+        if not items:
+            return True
+        try:
+            start = time.perf_counter()
+            ttl = ttl or self.default_ttl
+            generation = self._get_generation(prefix)
+            entries = [
+                (
+                    generate_cache_key(prefix, generation, params),
+                    self._build_document(prefix, generation, value, ttl),
+                    value
+                )
+                for params, value in items
+            ]
+            entries = [entry for entry in entries if entry[1] is not None]
+            if not entries:
+                return False
+            self.collection.bulk_write(
+                [self._upsert_operation(key, document) for key, document, _ in entries],
+                ordered=False
+            )
+            for key, document, value in entries:
+                self._store_local(key, document, value, ttl)
+            self._observe_set(prefix, start)
+            self._after_write()
             return True
             
         except Exception as e:
             logger.error(f"Erro ao armazenar no cache: {str(e)}")
             return False
 
+    def delete_many(self, prefix: str, params_list: List[Dict]) -> int:
+        """
+        Remove vários itens do cache com uma única operação.
+        
+        Args:
+            prefix: Prefixo das chaves
+            params_list: Lista de parâmetros das chaves
+            
+        Returns:
+            Número de itens removidos do MongoDB
+        """
+        try:
+            generation = self._get_generation(prefix)
+            keys = [generate_cache_key(prefix, generation, params) for params in params_list]
+            for key in keys:
+                self.local_cache.delete(key)
+            result = self.collection.delete_many({"key": {"$in": keys}})
+            self.metrics.increment(prefix, "deletes", result.deleted_count)
+            return result.deleted_count
+            
+        except Exception as e:
+            logger.error(f"Erro ao remover do cache: {str(e)}")
+            return 0
+
     def delete(self, prefix: str, params: Dict) -> bool:
         """
         Remove um item do cache.
@@ -131,9 +827,11 @@ class CacheManager:
         """
         try:
             key = self._generate_key(prefix, params)
+            self.local_cache.delete(key)
             result = self.collection.delete_one({"key": key})
             
             if result.deleted_count > 0:
+                self.metrics.increment(prefix, "deletes")
                 logger.debug(f"Cache deleted: {key}")
                 return True
                 
@@ -144,23 +842,47 @@ class CacheManager:
             logger.error(f"Erro ao remover do cache: {str(e)}")
             return False
 
+    def invalidate(self, prefix: str) -> int:
+        """
+        Invalida todas as entradas de um namespace em O(1).
+        
+        As entradas antigas não são removidas: deixam de ser alcançáveis e
+        expiram pelo TTL.
+        
+        Args:
+            prefix: Namespace a invalidar
+            
+        Returns:
+            Nova geração do namespace
+        """
+        doc = self.generations.find_one_and_update(
+            {"_id": prefix},
+            {"$inc": {"generation": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._remember_generation(prefix, doc["generation"])
+        self.metrics.increment(prefix, "invalidations")
+        logger.info(f"Cache invalidated: {prefix} (generation {doc['generation']})")
+        return doc["generation"]
+
     def clear(self, prefix: Optional[str] = None) -> bool:
         """
         Limpa o cache.
         
         Args:
-            prefix: Se fornecido, limpa apenas itens com este prefixo
+            prefix: Se fornecido, invalida apenas o namespace com este prefixo
             
         Returns:
             True se limpo com sucesso
         """
         try:
             if prefix:
-                query = {"key": {"$regex": f"^{prefix}:"}}
-            else:
-                query = {}
-                
-            result = self.collection.delete_many(query)
+                self.invalidate(prefix)
+                return True
+            
+            self.local_cache.clear()
+            result = self.collection.delete_many({})
             logger.info(f"Cache cleared: {result.deleted_count} items")
             return True
             
@@ -172,24 +894,60 @@ class CacheManager:
         """
         Retorna estatísticas do cache.
         
+        Usa os contadores do processo e a contagem estimada da coleção, sem
+        varrer os documentos.
+        
         Returns:
             Dicionário com estatísticas
         """
         try:
-            total_items = self.collection.count_documents({})
-            expired_items = self.collection.count_documents({
-                "expires_at": {"$lt": datetime.utcnow()}
-            })
-            
-            stats = {
-                "total_items": total_items,
-                "active_items": total_items - expired_items,
-                "expired_items": expired_items,
-                "default_ttl": self.default_ttl
-            }
-            
-            return stats
+            return self._build_stats(self.collection.estimated_document_count())
             
         except Exception as e:
             logger.error(f"Erro ao obter estatísticas do cache: {str(e)}")
             raise
+
+@lru_cache()
+def get_cache_manager() -> CacheManager:
+    """
+    Retorna o cache síncrono compartilhado pela aplicação.
+    
+    Returns:
+        Instância única do CacheManager
+    """
+    settings = get_settings()
+    return CacheManager(
+        mongodb_uri=settings.MONGODB_URI,
+        database_name=settings.MONGODB_DB_NAME,
+        default_ttl=settings.CACHE_DEFAULT_TTL,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        max_entry_bytes=settings.CACHE_MAX_ENTRY_BYTES,
+        compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD
+    )
+
+# Momento (time.monotonic) a partir do qual o cache opcional é tentado de novo
+_optional_cache_retry_at = 0.0
+
+def get_optional_cache_manager() -> Optional[CacheManager]:
+    """
+    Retorna o cache compartilhado, ou None se ele não puder ser criado.
+    
+    Para caches de apoio (texto extraído, páginas), em que a ausência do
+    cache só deve custar desempenho. Uma falha é lembrada por
+    CACHE_RETRY_INTERVAL segundos: com o MongoDB fora do ar, as consultas
+    seguintes retornam None na hora, em vez de esperar a seleção do
+    servidor a cada arquivo ou página.
+    
+    Returns:
+        Instância única do CacheManager ou None
+    """
+    global _optional_cache_retry_at
+    if time.monotonic() < _optional_cache_retry_at:
+        return None
+    try:
+        return get_cache_manager()
+    except Exception as e:
+        retry_interval = get_settings().CACHE_RETRY_INTERVAL
+        _optional_cache_retry_at = time.monotonic() + retry_interval
+        logger.error(f"Erro ao acessar o cache (nova tentativa em {retry_interval}s): {str(e)}")
+        return None
@@ -0,0 +1,282 @@
+from typing import Dict, List, Optional, Tuple
+import threading
+import time
+import logging
+from datetime import datetime
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (ms) dos buckets dos histogramas de latência
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+COUNTER_NAMES = (
+    "memory_hits",
+    "hits",
+    "misses",
+    "sets",
+    "deletes",
+    "evictions",
+    "invalidations",
+    "rejections",
+    "bytes_stored",
+    "bytes_evicted"
+)
+
+def bucket_label(upper_ms: Optional[float]) -> str:
+    """Nome do bucket usado nos relatórios e no MongoDB (ex.: le_2_5, le_inf)."""
+    if upper_ms is None:
+        return "le_inf"
+    return "le_" + f"{upper_ms:g}".replace(".", "_")
+
+class LatencyHistogram:
+    """Histograma de latências com buckets fixos."""
+    
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        """
+        Registra uma latência.
+        
+        Args:
+            latency_ms: Latência em milissegundos
+        """
+        index = len(LATENCY_BUCKETS_MS)
+        for i, upper in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= upper:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def to_dict(self) -> Dict:
+        """
+        Converte o histograma em dicionário.
+        
+        Returns:
+            Contagem, soma, média, máximo e contagem por bucket
+        """
+        uppers = list(LATENCY_BUCKETS_MS) + [None]
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "avg_ms": self.sum_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets": {
+                bucket_label(upper): count
+                for upper, count in zip(uppers, self.counts)
+            }
+        }
+
+class NamespaceMetrics:
+    """Contadores e histogramas de um namespace do cache."""
+    
+    def __init__(self):
+        self.counters = {name: 0 for name in COUNTER_NAMES}
+        self.get_latency = LatencyHistogram()
+        self.set_latency = LatencyHistogram()
+
+    def to_dict(self) -> Dict:
+        """
+        Converte as métricas em dicionário.
+        
+        Returns:
+            Contadores, taxa de acerto e histogramas de latência
+        """
+        hits = self.counters["memory_hits"] + self.counters["hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "get_latency": self.get_latency.to_dict(),
+            "set_latency": self.set_latency.to_dict()
+        }
+
+class CacheMetrics:
+    """Métricas do cache por namespace, mantidas em memória do processo.
+    
+    Os valores acumulados desde o último flush são gravados periodicamente
+    na coleção cache_metrics, agregados por namespace e hora.
+    """
+    _instance: Optional['CacheMetrics'] = None
+    _instance_lock = threading.Lock()
+    
+    COLLECTION_NAME = "cache_metrics"
+    
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self, flush_interval: int = 60):
+        """
+        Inicializa as métricas.
+        
+        Args:
+            flush_interval: Intervalo mínimo em segundos entre flushes
+        """
+        if self._initialized:
+            return
+        self._initialized = True
+        self.flush_interval = flush_interval
+        self.started_at = datetime.utcnow()
+        self._lock = threading.Lock()
+        # Totais desde o início do processo
+        self._totals: Dict[str, NamespaceMetrics] = {}
+        # Acumulado desde o último flush
+        self._pending: Dict[str, NamespaceMetrics] = {}
+        self._last_flush = time.time()
+
+    def _namespaces(self, namespace: str) -> Tuple[NamespaceMetrics, NamespaceMetrics]:
+        """Retorna as métricas total e pendente do namespace (com o lock)."""
+        total = self._totals.get(namespace)
+        if total is None:
+            total = self._totals[namespace] = NamespaceMetrics()
+        pending = self._pending.get(namespace)
+        if pending is None:
+            pending = self._pending[namespace] = NamespaceMetrics()
+        return total, pending
+
+    def increment(self, namespace: str, counter: str, amount: int = 1) -> None:
+        """
+        Incrementa um contador do namespace.
+        
+        Args:
+            namespace: Namespace do cache
+            counter: Nome do contador (ver COUNTER_NAMES)
+            amount: Valor a somar
+        """
+        if not amount:
+            return
+        with self._lock:
+            for metrics in self._namespaces(namespace):
+                metrics.counters[counter] += amount
+
+    def observe_get(self, namespace: str, latency_ms: float) -> None:
+        """Registra a latência de uma leitura do namespace."""
+        with self._lock:
+            for metrics in self._namespaces(namespace):
+                metrics.get_latency.observe(latency_ms)
+
+    def observe_set(self, namespace: str, latency_ms: float) -> None:
+        """Registra a latência de uma gravação do namespace."""
+        with self._lock:
+            for metrics in self._namespaces(namespace):
+                metrics.set_latency.observe(latency_ms)
+
+    def snapshot(self) -> Dict:
+        """
+        Retorna as métricas acumuladas desde o início do processo.
+        
+        Returns:
+            Dicionário com as métricas por namespace
+        """
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "namespaces": {
+                    namespace: metrics.to_dict()
+                    for namespace, metrics in self._totals.items()
+                }
+            }
+
+    def totals(self) -> Dict[str, int]:
+        """
+        Soma os contadores de todos os namespaces.
+        
+        Returns:
+            Dicionário contador -> total
+        """
+        with self._lock:
+            totals = {name: 0 for name in COUNTER_NAMES}
+            for metrics in self._totals.values():
+                for name, value in metrics.counters.items():
+                    totals[name] += value
+            return totals
+
+    def flush_due(self) -> bool:
+        """Indica se o intervalo de flush já passou."""
+        return time.time() - self._last_flush >= self.flush_interval
+
+    def drain(self) -> List[UpdateOne]:
+        """
+        Retira as métricas pendentes e as converte em operações de escrita.
+        
+        Returns:
+            Operações de upsert ($inc) por namespace na hora corrente
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.time()
+        
+        period_start = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        operations = []
+        for namespace, metrics in pending.items():
+            increments = {
+                f"counters.{name}": value
+                for name, value in metrics.counters.items()
+                if value
+            }
+            for field, histogram in (
+                ("get_latency", metrics.get_latency),
+                ("set_latency", metrics.set_latency)
+            ):
+                if not histogram.count:
+                    continue
+                data = histogram.to_dict()
+                increments[f"{field}.count"] = data["count"]
+                increments[f"{field}.sum_ms"] = data["sum_ms"]
+                for label, count in data["buckets"].items():
+                    if count:
+                        increments[f"{field}.buckets.{label}"] = count
+            if increments:
+                operations.append(UpdateOne(
+                    {"namespace": namespace, "period_start": period_start},
+                    {"$inc": increments},
+                    upsert=True
+                ))
+        return operations
+
+    def flush(self, collection) -> int:
+        """
+        Grava as métricas pendentes em uma coleção pymongo.
+        
+        Args:
+            collection: Coleção cache_metrics
+            
+        Returns:
+            Número de namespaces gravados
+        """
+        operations = self.drain()
+        if operations:
+            try:
+                collection.bulk_write(operations, ordered=False)
+            except Exception as e:
+                logger.error(f"Erro ao gravar métricas do cache: {str(e)}")
+        return len(operations)
+
+    async def aflush(self, collection) -> int:
+        """
+        Grava as métricas pendentes em uma coleção motor.
+        
+        Args:
+            collection: Coleção cache_metrics
+            
+        Returns:
+            Número de namespaces gravados
+        """
+        operations = self.drain()
+        if operations:
+            try:
+                await collection.bulk_write(operations, ordered=False)
+            except Exception as e:
+                logger.error(f"Erro ao gravar métricas do cache: {str(e)}")
+        return len(operations)
@@ -1,35 +1,171 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, NamedTuple, Optional, Tuple
+from itertools import islice
+import hashlib
+import multiprocessing
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import (
-    TextLoader,
-    PDFMinerLoader,
-    UnstructuredMarkdownLoader,
-    CSVLoader,
-    UnstructuredExcelLoader,
-)
+from langchain_core.documents import Document
 import logging
+from src.config.settings import get_settings
+from .cache_manager import get_optional_cache_manager
+from .loader_registry import apply_registered_loaders, loader_registry, registered_loaders, table_loader_registry
+from .pdf_extractor import OCRRequired, compute_file_hash
+from .streaming_loaders import StreamingLoader
 
 logger = logging.getLogger(__name__)
 
+# Namespace do cache de texto extraído, por hash do arquivo e loader
+PARSED_TEXT_NAMESPACE = "parsed_text"
+
+def normalize_text(text: str) -> str:
+    """Normaliza quebras de linha e remove caracteres nulos do texto extraído."""
+    return text.replace('\r\n', '\n').replace('\r', '\n').replace('\x00', '')
+
+def make_chunk_id(file_hash: str, chunk_index: int, signature: str) -> str:
+    """
+    Gera o ID determinístico de um chunk.
+    
+    O mesmo arquivo processado com os mesmos parâmetros gera sempre os mesmos
+    IDs, de modo que reprocessar um documento sobrescreve os chunks em vez
+    de duplicá-los.
+    
+    Args:
+        file_hash: SHA-256 do arquivo
+        chunk_index: Posição do chunk no arquivo
+        signature: Parâmetros de divisão (ver DocumentProcessor.chunk_signature)
+        
+    Returns:
+        Hash hexadecimal usado como _id do chunk
+    """
+    return hashlib.sha256(f"{file_hash}:{chunk_index}:{signature}".encode()).hexdigest()
+
+class FileResult(NamedTuple):
+    """Resultado do processamento de um arquivo em modo paralelo."""
+    file_path: str
+    chunks: List[Dict]
+    error: Optional[str]
+
+def _init_worker(registrations: Tuple) -> None:
+    """
+    Inicializa um processo do pool com os loaders registrados no processo pai.
+    
+    Com spawn, o processo importa o registro do zero: sem isso, uma extensão
+    aceita pelo pai via register_loader falharia no worker.
+    
+    Args:
+        registrations: Resultado de registered_loaders no processo pai
+    """
+    apply_registered_loaders(registrations)
+
+def create_worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Cria um pool de processos de parsing.
+    
+    Usa spawn (o processo da API tem threads e clientes do pymongo em cache,
+    que não sobrevivem a um fork) e repassa os loaders registrados até
+    agora; registros feitos depois da criação do pool não chegam a ele.
+    
+    Args:
+        max_workers: Número de processos
+        
+    Returns:
+        Pool pronto para _process_file_in_worker
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(registered_loaders(),)
+    )
+
+# Processadores reutilizados por cada processo do pool, por configuração
+_worker_processors: Dict[Tuple, "DocumentProcessor"] = {}
+
+def _process_file_in_worker(
+    processor_class: type,
+    config: Tuple,
+    file_path: str,
+    file_hash: Optional[str] = None,
+    file_name: Optional[str] = None,
+    ocr_text: Optional[Dict[int, str]] = None
+) -> List[Dict]:
+    """
+    Processa um arquivo dentro de um processo do pool.
+    
+    Args:
+        processor_class: Classe do processador (permite subclasses)
+        config: Argumentos de inicialização do processador
+        file_path: Caminho do arquivo
+        file_hash: SHA-256 do arquivo, se já conhecido
+        file_name: Nome original do arquivo, se diferente do caminho
+        ocr_text: Texto reconhecido por OCR, por número de página
+        
+    Returns:
+        Lista de chunks processados com metadados
+    """
+    key = (processor_class, config)
+    processor = _worker_processors.get(key)
+    if processor is None:
+        processor = _worker_processors[key] = processor_class(*config)
+    return processor.process_file(file_path, file_hash, file_name, ocr_text)
+
+def _result_with_ocr(
+    executor: ProcessPoolExecutor,
+    future: Future,
+    processor_class: type,
+    config: Tuple,
+    file_path: str,
+    file_hash: Optional[str] = None,
+    file_name: Optional[str] = None
+) -> List[Dict]:
+    """
+    Aguarda o processamento de um arquivo no pool, fazendo o OCR neste processo.
+    
+    Se o worker encontrar páginas digitalizadas (OCRRequired), elas passam
+    pelo pool limitado do OCREngine e o arquivo é reenviado com o texto
+    reconhecido; as páginas já extraídas vêm do cache de páginas.
+    
+    Args:
+        executor: Pool em que o arquivo foi enviado
+        future: Resultado de _process_file_in_worker
+        processor_class: Classe do processador
+        config: Argumentos de inicialização do processador
+        file_path: Caminho do arquivo
+        file_hash: SHA-256 do arquivo, se já conhecido
+        file_name: Nome original do arquivo, se diferente do caminho
+        
+    Returns:
+        Lista de chunks processados com metadados
+    """
+    try:
+        return future.result()
+    except OCRRequired as required:
+        from .ocr import get_ocr_engine
+
+        ocr_text = get_ocr_engine().ocr_pages(file_path, required.file_hash, required.pages)
+        return executor.submit(
+            _process_file_in_worker, processor_class, config,
+            file_path, required.file_hash, file_name, ocr_text
+        ).result()
+
 class DocumentProcessor:
     """Processa documentos para indexação no sistema RAG."""
     
-    SUPPORTED_EXTENSIONS = {
-        '.txt': TextLoader,
-        '.pdf': PDFMinerLoader,
-        '.md': UnstructuredMarkdownLoader,
-        '.csv': CSVLoader,
-        '.xlsx': UnstructuredExcelLoader,
-        '.xls': UnstructuredExcelLoader
-    }
+    # Loaders importados sob demanda; novos formatos via register_loader
+    # ou entry points (ver loader_registry)
+    SUPPORTED_EXTENSIONS = loader_registry
+    TABLE_EXTENSIONS = table_loader_registry
 
     def __init__(
         self,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
-        encoding: str = 'utf-8'
+        encoding: str = 'utf-8',
+        max_workers: Optional[int] = None,
+        use_text_cache: bool = True,
+        table_mode: bool = True
     ):
         """
         Inicializa o processador de documentos.
@@ -38,25 +174,146 @@ class DocumentProcessor:
             chunk_size: Tamanho dos chunks de texto
             chunk_overlap: Sobreposição entre chunks
             encoding: Codificação dos arquivos de texto
+            max_workers: Processos usados no modo paralelo (padrão: número de CPUs)
+            use_text_cache: Se deve reutilizar o texto já extraído de arquivos
+                com o mesmo conteúdo
+            table_mode: Se CSV/Excel devem ser agrupados em blocos de linhas
+                com cabeçalho, em vez de um documento por linha
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.encoding = encoding
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_text_cache = use_text_cache
+        self.table_mode = table_mode
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             length_function=len,
         )
 
-    def process_file(self, file_path: str) -> List[Dict]:
+    def chunk_signature(self) -> str:
         """
-        Processa um arquivo e retorna seus chunks.
+        Resume os parâmetros que determinam a divisão em chunks.
+        
+        Returns:
+            Texto estável usado nos IDs dos chunks e nos checkpoints
+        """
+        signature = f"size={self.chunk_size};overlap={self.chunk_overlap};table={int(self.table_mode)}"
+        if self.table_mode:
+            signature += f";table_tokens={get_settings().TABLE_CHUNK_MAX_TOKENS}"
+        return signature
+
+    def _create_loader(
+        self,
+        loader_class: type,
+        file_path: Path,
+        file_hash: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None
+    ):
+        """
+        Instancia o loader de um arquivo.
+        
+        Loaders de streaming recebem a codificação, o hash do arquivo, o texto
+        já reconhecido por OCR e, quando já entregam chunks prontos, o tamanho
+        e a sobreposição.
         
         Args:
+            loader_class: Classe do loader
             file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo, se já conhecido
+            ocr_text: Texto reconhecido por OCR, por número de página
             
         Returns:
-            Lista de chunks processados com metadados
+            Loader pronto para lazy_load
+        """
+        if not issubclass(loader_class, StreamingLoader):
+            return loader_class(str(file_path))
+        
+        kwargs = {'encoding': self.encoding, 'file_hash': file_hash}
+        if ocr_text is not None:
+            kwargs['ocr_text'] = ocr_text
+        if loader_class.pre_chunked:
+            kwargs.update(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        return loader_class(str(file_path), **kwargs)
+
+    def _load_documents(
+        self,
+        loader_class: type,
+        file_path: Path,
+        file_hash: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None
+    ) -> Iterator[Document]:
+        """
+        Carrega os documentos de um arquivo, reutilizando o texto já extraído.
+        
+        O texto é sempre normalizado, com ou sem cache, para que o conteúdo e
+        os IDs dos chunks não dependam da disponibilidade do MongoDB. Para
+        loaders caros (Excel, unstructured) o texto normalizado é guardado
+        comprimido no cache, por hash do conteúdo e loader; mudar
+        chunk_size/chunk_overlap ou reprocessar um arquivo não repete o parsing.
+        
+        Args:
+            loader_class: Classe do loader
+            file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo (calculado se necessário)
+            ocr_text: Texto reconhecido por OCR, por número de página
+            
+        Returns:
+            Iterador de documentos antes da divisão em chunks
+        """
+        cache = None
+        if self.use_text_cache and getattr(loader_class, 'cache_parsed_text', True):
+            cache = get_optional_cache_manager()
+        if cache is None:
+            for document in self._create_loader(loader_class, file_path, file_hash, ocr_text).lazy_load():
+                yield Document(page_content=normalize_text(document.page_content), metadata=document.metadata)
+            return
+        
+        file_hash = file_hash or compute_file_hash(str(file_path))
+        params = {'file_hash': file_hash, 'loader': loader_class.__name__}
+        cached = cache.get(PARSED_TEXT_NAMESPACE, params)
+        if cached is not None:
+            logger.info(f"Texto extraído reutilizado do cache: {file_path}")
+            for content, metadata in cached:
+                yield Document(page_content=content, metadata={**metadata, 'source': str(file_path)})
+            return
+        
+        loader = self._create_loader(loader_class, file_path, file_hash, ocr_text)
+        documents = [
+            Document(page_content=normalize_text(document.page_content), metadata=document.metadata)
+            for document in loader.lazy_load()
+        ]
+        cache.set(
+            PARSED_TEXT_NAMESPACE,
+            params,
+            [(document.page_content, document.metadata) for document in documents],
+            get_settings().PARSED_TEXT_CACHE_TTL
+        )
+        yield from documents
+
+    def iter_chunks(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        file_name: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None
+    ) -> Iterator[Dict]:
+        """
+        Gera os chunks de um arquivo sob demanda, documento a documento.
+        
+        Cada chunk recebe um 'id' determinístico (hash do arquivo, posição e
+        parâmetros de divisão).
+        
+        Args:
+            file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo, se já conhecido
+            file_name: Nome original do arquivo (arquivos armazenados por
+                hash); por padrão, o nome do caminho
+            ocr_text: Texto reconhecido por OCR, por número de página
+            
+        Returns:
+            Iterador de chunks processados com metadados
         """
         try:
             file_path = Path(file_path)
@@ -67,36 +324,192 @@ class DocumentProcessor:
             if extension not in self.SUPPORTED_EXTENSIONS:
                 raise ValueError(f"Extensão não suportada: {extension}")
 
-            loader_class = self.SUPPORTED_EXTENSIONS[extension]
-            loader = loader_class(str(file_path))
-            documents = loader.load()
-            
-            chunks = self.text_splitter.split_documents(documents)
+            if self.table_mode and extension in self.TABLE_EXTENSIONS:
+                loader_class = self.TABLE_EXTENSIONS[extension]
+            else:
+                loader_class = self.SUPPORTED_EXTENSIONS[extension]
+            pre_chunked = getattr(loader_class, 'pre_chunked', False)
+            file_hash = file_hash or compute_file_hash(str(file_path))
+            signature = self.chunk_signature()
             
-            processed_chunks = []
-            for i, chunk in enumerate(chunks):
-                processed_chunks.append({
-                    'content': chunk.page_content,
-                    'metadata': {
-                        **chunk.metadata,
-                        'chunk_id': i,
-                        'file_name': file_path.name,
-                        'file_path': str(file_path),
-                        'file_type': extension
+            chunk_id = 0
+            for document in self._load_documents(loader_class, file_path, file_hash, ocr_text):
+                pieces = [document] if pre_chunked else self.text_splitter.split_documents([document])
+                for chunk in pieces:
+                    yield {
+                        'id': make_chunk_id(file_hash, chunk_id, signature),
+                        'content': chunk.page_content,
+                        'metadata': {
+                            **chunk.metadata,
+                            'chunk_id': chunk_id,
+                            'file_name': file_name or file_path.name,
+                            'file_path': str(file_path),
+                            'file_type': extension
+                        }
                     }
-                })
+                    chunk_id += 1
             
             logger.info(f"Arquivo processado com sucesso: {file_path}")
-            return processed_chunks
 
+        except OCRRequired:
+            raise
         except Exception as e:
             logger.error(f"Erro ao processar arquivo {file_path}: {str(e)}")
             raise
 
+    def process_file(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        file_name: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None
+    ) -> List[Dict]:
+        """
+        Processa um arquivo e retorna seus chunks.
+        
+        Args:
+            file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo, se já conhecido
+            file_name: Nome original do arquivo, se diferente do caminho
+            ocr_text: Texto reconhecido por OCR, por número de página
+            
+        Returns:
+            Lista de chunks processados com metadados
+        """
+        return list(self.iter_chunks(file_path, file_hash, file_name, ocr_text))
+
+    def worker_config(self) -> Tuple:
+        """
+        Argumentos para recriar este processador nos processos do pool.
+        
+        Returns:
+            Tupla de inicialização, com um único worker por processo
+        """
+        return (
+            self.chunk_size,
+            self.chunk_overlap,
+            self.encoding,
+            1,
+            self.use_text_cache,
+            self.table_mode
+        )
+
+    def list_files(self, directory_path: str, recursive: bool = True) -> List[Path]:
+        """
+        Lista os arquivos suportados de um diretório, do maior para o menor.
+        
+        Processar os maiores primeiro evita que um arquivo grande sobre
+        para o final e deixe os demais processos ociosos.
+        
+        Args:
+            directory_path: Caminho do diretório
+            recursive: Se deve incluir subdiretórios
+            
+        Returns:
+            Caminhos dos arquivos ordenados por tamanho decrescente
+        """
+        directory_path = Path(directory_path)
+        if not directory_path.exists():
+            raise NotADirectoryError(f"Diretório não encontrado: {directory_path}")
+
+        pattern = '**/*' if recursive else '*'
+        files = [
+            file_path
+            for ext in self.SUPPORTED_EXTENSIONS.keys()
+            for file_path in directory_path.glob(f'{pattern}{ext}')
+            if file_path.is_file()
+        ]
+        return sorted(files, key=lambda file_path: file_path.stat().st_size, reverse=True)
+
+    def iter_directory_parallel(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = None
+    ) -> Iterator[FileResult]:
+        """
+        Processa os arquivos de um diretório em um pool de processos.
+        
+        Os resultados são entregues à medida que cada arquivo termina. A falha
+        de um arquivo é registrada no seu resultado e não interrompe os demais.
+        
+        Args:
+            directory_path: Caminho do diretório
+            recursive: Se deve processar subdiretórios
+            max_workers: Número de processos (padrão do processador se None)
+            
+        Returns:
+            Iterador de FileResult na ordem de conclusão
+        """
+        files = self.list_files(directory_path, recursive)
+        if not files:
+            return
+
+        workers = min(max_workers or self.max_workers, len(files))
+        config = self.worker_config()
+        pending_files = iter(files)
+        executor = create_worker_pool(workers)
+        try:
+            # Janela limitada de arquivos em andamento: resultados prontos e
+            # não consumidos não se acumulam na memória
+            futures = {}
+            for file_path in islice(pending_files, workers * 2):
+                futures[executor.submit(_process_file_in_worker, type(self), config, str(file_path))] = str(file_path)
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = futures.pop(future)
+                    for next_path in islice(pending_files, 1):
+                        futures[executor.submit(_process_file_in_worker, type(self), config, str(next_path))] = str(next_path)
+                    try:
+                        chunks = _result_with_ocr(executor, future, type(self), config, file_path)
+                        yield FileResult(file_path, chunks, None)
+                    except Exception as e:
+                        logger.error(f"Erro ao processar arquivo {file_path}: {str(e)}")
+                        yield FileResult(file_path, [], str(e))
+        finally:
+            # Se o consumidor parar antes do fim, descarta os arquivos pendentes
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Gera os chunks de todos os arquivos suportados de um diretório.
+        
+        Args:
+            directory_path: Caminho do diretório
+            recursive: Se deve processar subdiretórios
+            parallel: Se deve usar o pool de processos; arquivos com erro são
+                ignorados em vez de interromper o diretório
+            max_workers: Número de processos no modo paralelo
+            
+        Returns:
+            Iterador de chunks processados com metadados
+        """
+        if parallel:
+            failed = []
+            for result in self.iter_directory_parallel(directory_path, recursive, max_workers):
+                if result.error is not None:
+                    failed.append(result.file_path)
+                yield from result.chunks
+            if failed:
+                logger.warning(f"{len(failed)} arquivo(s) com erro em {directory_path}: {failed}")
+        else:
+            for file_path in self.list_files(directory_path, recursive):
+                yield from self.iter_chunks(str(file_path))
+
     def process_directory(
         self,
         directory_path: str,
-        recursive: bool = True
+        recursive: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None
     ) -> List[Dict]:
         """
         Processa todos os arquivos suportados em um diretório.
@@ -104,22 +517,15 @@ class DocumentProcessor:
         Args:
             directory_path: Caminho do diretório
             recursive: Se deve processar subdiretórios
+            parallel: Se deve usar o pool de processos; arquivos com erro são
+                ignorados em vez de interromper o diretório
+            max_workers: Número de processos no modo paralelo
             
         Returns:
             Lista de todos os chunks processados
         """
         try:
-            directory_path = Path(directory_path)
-            if not directory_path.exists():
-                raise NotADirectoryError(f"Diretório não encontrado: {directory_path}")
-
-            all_chunks = []
-            pattern = '**/*' if recursive else '*'
-            
-            for ext in self.SUPPORTED_EXTENSIONS.keys():
-                for file_path in directory_path.glob(f'{pattern}{ext}'):
-                    chunks = self.process_file(str(file_path))
-                    all_chunks.extend(chunks)
+            all_chunks = list(self.iter_directory(directory_path, recursive, parallel, max_workers))
             
             logger.info(f"Diretório processado com sucesso: {directory_path}")
             return all_chunks
@@ -1,12 +1,77 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+import queue
+import threading
 import numpy as np
 from langchain.embeddings.base import Embeddings
 import logging
-from pymongo import MongoClient
+from pymongo import MongoClient, ReplaceOne
 from datetime import datetime
+from .memoize import invalidates, memoize
 
 logger = logging.getLogger(__name__)
 
+# Marca o fim do iterador de origem na fila de pré-carregamento
+_END_OF_STREAM = object()
+
+def prefetch_batches(
+    items: Iterable,
+    batch_size: int,
+    max_pending: int = 2
+) -> Iterator[List]:
+    """
+    Agrupa um iterador em lotes produzidos por uma thread em segundo plano.
+    
+    Enquanto o consumidor processa um lote, a thread já prepara os próximos;
+    a fila limitada mantém no máximo max_pending lotes em memória.
+    
+    Args:
+        items: Iterador de origem
+        batch_size: Tamanho de cada lote
+        max_pending: Lotes prontos mantidos à frente do consumidor
+        
+    Returns:
+        Iterador de lotes
+    """
+    batches: queue.Queue = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_END_OF_STREAM)
+        except Exception as e:
+            put(e)
+
+    producer = threading.Thread(target=produce, name="embeddings-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _END_OF_STREAM:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        stop.set()
+
 def get_azure_embeddings():
     # You need to implement this function to return an instance of Embeddings
     # For example:
@@ -59,38 +124,110 @@ class EmbeddingsManager:
             logger.error(f"Erro ao criar embedding: {str(e)}")
             raise
 
-    def store_embeddings(self, chunks: List[Dict]) -> List[str]:
+    def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
         """
-        Armazena embeddings e chunks no MongoDB.
+        Gera os embeddings de um lote de chunks em uma única chamada ao modelo.
+        
+        O 'id' do chunk, quando presente, vira o _id do documento.
+        
+        Args:
+            chunks: Lote de chunks processados
+            
+        Returns:
+            Documentos prontos para inserção na coleção
+        """
+        embeddings = self.embeddings.embed_documents([chunk['content'] for chunk in chunks])
+        created_at = datetime.utcnow()
+        docs = []
+        for chunk, embedding in zip(chunks, embeddings):
+            doc = {
+                'content': chunk['content'],
+                'embedding': embedding,
+                'metadata': chunk['metadata'],
+                'created_at': created_at
+            }
+            if chunk.get('id') is not None:
+                doc['_id'] = chunk['id']
+            docs.append(doc)
+        return docs
+
+    def insert_documents(self, docs: List[Dict]) -> List[str]:
+        """
+        Grava documentos com embeddings já gerados.
+        
+        Documentos com _id determinístico são gravados com upsert, o que
+        torna a gravação idempotente: repetir um lote não duplica vetores.
+        Não invalida o cache: quem grava em lotes chama invalidate_stats
+        uma vez ao final.
         
         Args:
-            chunks: Lista de chunks processados
+            docs: Documentos gerados por embed_chunks
             
         Returns:
             Lista de IDs dos documentos armazenados
         """
+        if not docs:
+            return []
+        if all('_id' in doc for doc in docs):
+            self.collection.bulk_write(
+                [ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in docs],
+                ordered=False
+            )
+            return [str(doc['_id']) for doc in docs]
+        result = self.collection.insert_many(docs)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    @invalidates(["embeddings"])
+    def iter_store_embeddings(
+        self,
+        chunks: Iterable[Dict],
+        batch_size: int = 64
+    ) -> Iterator[Tuple[Dict, str]]:
+        """
+        Armazena embeddings de um iterador de chunks, em lotes.
+        
+        Os chunks são consumidos sob demanda: a produção do próximo lote
+        (parsing) ocorre em paralelo com a geração de embeddings do atual, e a
+        memória fica limitada a poucos lotes.
+        
+        Args:
+            chunks: Iterador de chunks processados
+            batch_size: Chunks por chamada ao modelo e por inserção
+            
+        Returns:
+            Iterador de (metadados do chunk, ID do documento armazenado)
+        """
         try:
-            stored_ids = []
-            for chunk in chunks:
-                embedding = self.create_embedding(chunk['content'])
-                
-                doc = {
-                    'content': chunk['content'],
-                    'embedding': embedding,
-                    'metadata': chunk['metadata'],
-                    'created_at': datetime.utcnow()
-                }
-                
-                result = self.collection.insert_one(doc)
-                stored_ids.append(str(result.inserted_id))
+            total = 0
+            for batch in prefetch_batches(chunks, batch_size):
+                inserted_ids = self.insert_documents(self.embed_chunks(batch))
+                total += len(inserted_ids)
+                for chunk, inserted_id in zip(batch, inserted_ids):
+                    yield chunk['metadata'], inserted_id
             
-            logger.info(f"Armazenados {len(stored_ids)} embeddings")
-            return stored_ids
+            logger.info(f"Armazenados {total} embeddings")
             
         except Exception as e:
             logger.error(f"Erro ao armazenar embeddings: {str(e)}")
             raise
 
+    @invalidates(["embeddings"])
+    def invalidate_stats(self) -> None:
+        """Invalida as estatísticas em cache após gravações com insert_documents."""
+
+    def store_embeddings(self, chunks: Iterable[Dict], batch_size: int = 64) -> List[str]:
+        """
+        Armazena embeddings e chunks no MongoDB.
+        
+        Args:
+            chunks: Lista ou iterador de chunks processados
+            batch_size: Chunks por chamada ao modelo e por inserção
+            
+        Returns:
+            Lista de IDs dos documentos armazenados
+        """
+        return [chunk_id for _, chunk_id in self.iter_store_embeddings(chunks, batch_size)]
+
     def search_similar(
         self,
         query: str,
@@ -153,6 +290,7 @@ class EmbeddingsManager:
             logger.error(f"Erro na busca por similaridade: {str(e)}")
             raise
 
+    @memoize("embeddings.stats", tags=["embeddings"], ttl=600, scope=lambda manager: manager.collection.full_name)
     def get_document_stats(self) -> Dict:
         """
         Retorna estatísticas sobre os documentos armazenados.
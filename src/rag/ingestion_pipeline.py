@@ -0,0 +1,450 @@
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+import logging
+import os
+import queue
+import threading
+import time
+from .document_processor import DocumentProcessor, _process_file_in_worker, _result_with_ocr, create_worker_pool
+from .embeddings_manager import EmbeddingsManager
+
+logger = logging.getLogger(__name__)
+
+# Sinal de parada enviado a cada thread de um estágio
+_STOP = object()
+
+# Chamado com o progresso do arquivo após o parsing e após cada lote gravado:
+# (índice do lote gravado, ou None após o parsing; progresso)
+ProgressCallback = Callable[[Optional[int], Dict[str, Any]], None]
+
+class StageMetrics:
+    """Contadores de um estágio: itens processados, tempo ocupado e fila de entrada."""
+
+    def __init__(self, name: str, workers: int, input_queue: queue.Queue):
+        self.name = name
+        self.workers = workers
+        self.input_queue = input_queue
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.items = 0
+        self.calls = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+    def record(self, items: int, seconds: float, failed: bool = False) -> None:
+        with self._lock:
+            self.calls += 1
+            self.busy_seconds += seconds
+            if failed:
+                self.errors += 1
+            else:
+                self.items += items
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retorna os contadores do estágio.
+
+        A utilização é o tempo ocupado dividido pelo tempo disponível
+        (tempo decorrido x workers): o estágio mais próximo de 1 é o gargalo.
+        """
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        with self._lock:
+            return {
+                "stage": self.name,
+                "workers": self.workers,
+                "items": self.items,
+                "calls": self.calls,
+                "errors": self.errors,
+                "busy_seconds": round(self.busy_seconds, 3),
+                "utilization": round(min(self.busy_seconds / (elapsed * self.workers), 1.0), 3),
+                "items_per_second": round(self.items / elapsed, 3),
+                "queue_depth": self.input_queue.qsize(),
+                "queue_capacity": self.input_queue.maxsize
+            }
+
+class IngestionTask:
+    """Acompanha um arquivo ao longo dos estágios até todos os lotes serem gravados."""
+
+    def __init__(
+        self,
+        file_path: str,
+        file_hash: Optional[str],
+        skip_batches: Collection[int] = (),
+        on_progress: Optional[ProgressCallback] = None,
+        file_name: Optional[str] = None
+    ):
+        self.file_path = file_path
+        self.file_hash = file_hash
+        self.file_name = file_name
+        self.skip_batches = frozenset(skip_batches)
+        self.on_progress = on_progress
+        self.future: Future = Future()
+        self._lock = threading.Lock()
+        self._batches_total: Optional[int] = None
+        self._written: Dict[int, List[str]] = {}
+        self.bytes_parsed = 0
+        self.chunks_total: Optional[int] = None
+        self.chunks_done = 0
+        self.chunks_resumed = 0
+        self.stage_seconds = {"parse": 0.0, "embed": 0.0, "write": 0.0}
+        self._parsed_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Retorna o progresso do arquivo.
+
+        O ETA usa a vazão observada deste arquivo desde o fim do parsing
+        (lotes retomados de um checkpoint não contam na vazão).
+
+        Returns:
+            Dicionário com chunks, bytes, tempos por estágio e ETA em segundos
+        """
+        with self._lock:
+            eta = None
+            if self.chunks_total is not None:
+                remaining = self.chunks_total - self.chunks_done
+                embedded = self.chunks_done - self.chunks_resumed
+                elapsed = time.monotonic() - self._parsed_at
+                if remaining <= 0:
+                    eta = 0.0
+                elif embedded > 0 and elapsed > 0:
+                    eta = round(remaining * elapsed / embedded, 1)
+            return {
+                "chunks_total": self.chunks_total,
+                "chunks_embedded": self.chunks_done,
+                "bytes_parsed": self.bytes_parsed,
+                "stage_timings": {stage: round(seconds, 3) for stage, seconds in self.stage_seconds.items()},
+                "eta_seconds": eta
+            }
+
+    def _notify(self, batch_index: Optional[int]) -> None:
+        if self.on_progress is None:
+            return
+        try:
+            self.on_progress(batch_index, self.progress())
+        except Exception as e:
+            # Sem o checkpoint, uma nova tentativa apenas refaz este lote
+            logger.error(f"Erro ao registrar progresso de {self.file_path}: {str(e)}")
+
+    def fail(self, error: BaseException) -> None:
+        with self._lock:
+            if not self.future.done():
+                self.future.set_exception(error)
+
+    def parsed(self, batches_total: int, chunks_total: int, bytes_parsed: int) -> None:
+        with self._lock:
+            self._batches_total = batches_total
+            self.chunks_total = chunks_total
+            self.bytes_parsed = bytes_parsed
+            self._parsed_at = time.monotonic()
+        self._notify(None)
+        with self._lock:
+            self._finish_if_complete()
+
+    def batch_written(self, batch_index: int, ids: List[str], resumed: bool = False) -> None:
+        with self._lock:
+            self.chunks_done += len(ids)
+            if resumed:
+                self.chunks_resumed += len(ids)
+        if not resumed:
+            self._notify(batch_index)
+        with self._lock:
+            self._written[batch_index] = ids
+            self._finish_if_complete()
+
+    def _finish_if_complete(self) -> None:
+        if self.future.done() or self._batches_total is None:
+            return
+        if len(self._written) == self._batches_total:
+            self.future.set_result([
+                chunk_id
+                for batch_index in range(self._batches_total)
+                for chunk_id in self._written[batch_index]
+            ])
+
+class IngestionPipeline:
+    """
+    Ingestão de documentos em estágios com pools independentes.
+
+    parse (processos) -> embed (threads) -> write (inserções em lote).
+    Filas limitadas entre os estágios fazem a pressão de volta: se o modelo
+    de embeddings é o gargalo, o parsing para de avançar em vez de acumular
+    chunks na memória, e quem envia arquivos espera por uma vaga. Vários
+    arquivos ocupam os estágios ao mesmo tempo, de modo que o parsing de um
+    se sobrepõe aos embeddings e à gravação dos outros.
+    """
+
+    def __init__(
+        self,
+        processor: DocumentProcessor,
+        embeddings_manager: EmbeddingsManager,
+        parse_workers: Optional[int] = None,
+        embed_workers: int = 4,
+        embed_batch_size: int = 64,
+        write_batch_size: int = 256,
+        queue_size: int = 8
+    ):
+        """
+        Inicializa o pipeline; threads e processos só são criados no primeiro envio.
+
+        Args:
+            processor: Processador usado (recriado) nos processos de parsing
+            embeddings_manager: Gerenciador de embeddings e da coleção
+            parse_workers: Processos de parsing (padrão: max_workers do processador)
+            embed_workers: Threads com chamadas simultâneas ao modelo
+            embed_batch_size: Chunks por chamada ao modelo
+            write_batch_size: Documentos acumulados por insert_many
+            queue_size: Capacidade de cada fila entre estágios
+        """
+        self.processor = processor
+        self.embeddings_manager = embeddings_manager
+        self.parse_workers = max(1, parse_workers or processor.max_workers)
+        self.embed_workers = max(1, embed_workers)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.write_batch_size = max(1, write_batch_size)
+
+        self.parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.embed_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.write_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.metrics = {
+            "parse": StageMetrics("parse", self.parse_workers, self.parse_queue),
+            "embed": StageMetrics("embed", self.embed_workers, self.embed_queue),
+            "write": StageMetrics("write", 1, self.write_queue)
+        }
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._threads: Dict[str, List[threading.Thread]] = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            # Loaders registrados depois deste ponto não chegam aos processos
+            self._executor = create_worker_pool(self.parse_workers)
+            stages = [
+                ("parse", self._parse_loop, self.parse_workers),
+                ("embed", self._embed_loop, self.embed_workers),
+                ("write", self._write_loop, 1)
+            ]
+            for name, target, count in stages:
+                self._threads[name] = [
+                    threading.Thread(target=target, name=f"ingestion-{name}-{i}", daemon=True)
+                    for i in range(count)
+                ]
+                for thread in self._threads[name]:
+                    thread.start()
+            logger.info(
+                f"Pipeline de ingestão iniciado: {self.parse_workers} parse, "
+                f"{self.embed_workers} embed, 1 write"
+            )
+
+    def submit(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        skip_batches: Collection[int] = (),
+        on_progress: Optional[ProgressCallback] = None,
+        file_name: Optional[str] = None
+    ) -> Future:
+        """
+        Envia um arquivo ao pipeline.
+
+        Bloqueia enquanto a fila de parsing estiver cheia. Para retomar um
+        processamento interrompido, skip_batches indica os lotes (de
+        embed_batch_size chunks) já gravados: eles não passam de novo pelo
+        modelo e seus IDs determinísticos entram no resultado.
+
+        Args:
+            file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo, se já conhecido
+            skip_batches: Índices dos lotes já gravados
+            on_progress: Chamado após o parsing e após a gravação de cada
+                lote (checkpoint e progresso)
+            file_name: Nome original do arquivo, gravado nos metadados dos chunks
+
+        Returns:
+            Future com a lista de IDs armazenados, na ordem dos chunks
+        """
+        self._ensure_started()
+        task = IngestionTask(str(file_path), file_hash, skip_batches, on_progress, file_name)
+        self.parse_queue.put(task)
+        return task.future
+
+    def ingest(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        skip_batches: Collection[int] = (),
+        on_progress: Optional[ProgressCallback] = None,
+        file_name: Optional[str] = None
+    ) -> List[str]:
+        """
+        Processa um arquivo pelo pipeline e aguarda a gravação de todos os chunks.
+
+        Args:
+            file_path: Caminho do arquivo
+            file_hash: SHA-256 do arquivo, se já conhecido
+            skip_batches: Índices dos lotes já gravados
+            on_progress: Chamado após o parsing e após a gravação de cada lote
+            file_name: Nome original do arquivo, gravado nos metadados dos chunks
+
+        Returns:
+            Lista de IDs dos documentos armazenados
+        """
+        return self.submit(file_path, file_hash, skip_batches, on_progress, file_name).result()
+
+    def _parse_loop(self) -> None:
+        config = self.processor.worker_config()
+        while True:
+            task = self.parse_queue.get()
+            if task is _STOP:
+                return
+            start = time.perf_counter()
+            try:
+                args = (type(self.processor), config, task.file_path, task.file_hash, task.file_name)
+                # Páginas digitalizadas passam pelo pool de OCR deste processo
+                chunks = _result_with_ocr(
+                    self._executor,
+                    self._executor.submit(_process_file_in_worker, *args),
+                    *args
+                )
+                bytes_parsed = os.path.getsize(task.file_path)
+            except Exception as e:
+                self.metrics["parse"].record(0, time.perf_counter() - start, failed=True)
+                logger.error(f"Erro no parsing de {task.file_path}: {str(e)}")
+                task.fail(e)
+                continue
+            elapsed = time.perf_counter() - start
+            self.metrics["parse"].record(1, elapsed)
+            task.add_time("parse", elapsed)
+
+            batches = [
+                chunks[i:i + self.embed_batch_size]
+                for i in range(0, len(chunks), self.embed_batch_size)
+            ]
+            task.parsed(len(batches), len(chunks), bytes_parsed)
+            for batch_index, batch in enumerate(batches):
+                if batch_index in task.skip_batches and all(chunk.get('id') for chunk in batch):
+                    task.batch_written(batch_index, [chunk['id'] for chunk in batch], resumed=True)
+                    continue
+                # Bloqueia quando o estágio de embeddings está atrasado
+                self.embed_queue.put((task, batch_index, batch))
+
+    def _embed_loop(self) -> None:
+        while True:
+            item = self.embed_queue.get()
+            if item is _STOP:
+                return
+            task, batch_index, batch = item
+            if task.done:
+                continue
+            start = time.perf_counter()
+            try:
+                docs = self.embeddings_manager.embed_chunks(batch)
+            except Exception as e:
+                self.metrics["embed"].record(0, time.perf_counter() - start, failed=True)
+                logger.error(f"Erro ao gerar embeddings de {task.file_path}: {str(e)}")
+                task.fail(e)
+                if task.chunks_done:
+                    self.embeddings_manager.invalidate_stats()
+                continue
+            elapsed = time.perf_counter() - start
+            self.metrics["embed"].record(len(batch), elapsed)
+            task.add_time("embed", elapsed)
+            self.write_queue.put((task, batch_index, docs))
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self.write_queue.get()
+            if item is _STOP:
+                return
+
+            # Junta lotes já prontos (de um ou mais arquivos) em um único insert_many
+            group: List[Tuple[IngestionTask, int, List[Dict]]] = [item]
+            size = len(item[2])
+            stop = False
+            while size < self.write_batch_size:
+                try:
+                    item = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                group.append(item)
+                size += len(item[2])
+
+            group = [entry for entry in group if not entry[0].done]
+            if group:
+                self._write_group(group)
+            if stop:
+                return
+
+    def _write_group(self, group: List[Tuple[IngestionTask, int, List[Dict]]]) -> None:
+        docs = [doc for _, _, batch_docs in group for doc in batch_docs]
+        start = time.perf_counter()
+        try:
+            ids = self.embeddings_manager.insert_documents(docs)
+        except Exception as e:
+            self.metrics["write"].record(0, time.perf_counter() - start, failed=True)
+            logger.error(f"Erro ao gravar {len(docs)} embeddings: {str(e)}")
+            for task, _, _ in group:
+                task.fail(e)
+            if any(task.chunks_done for task, _, _ in group):
+                self.embeddings_manager.invalidate_stats()
+            return
+        elapsed = time.perf_counter() - start
+        self.metrics["write"].record(len(docs), elapsed)
+
+        offset = 0
+        for task, batch_index, batch_docs in group:
+            task.add_time("write", elapsed)
+            task.batch_written(batch_index, ids[offset:offset + len(batch_docs)])
+            offset += len(batch_docs)
+
+        # Uma invalidação por arquivo concluído, não por lote gravado
+        if any(task.done for task, _, _ in group):
+            self.embeddings_manager.invalidate_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas de cada estágio e o gargalo atual.
+
+        Returns:
+            Dicionário com os estágios e o nome do mais utilizado
+        """
+        stages = [metrics.snapshot() for metrics in self.metrics.values()]
+        busiest = max(stages, key=lambda stage: stage["utilization"])
+        return {
+            "running": bool(self._threads),
+            "stages": stages,
+            "bottleneck": busiest["stage"] if busiest["calls"] else None
+        }
+
+    def shutdown(self) -> None:
+        """Esvazia os estágios em ordem e encerra threads e processos."""
+        with self._start_lock:
+            if not self._threads:
+                return
+            for name, stage_queue in (
+                ("parse", self.parse_queue),
+                ("embed", self.embed_queue),
+                ("write", self.write_queue)
+            ):
+                for _ in self._threads[name]:
+                    stage_queue.put(_STOP)
+                for thread in self._threads[name]:
+                    thread.join()
+            self._executor.shutdown(wait=True)
+            self._threads = {}
+            self._executor = None
+            logger.info("Pipeline de ingestão encerrado")
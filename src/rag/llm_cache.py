@@ -0,0 +1,224 @@
+from typing import Optional, Iterator
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pymongo import ASCENDING, ReturnDocument
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from src.config.settings import get_settings
+from src.utils.utils import get_mongodb_client
+from .cache_metrics import CacheMetrics
+
+logger = logging.getLogger(__name__)
+
+# Desativa o cache na chamada corrente (thread ou task asyncio)
+_cache_disabled: ContextVar[bool] = ContextVar("llm_cache_disabled", default=False)
+
+@contextmanager
+def llm_cache_disabled(disabled: bool = True) -> Iterator[None]:
+    """
+    Ignora o cache de respostas do LLM dentro do bloco.
+    
+    Args:
+        disabled: Se False, o bloco não altera o comportamento do cache
+    """
+    token = _cache_disabled.set(disabled or _cache_disabled.get())
+    try:
+        yield
+    finally:
+        _cache_disabled.reset(token)
+
+class MongoLLMCache(BaseCache):
+    """Cache persistente de respostas do LLM por correspondência exata do prompt."""
+    
+    # Frequência (em gravações) da verificação do limite de entradas
+    EVICTION_CHECK_INTERVAL = 50
+    
+    # Namespace usado nas métricas do cache
+    METRICS_NAMESPACE = "llm"
+    
+    def __init__(
+        self,
+        mongodb_uri: str,
+        database_name: str = "ada",
+        collection_name: str = "llm_cache",
+        ttl: int = 86400,  # 24 horas em segundos
+        max_entries: int = 10000
+    ):
+        """
+        Inicializa o cache de respostas do LLM.
+        
+        Args:
+            mongodb_uri: URI do MongoDB
+            database_name: Nome do banco de dados
+            collection_name: Nome da coleção
+            ttl: Tempo de vida das respostas em segundos
+            max_entries: Número máximo de respostas armazenadas
+        """
+        self.client = get_mongodb_client(mongodb_uri)
+        self.collection = self.client[database_name][collection_name]
+        self.metrics_collection = self.client[database_name][CacheMetrics.COLLECTION_NAME]
+        self.metrics = CacheMetrics()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes = 0
+        self._indexes_ready = False
+        self._indexes_lock = threading.Lock()
+
+    def _ensure_indexes(self) -> None:
+        """
+        Cria os índices no primeiro acesso ao cache.
+        
+        Adiado para fora do construtor para que criar o cache (por exemplo,
+        na importação dos routers) não acesse o MongoDB. Em caso de falha,
+        a criação é tentada novamente no próximo acesso.
+        """
+        if self._indexes_ready:
+            return
+        with self._indexes_lock:
+            if self._indexes_ready:
+                return
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+            self.collection.create_index([("last_accessed_at", ASCENDING)])
+            self._indexes_ready = True
+
+    @staticmethod
+    def _generate_key(prompt: str, llm_string: str) -> str:
+        """
+        Gera a chave da resposta.
+        
+        O llm_string do LangChain já inclui modelo, deployment e temperatura;
+        o prompt é a lista de mensagens renderizadas e serializadas.
+        
+        Args:
+            prompt: Mensagens renderizadas
+            llm_string: Parâmetros do modelo
+            
+        Returns:
+            Hash SHA-256 em hexadecimal
+        """
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Recupera a resposta armazenada para o prompt, se houver."""
+        if _cache_disabled.get():
+            return None
+        try:
+            self._ensure_indexes()
+            start = time.perf_counter()
+            now = datetime.utcnow()
+            doc = self.collection.find_one_and_update(
+                {
+                    "_id": self._generate_key(prompt, llm_string),
+                    "expires_at": {"$gt": now}
+                },
+                {"$set": {"last_accessed_at": now}, "$inc": {"hits": 1}},
+                projection={"generations": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            self.metrics.observe_get(
+                self.METRICS_NAMESPACE,
+                (time.perf_counter() - start) * 1000
+            )
+            self.metrics.increment(self.METRICS_NAMESPACE, "hits" if doc else "misses")
+            if self.metrics.flush_due():
+                self.metrics.flush(self.metrics_collection)
+            if doc is None:
+                return None
+            logger.debug("LLM cache hit")
+            return loads(doc["generations"])
+        except Exception as e:
+            logger.error(f"Erro ao recuperar resposta do cache do LLM: {str(e)}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Armazena a resposta gerada para o prompt."""
+        if _cache_disabled.get():
+            return
+        try:
+            self._ensure_indexes()
+            start = time.perf_counter()
+            now = datetime.utcnow()
+            generations = dumps(list(return_val))
+            self.collection.update_one(
+                {"_id": self._generate_key(prompt, llm_string)},
+                {
+                    "$set": {
+                        "generations": generations,
+                        "expires_at": now + timedelta(seconds=self.ttl),
+                        "last_accessed_at": now,
+                        "updated_at": now
+                    },
+                    "$setOnInsert": {"created_at": now, "hits": 0}
+                },
+                upsert=True
+            )
+            self.metrics.observe_set(
+                self.METRICS_NAMESPACE,
+                (time.perf_counter() - start) * 1000
+            )
+            self.metrics.increment(self.METRICS_NAMESPACE, "sets")
+            self.metrics.increment(self.METRICS_NAMESPACE, "bytes_stored", len(generations))
+            self._writes += 1
+            if self._writes % self.EVICTION_CHECK_INTERVAL == 0:
+                self._evict()
+            if self.metrics.flush_due():
+                self.metrics.flush(self.metrics_collection)
+        except Exception as e:
+            logger.error(f"Erro ao armazenar resposta no cache do LLM: {str(e)}")
+
+    def _evict(self) -> int:
+        """
+        Remove as respostas menos acessadas recentemente acima do limite.
+        
+        Returns:
+            Número de respostas removidas
+        """
+        overflow = self.collection.estimated_document_count() - self.max_entries
+        if overflow <= 0:
+            return 0
+        stale_ids = [
+            doc["_id"]
+            for doc in self.collection.find({}, {"_id": 1})
+            .sort("last_accessed_at", ASCENDING)
+            .limit(overflow)
+        ]
+        result = self.collection.delete_many({"_id": {"$in": stale_ids}})
+        self.metrics.increment(self.METRICS_NAMESPACE, "evictions", result.deleted_count)
+        logger.info(f"LLM cache evicted: {result.deleted_count} items")
+        return result.deleted_count
+
+    def clear(self, **kwargs) -> None:
+        """Remove todas as respostas armazenadas."""
+        result = self.collection.delete_many({})
+        logger.info(f"LLM cache cleared: {result.deleted_count} items")
+
+@lru_cache()
+def get_llm_cache() -> Optional[MongoLLMCache]:
+    """
+    Retorna o cache de respostas do LLM compartilhado pela aplicação.
+    
+    Como o cache é opcional, erros de conexão não impedem a criação dos
+    modelos: sem cache, as chamadas vão direto ao LLM.
+    
+    Returns:
+        Instância do cache ou None se desativado ou indisponível
+    """
+    settings = get_settings()
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    try:
+        return MongoLLMCache(
+            mongodb_uri=settings.MONGODB_URI,
+            database_name=settings.MONGODB_DB_NAME,
+            ttl=settings.LLM_CACHE_TTL,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES
+        )
+    except Exception as e:
+        logger.error(f"Erro ao criar o cache do LLM: {str(e)}")
+        return None
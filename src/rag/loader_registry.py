@@ -0,0 +1,199 @@
+from typing import Dict, Iterator, Optional, Tuple, Union
+from collections.abc import Mapping
+from importlib import import_module
+from importlib.metadata import entry_points
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Grupos de entry points para registrar loaders de outros pacotes, ex.:
+#   [project.entry-points."ada.document_loaders"]
+#   docx = "meu_pacote.loaders:DocxLoader"
+ENTRY_POINT_GROUP = "ada.document_loaders"
+TABLE_ENTRY_POINT_GROUP = "ada.table_loaders"
+
+LoaderSpec = Union[str, type]
+
+def normalize_extension(extension: str) -> str:
+    """Normaliza uma extensão para o formato '.ext' em minúsculas."""
+    extension = extension.strip().lower()
+    return extension if extension.startswith('.') else f'.{extension}'
+
+class LoaderRegistry(Mapping):
+    """
+    Tabela extensão -> classe de loader, com importação sob demanda.
+
+    Os loaders são registrados como "modulo:Classe" e importados apenas no
+    primeiro uso, de modo que importar o DocumentProcessor não carrega
+    unstructured, pdfminer e afins. Também é um Mapping: "ext in registry",
+    registry[ext] e registry.keys() funcionam como no dicionário anterior.
+    """
+
+    def __init__(self, defaults: Dict[str, LoaderSpec], entry_point_group: Optional[str] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            defaults: Loaders embutidos, por extensão
+            entry_point_group: Grupo de entry points com loaders de terceiros
+        """
+        self._specs: Dict[str, LoaderSpec] = {
+            normalize_extension(extension): spec for extension, spec in defaults.items()
+        }
+        self._loaded: Dict[str, type] = {}
+        # Registros feitos com register, repassados aos processos do pool
+        self._registered: Dict[str, LoaderSpec] = {}
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+        self._lock = threading.Lock()
+
+    def _load_entry_points(self) -> None:
+        """Lê (sem importar) os loaders anunciados por entry points."""
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            try:
+                for entry_point in entry_points(group=self._entry_point_group):
+                    extension = normalize_extension(entry_point.name)
+                    if extension in self._specs:
+                        logger.info(f"Loader de {extension} substituído via entry point: {entry_point.value}")
+                    self._specs[extension] = entry_point.value
+                    self._loaded.pop(extension, None)
+            except Exception as e:
+                logger.error(f"Erro ao ler entry points {self._entry_point_group}: {str(e)}")
+            self._entry_points_loaded = True
+
+    def register(self, extension: str, loader: LoaderSpec) -> None:
+        """
+        Registra (ou substitui) o loader de uma extensão.
+
+        Args:
+            extension: Extensão do arquivo (com ou sem ponto)
+            loader: Classe do loader ou referência "modulo:Classe"
+        """
+        self._load_entry_points()
+        extension = normalize_extension(extension)
+        with self._lock:
+            self._specs[extension] = loader
+            self._registered[extension] = loader
+            self._loaded.pop(extension, None)
+
+    def registered(self) -> Dict[str, LoaderSpec]:
+        """
+        Retorna os loaders registrados com register neste processo.
+
+        Returns:
+            Loaders por extensão, sem os embutidos e os de entry points
+        """
+        with self._lock:
+            return dict(self._registered)
+
+    def __getitem__(self, extension: str) -> type:
+        """
+        Retorna a classe do loader, importando-a no primeiro uso.
+
+        Args:
+            extension: Extensão do arquivo
+
+        Returns:
+            Classe do loader
+        """
+        self._load_entry_points()
+        extension = normalize_extension(extension)
+        loader = self._loaded.get(extension)
+        if loader is not None:
+            return loader
+
+        spec = self._specs[extension]
+        if isinstance(spec, str):
+            module_name, _, attribute = spec.partition(':')
+            try:
+                module = import_module(module_name, package=__package__)
+                loader = getattr(module, attribute)
+            except Exception as e:
+                logger.error(f"Erro ao importar loader {spec} para {extension}: {str(e)}")
+                raise
+        else:
+            loader = spec
+
+        with self._lock:
+            self._loaded[extension] = loader
+        return loader
+
+    def __contains__(self, extension: object) -> bool:
+        self._load_entry_points()
+        return isinstance(extension, str) and normalize_extension(extension) in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._load_entry_points()
+        return len(self._specs)
+
+# Loaders embutidos, relativos ao pacote src.rag
+loader_registry = LoaderRegistry(
+    {
+        '.txt': '.streaming_loaders:StreamingTextLoader',
+        '.pdf': '.pdf_extractor:PageParallelPDFLoader',
+        '.md': '.streaming_loaders:StreamingMarkdownLoader',
+        '.csv': '.streaming_loaders:StreamingCSVLoader',
+        '.xlsx': 'langchain_community.document_loaders:UnstructuredExcelLoader',
+        '.xls': 'langchain_community.document_loaders:UnstructuredExcelLoader',
+    },
+    ENTRY_POINT_GROUP
+)
+
+# Loaders do modo tabela: linhas agrupadas por orçamento de tokens
+table_loader_registry = LoaderRegistry(
+    {
+        '.csv': '.streaming_loaders:TableCSVLoader',
+        '.xlsx': '.streaming_loaders:TableExcelLoader',
+        '.xls': '.streaming_loaders:TableExcelLoader',
+    },
+    TABLE_ENTRY_POINT_GROUP
+)
+
+def register_loader(extension: str, loader: LoaderSpec, table: bool = False) -> None:
+    """
+    Registra um loader para uma extensão.
+
+    Os pools de parsing criados depois do registro também o recebem (ver
+    registered_loaders).
+
+    Args:
+        extension: Extensão do arquivo (com ou sem ponto)
+        loader: Classe do loader ou referência "modulo:Classe"
+        table: Se o registro vale para o modo tabela
+    """
+    (table_loader_registry if table else loader_registry).register(extension, loader)
+
+def registered_loaders() -> Tuple[Dict[str, LoaderSpec], Dict[str, LoaderSpec]]:
+    """
+    Retorna os loaders registrados em tempo de execução neste processo.
+
+    Processos iniciados com spawn importam este módulo do zero e só
+    conhecem os loaders embutidos e os de entry points; estes registros são
+    repassados a eles com apply_registered_loaders.
+
+    Returns:
+        Tupla (loaders, loaders do modo tabela)
+    """
+    return loader_registry.registered(), table_loader_registry.registered()
+
+def apply_registered_loaders(registrations: Tuple[Dict[str, LoaderSpec], Dict[str, LoaderSpec]]) -> None:
+    """
+    Repete, no processo atual, os registros obtidos com registered_loaders.
+
+    Args:
+        registrations: Tupla (loaders, loaders do modo tabela)
+    """
+    loaders, table_loaders = registrations
+    for extension, loader in loaders.items():
+        loader_registry.register(extension, loader)
+    for extension, loader in table_loaders.items():
+        table_loader_registry.register(extension, loader)
@@ -0,0 +1,221 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+import copy
+import functools
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Namespaces de tags: cada tag é um namespace do cache com contador de geração
+TAG_NAMESPACE_PREFIX = "tag:"
+
+TagsSpec = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+def _bind_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    """
+    Associa os argumentos da chamada aos parâmetros da função.
+    
+    Args:
+        signature: Assinatura da função decorada
+        args: Argumentos posicionais
+        kwargs: Argumentos nomeados
+        
+    Returns:
+        Argumentos por nome, com defaults aplicados e sem self/cls
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return {
+        name: value
+        for name, value in bound.arguments.items()
+        if name not in ("self", "cls")
+    }
+
+def _resolve_tags(tags: TagsSpec, arguments: Dict[str, Any]) -> List[str]:
+    """
+    Calcula as tags de uma chamada.
+    
+    Args:
+        tags: Lista de modelos (ex.: "epic:{epic_id}") ou função que recebe
+            os argumentos nomeados e retorna as tags
+        arguments: Argumentos da chamada
+        
+    Returns:
+        Lista de tags ordenada e sem repetições
+    """
+    if tags is None:
+        return []
+    if callable(tags):
+        resolved = tags(**arguments)
+    else:
+        resolved = [tag.format(**arguments) for tag in tags]
+    return sorted(set(resolved))
+
+def _tag_namespaces(tags: List[str]) -> List[str]:
+    """Converte tags nos namespaces de geração correspondentes."""
+    return [f"{TAG_NAMESPACE_PREFIX}{tag}" for tag in tags]
+
+def _build_params(
+    arguments: Dict[str, Any],
+    generations: Dict[str, int],
+    scope: Optional[Callable[[Any], Any]],
+    args: tuple
+) -> Dict[str, Any]:
+    """Monta os parâmetros da chave: argumentos, gerações das tags e escopo."""
+    params = {"arguments": arguments, "tags": generations}
+    if scope is not None:
+        params["scope"] = scope(args[0])
+    return params
+
+def memoize(
+    namespace: str,
+    tags: TagsSpec = None,
+    ttl: Optional[int] = None,
+    scope: Optional[Callable[[Any], Any]] = None,
+    cache_manager: Optional[Callable[[], Any]] = None
+) -> Callable:
+    """
+    Memoiza um método de leitura (síncrono ou assíncrono) no cache.
+    
+    A chave combina os argumentos da chamada (exceto self) com a geração atual
+    de cada tag; incrementar uma tag com invalidates torna as entradas
+    associadas inalcançáveis. Falhas do cache nunca impedem a chamada original.
+    
+    O resultado é sempre uma cópia: o valor guardado na camada em memória é
+    compartilhado entre chamadas e não pode ser alterado pelo chamador.
+    
+    Args:
+        namespace: Namespace das entradas no cache
+        tags: Tags de invalidação (modelos formatados com os argumentos ou
+            função que as calcula)
+        ttl: Tempo de vida em segundos (padrão do cache se None)
+        scope: Função que recebe self e retorna o que distingue instâncias
+            (ex.: nome completo da coleção)
+        cache_manager: Fábrica do gerenciador de cache (padrão:
+            get_cache_manager ou get_async_cache_manager)
+        
+    Returns:
+        Decorador
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                arguments = _bind_arguments(signature, args, kwargs)
+                try:
+                    if cache_manager is None:
+                        from .async_cache_manager import get_async_cache_manager
+                        cache = get_async_cache_manager()
+                    else:
+                        cache = cache_manager()
+                    tag_list = _resolve_tags(tags, arguments)
+                    generations = await cache.get_generations(_tag_namespaces(tag_list))
+                    params = _build_params(arguments, generations, scope, args)
+                except Exception as e:
+                    logger.error(f"Erro ao preparar memoização de {namespace}: {str(e)}")
+                    return await func(*args, **kwargs)
+                
+                return copy.deepcopy(await cache.get_or_set(
+                    namespace,
+                    params,
+                    lambda: func(*args, **kwargs),
+                    ttl
+                ))
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            arguments = _bind_arguments(signature, args, kwargs)
+            try:
+                if cache_manager is None:
+                    from .cache_manager import get_cache_manager
+                    cache = get_cache_manager()
+                else:
+                    cache = cache_manager()
+                tag_list = _resolve_tags(tags, arguments)
+                generations = cache.get_generations(_tag_namespaces(tag_list))
+                params = _build_params(arguments, generations, scope, args)
+            except Exception as e:
+                logger.error(f"Erro ao preparar memoização de {namespace}: {str(e)}")
+                return func(*args, **kwargs)
+            
+            return copy.deepcopy(cache.get_or_set(
+                namespace,
+                params,
+                lambda: func(*args, **kwargs),
+                ttl
+            ))
+        return wrapper
+    return decorator
+
+def invalidates(
+    tags: TagsSpec,
+    cache_manager: Optional[Callable[[], Any]] = None
+) -> Callable:
+    """
+    Invalida tags do cache após a execução bem-sucedida de um método de escrita.
+    
+    Em geradores, a invalidação ocorre quando o gerador é encerrado.
+    
+    Args:
+        tags: Tags a invalidar (modelos formatados com os argumentos ou
+            função que as calcula)
+        cache_manager: Fábrica do gerenciador de cache (padrão:
+            get_cache_manager ou get_async_cache_manager)
+        
+    Returns:
+        Decorador
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                try:
+                    if cache_manager is None:
+                        from .async_cache_manager import get_async_cache_manager
+                        cache = get_async_cache_manager()
+                    else:
+                        cache = cache_manager()
+                    tag_list = _resolve_tags(tags, _bind_arguments(signature, args, kwargs))
+                    for tag_namespace in _tag_namespaces(tag_list):
+                        await cache.invalidate(tag_namespace)
+                except Exception as e:
+                    logger.error(f"Erro ao invalidar tags do cache: {str(e)}")
+                return result
+            return async_wrapper
+        
+        def invalidate_tags(args: tuple, kwargs: dict) -> None:
+            try:
+                if cache_manager is None:
+                    from .cache_manager import get_cache_manager
+                    cache = get_cache_manager()
+                else:
+                    cache = cache_manager()
+                tag_list = _resolve_tags(tags, _bind_arguments(signature, args, kwargs))
+                for tag_namespace in _tag_namespaces(tag_list):
+                    cache.invalidate(tag_namespace)
+            except Exception as e:
+                logger.error(f"Erro ao invalidar tags do cache: {str(e)}")
+        
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                # Escritas parciais também alteram os dados: invalida ao encerrar
+                try:
+                    yield from func(*args, **kwargs)
+                finally:
+                    invalidate_tags(args, kwargs)
+            return generator_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            invalidate_tags(args, kwargs)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,189 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from collections import OrderedDict
+import pickle
+import sys
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CacheEntry(NamedTuple):
+    """Entrada do cache com metadados de expiração."""
+    value: Any
+    expires_at: float  # timestamp (time.time()) de expiração
+    compute_time: float = 0.0  # segundos gastos para calcular o valor
+    size: int = 0  # tamanho estimado em bytes
+    namespace: Optional[str] = None
+    evict_at: Optional[float] = None  # prazo na memória, se antes da expiração
+
+    @property
+    def local_deadline(self) -> float:
+        """Momento em que a entrada deixa a camada em memória."""
+        return self.expires_at if self.evict_at is None else min(self.expires_at, self.evict_at)
+
+def estimate_size(value: Any) -> int:
+    """
+    Estima o tamanho em bytes de um valor.
+    
+    Args:
+        value: Valor a ser medido
+        
+    Returns:
+        Tamanho serializado do valor em bytes
+    """
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+class MemoryCache:
+    """Cache em memória do processo com política LRU, TTL e limite de bytes."""
+    
+    def __init__(
+        self,
+        max_items: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,  # 64 MB
+        max_item_bytes: Optional[int] = None,
+        on_evict: Optional[Callable[[str, CacheEntry], None]] = None
+    ):
+        """
+        Inicializa o cache em memória.
+        
+        Args:
+            max_items: Número máximo de entradas
+            max_bytes: Tamanho total máximo em bytes
+            max_item_bytes: Tamanho máximo de uma entrada (padrão: 1/8 do total)
+            on_evict: Chamada para cada entrada removida por falta de espaço
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes or max_bytes // 8
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Recupera uma entrada válida do cache.
+        
+        Args:
+            key: Chave da entrada
+            
+        Returns:
+            Entrada do cache ou None se ausente ou expirada
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.local_deadline <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        expires_at: float,
+        compute_time: float = 0.0,
+        size: Optional[int] = None,
+        namespace: Optional[str] = None,
+        evict_at: Optional[float] = None
+    ) -> bool:
+        """
+        Armazena uma entrada, removendo as menos usadas se necessário.
+        
+        Args:
+            key: Chave da entrada
+            value: Valor a ser armazenado
+            expires_at: Timestamp de expiração
+            compute_time: Segundos gastos para calcular o valor
+            size: Tamanho em bytes, se já conhecido
+            namespace: Namespace da entrada, repassado a on_evict
+            evict_at: Prazo de permanência na memória, se menor que a
+                expiração (a entrada mantém expires_at real para decisões
+                de renovação antecipada)
+            
+        Returns:
+            True se a entrada foi armazenada
+        """
+        size = estimate_size(value) if size is None else size
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_item_bytes:
+                return False
+            self._entries[key] = CacheEntry(value, expires_at, compute_time, size, namespace, evict_at)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_items or self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._entries))
+                evicted.append((oldest_key, self._remove(oldest_key)))
+        if self.on_evict is not None:
+            for evicted_key, entry in evicted:
+                self.on_evict(evicted_key, entry)
+        return True
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove uma entrada do cache.
+        
+        Args:
+            key: Chave da entrada
+            
+        Returns:
+            True se a entrada existia
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        """
+        Limpa o cache.
+        
+        Args:
+            prefix: Se fornecido, remove apenas chaves com este prefixo
+            
+        Returns:
+            Número de entradas removidas
+        """
+        with self._lock:
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key: str) -> CacheEntry:
+        """Remove uma entrada; deve ser chamado com o lock adquirido."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache em memória.
+        
+        Returns:
+            Dicionário com estatísticas
+        """
+        with self._lock:
+            return {
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes
+            }
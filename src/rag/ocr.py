@@ -0,0 +1,237 @@
+from typing import Dict, List, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+import logging
+import multiprocessing
+import threading
+import time
+from src.config.settings import get_settings
+from .cache_manager import get_optional_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Namespace do cache de texto obtido por OCR, por página
+OCR_CACHE_NAMESPACE = "ocr_pages"
+
+# Janela usada no cálculo da vazão, em segundos
+THROUGHPUT_WINDOW = 300
+
+def ocr_page(file_path: str, page: int, dpi: int, language: str) -> str:
+    """
+    Rasteriza uma página do PDF e extrai o texto com Tesseract.
+
+    Executado nos processos do pool de OCR.
+
+    Args:
+        file_path: Caminho do PDF
+        page: Número da página (a partir de 1)
+        dpi: Resolução da rasterização
+        language: Idiomas do Tesseract (ex.: "por+eng")
+
+    Returns:
+        Texto reconhecido
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(file_path, dpi=dpi, first_page=page, last_page=page)
+    return "\n".join(pytesseract.image_to_string(image, lang=language) for image in images)
+
+class OCRMetrics:
+    """Contadores de OCR do processo: fila, vazão e tempo por página."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.cache_hits = 0
+        self.total_seconds = 0.0
+        self._completions: deque = deque()
+
+    def page_waiting(self, delta: int) -> None:
+        with self._lock:
+            self.waiting += delta
+
+    def page_submitted(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def page_finished(self, seconds: float, failed: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self.failed += 1
+                return
+            self.completed += 1
+            self.total_seconds += seconds
+            self._completions.append(now)
+            while self._completions and self._completions[0] < now - THROUGHPUT_WINDOW:
+                self._completions.popleft()
+
+    def pages_cached(self, count: int) -> None:
+        with self._lock:
+            self.cache_hits += count
+
+    def snapshot(self) -> Dict:
+        """Retorna o estado atual dos contadores."""
+        now = time.monotonic()
+        with self._lock:
+            recent = sum(1 for completed_at in self._completions if completed_at >= now - THROUGHPUT_WINDOW)
+            return {
+                "queue_depth": self.waiting + self.in_flight,
+                "waiting": self.waiting,
+                "in_flight": self.in_flight,
+                "pages_completed": self.completed,
+                "pages_failed": self.failed,
+                "cache_hits": self.cache_hits,
+                "avg_seconds_per_page": round(self.total_seconds / self.completed, 3) if self.completed else 0.0,
+                "pages_per_minute": round(recent * 60 / THROUGHPUT_WINDOW, 2)
+            }
+
+class OCREngine:
+    """
+    OCR de páginas em um pool de processos próprio e limitado.
+
+    O pool é separado dos workers da API e do pool de parsing: no máximo
+    max_workers páginas são reconhecidas ao mesmo tempo e no máximo
+    max_pending aguardam na fila; além disso, quem envia páginas espera, de
+    modo que uploads com muito OCR não consomem todos os recursos.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        dpi: int = 300,
+        language: str = "por+eng",
+        cache_ttl: int = 604800
+    ):
+        """
+        Inicializa o motor de OCR.
+
+        Args:
+            max_workers: Processos de OCR
+            max_pending: Páginas enviadas ao pool ao mesmo tempo (em execução ou na fila)
+            dpi: Resolução da rasterização
+            language: Idiomas do Tesseract
+            cache_ttl: Tempo de vida do texto reconhecido no cache, em segundos
+        """
+        self.max_workers = max(1, max_workers)
+        self.dpi = dpi
+        self.language = language
+        self.cache_ttl = cache_ttl
+        self.metrics = OCRMetrics()
+        self._slots = threading.BoundedSemaphore(max(self.max_workers, max_pending))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: clientes do pymongo em cache não são seguros após um fork
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _page_params(self, file_hash: str, page: int) -> Dict:
+        return {"file_hash": file_hash, "page": page, "dpi": self.dpi, "language": self.language}
+
+    def _submit(self, file_path: str, page: int) -> Future:
+        """Envia uma página ao pool, aguardando uma vaga na fila limitada."""
+        self.metrics.page_waiting(1)
+        self._slots.acquire()
+        self.metrics.page_waiting(-1)
+        self.metrics.page_submitted()
+        start = time.perf_counter()
+        try:
+            future = self._get_executor().submit(ocr_page, file_path, page, self.dpi, self.language)
+        except Exception:
+            self._slots.release()
+            self.metrics.page_finished(0.0, failed=True)
+            raise
+
+        def on_done(done: Future) -> None:
+            self._slots.release()
+            self.metrics.page_finished(time.perf_counter() - start, failed=done.exception() is not None)
+
+        future.add_done_callback(on_done)
+        return future
+
+    def ocr_pages(self, file_path: str, file_hash: str, pages: List[int]) -> Dict[int, str]:
+        """
+        Reconhece o texto de páginas sem camada de texto.
+
+        Páginas já reconhecidas vêm do cache; as demais passam pelo pool e
+        são gravadas no cache assim que concluídas. Uma página com erro é
+        registrada e omitida do resultado, sem interromper as demais.
+
+        Args:
+            file_path: Caminho do PDF
+            file_hash: SHA-256 do arquivo
+            pages: Números das páginas (a partir de 1)
+
+        Returns:
+            Texto reconhecido por número de página
+        """
+        cache = get_optional_cache_manager()
+        results: Dict[int, str] = {}
+        if cache is not None:
+            cached = cache.get_many(OCR_CACHE_NAMESPACE, [self._page_params(file_hash, page) for page in pages])
+            results = {page: text for page, text in zip(pages, cached) if text is not None}
+            self.metrics.pages_cached(len(results))
+
+        missing = [page for page in pages if page not in results]
+        if not missing:
+            return results
+
+        futures = {page: self._submit(file_path, page) for page in missing}
+
+        for page in missing:
+            try:
+                text = futures[page].result()
+            except Exception as e:
+                logger.error(f"Erro no OCR da página {page} de {file_path}: {str(e)}")
+                continue
+            results[page] = text
+            if cache is not None:
+                cache.set(OCR_CACHE_NAMESPACE, self._page_params(file_hash, page), text, self.cache_ttl)
+
+        logger.info(f"OCR concluído: {file_path} ({len(missing)} páginas, {len(pages) - len(missing)} do cache)")
+        return results
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna a configuração e as métricas do OCR neste processo.
+
+        Returns:
+            Dicionário com fila, vazão e contadores
+        """
+        return {
+            "max_workers": self.max_workers,
+            "dpi": self.dpi,
+            "language": self.language,
+            **self.metrics.snapshot()
+        }
+
+@lru_cache()
+def get_ocr_engine() -> OCREngine:
+    """
+    Retorna o motor de OCR compartilhado pelo processo.
+
+    Returns:
+        Instância única do OCREngine
+    """
+    settings = get_settings()
+    return OCREngine(
+        max_workers=settings.OCR_MAX_WORKERS,
+        max_pending=settings.OCR_MAX_PENDING,
+        dpi=settings.OCR_DPI,
+        language=settings.OCR_LANGUAGE,
+        cache_ttl=settings.PDF_PAGE_CACHE_TTL
+    )
@@ -0,0 +1,334 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from langchain_core.documents import Document
+from src.config.settings import get_settings
+from .cache_manager import get_optional_cache_manager
+from .streaming_loaders import StreamingLoader
+
+logger = logging.getLogger(__name__)
+
+# Namespace do cache de texto extraído por página
+PAGE_CACHE_NAMESPACE = "pdf_pages"
+
+class PageText(NamedTuple):
+    """Texto de uma página do PDF."""
+    page: int
+    total_pages: int
+    text: str
+    ocr: bool
+
+class OCRRequired(Exception):
+    """
+    Páginas sem texto encontradas dentro de um processo de pool.
+
+    Processos de pool não fazem OCR: quem os criou reconhece as páginas no
+    pool limitado do OCREngine e reenvia o arquivo com o texto (ocr_text).
+    """
+
+    def __init__(self, file_hash: str, pages: List[int]):
+        super().__init__(file_hash, pages)
+        self.file_hash = file_hash
+        self.pages = pages
+
+    def __str__(self) -> str:
+        return f"OCR necessário em {len(self.pages)} páginas"
+
+def compute_file_hash(file_path: str, block_size: int = 1048576) -> str:
+    """
+    Calcula o SHA-256 de um arquivo lendo-o em blocos.
+
+    Args:
+        file_path: Caminho do arquivo
+        block_size: Tamanho de cada leitura em bytes
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+def count_pages(file_path: str) -> int:
+    """Conta as páginas de um PDF sem extrair o conteúdo."""
+    from pdfminer.pdfpage import PDFPage
+
+    with open(file_path, "rb") as file:
+        return sum(1 for _ in PDFPage.get_pages(file))
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    Extrai o texto de um intervalo de páginas (executado nos processos do pool).
+
+    Args:
+        file_path: Caminho do PDF
+        start: Primeira página (índice 0)
+        end: Página final, exclusiva
+
+    Returns:
+        Lista de (índice da página, texto)
+    """
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    pages = []
+    for index, layout in zip(range(start, end), extract_pages(file_path, page_numbers=range(start, end))):
+        text = "".join(
+            element.get_text()
+            for element in layout
+            if isinstance(element, LTTextContainer)
+        )
+        pages.append((index, text))
+    return pages
+
+def split_ranges(pages: List[int], pages_per_task: int) -> List[Tuple[int, int]]:
+    """
+    Agrupa páginas em intervalos contíguos de no máximo pages_per_task.
+
+    Args:
+        pages: Índices de página ordenados
+        pages_per_task: Tamanho máximo de cada intervalo
+
+    Returns:
+        Lista de (início, fim exclusivo)
+    """
+    ranges = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page and page - ranges[-1][0] < pages_per_task:
+            ranges[-1] = (ranges[-1][0], page + 1)
+        else:
+            ranges.append((page, page + 1))
+    return ranges
+
+class PDFExtractor:
+    """Extrai o texto de PDFs por intervalos de páginas em paralelo, com cache por página."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pages_per_task: int = 8,
+        cache_ttl: int = 604800,
+        use_cache: bool = True,
+        ocr_min_chars: Optional[int] = None
+    ):
+        """
+        Inicializa o extrator.
+
+        Args:
+            max_workers: Processos de extração (padrão: número de CPUs)
+            pages_per_task: Páginas extraídas por tarefa
+            cache_ttl: Tempo de vida do texto das páginas no cache, em segundos
+            use_cache: Se deve consultar e preencher o cache de páginas
+            ocr_min_chars: Páginas com menos caracteres que isso passam por OCR
+                (None desativa o OCR)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self.cache_ttl = cache_ttl
+        self.cache = get_optional_cache_manager() if use_cache else None
+        self.ocr_min_chars = ocr_min_chars
+
+    @staticmethod
+    def _page_params(file_hash: str, page: int) -> Dict:
+        return {"file_hash": file_hash, "page": page}
+
+    def _cached_pages(self, file_hash: str, page_count: int) -> Dict[int, str]:
+        """Busca no cache o texto já extraído das páginas do arquivo."""
+        if self.cache is None:
+            return {}
+        values = self.cache.get_many(
+            PAGE_CACHE_NAMESPACE,
+            [self._page_params(file_hash, page) for page in range(page_count)]
+        )
+        return {page: text for page, text in enumerate(values) if text is not None}
+
+    def _store_pages(self, file_hash: str, pages: List[Tuple[int, str]]) -> None:
+        """Grava no cache o texto de um intervalo recém-extraído."""
+        if self.cache is None or not pages:
+            return
+        self.cache.set_many(
+            PAGE_CACHE_NAMESPACE,
+            [(self._page_params(file_hash, page), text) for page, text in pages],
+            self.cache_ttl
+        )
+
+    def _extract_missing(self, file_path: str, file_hash: str, missing: List[int]) -> Dict[int, str]:
+        """
+        Extrai as páginas ausentes do cache, em paralelo quando possível.
+
+        Cada intervalo concluído é gravado no cache imediatamente, de modo que
+        uma falha em outro intervalo não descarta o trabalho já feito.
+        """
+        ranges = split_ranges(missing, self.pages_per_task)
+        extracted = {}
+
+        # Dentro de um processo do pool do DocumentProcessor não abrimos outro pool
+        workers = min(self.max_workers, len(ranges))
+        if workers <= 1 or multiprocessing.parent_process() is not None:
+            for start, end in ranges:
+                pages = extract_page_range(file_path, start, end)
+                self._store_pages(file_hash, pages)
+                extracted.update(pages)
+            return extracted
+
+        errors = []
+        # spawn: clientes do pymongo em cache não são seguros após um fork
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(extract_page_range, file_path, start, end): (start, end)
+                for start, end in ranges
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    logger.error(f"Erro ao extrair páginas {start + 1}-{end} de {file_path}: {str(e)}")
+                    errors.append(e)
+                    continue
+                self._store_pages(file_hash, pages)
+                extracted.update(pages)
+
+        if errors:
+            raise errors[0]
+        return extracted
+
+    def _apply_ocr(
+        self,
+        file_path: str,
+        file_hash: str,
+        pages: Dict[int, str],
+        ocr_text: Optional[Dict[int, str]] = None
+    ) -> List[int]:
+        """
+        Substitui o texto das páginas sem camada de texto pelo resultado do OCR.
+
+        Args:
+            file_path: Caminho do PDF
+            file_hash: SHA-256 do arquivo
+            pages: Texto extraído por índice de página
+            ocr_text: Texto já reconhecido por número de página (a partir de 1)
+
+        Returns:
+            Índices das páginas reconhecidas por OCR
+
+        Raises:
+            OCRRequired: Dentro de um processo de pool, sem ocr_text
+        """
+        if self.ocr_min_chars is None:
+            return []
+        scanned = [page for page, text in pages.items() if len(text.strip()) < self.ocr_min_chars]
+        if not scanned:
+            return []
+
+        numbers = [page + 1 for page in scanned]
+        if ocr_text is not None:
+            recognized = {number: ocr_text[number] for number in numbers if number in ocr_text}
+        elif multiprocessing.parent_process() is not None:
+            raise OCRRequired(file_hash, numbers)
+        else:
+            from .ocr import get_ocr_engine
+
+            recognized = get_ocr_engine().ocr_pages(file_path, file_hash, numbers)
+        for number, text in recognized.items():
+            pages[number - 1] = text
+        return [number - 1 for number in recognized]
+
+    def iter_pages(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None
+    ) -> Iterator[PageText]:
+        """
+        Extrai o texto de todas as páginas de um PDF.
+
+        Páginas sem texto (digitalizadas) passam por OCR quando habilitado.
+
+        Args:
+            file_path: Caminho do PDF
+            file_hash: SHA-256 do arquivo (calculado se None)
+            ocr_text: Texto já reconhecido por número de página
+
+        Returns:
+            Iterador de PageText, com páginas numeradas a partir de 1
+        """
+        try:
+            file_hash = file_hash or compute_file_hash(file_path)
+            page_count = count_pages(file_path)
+
+            pages = self._cached_pages(file_hash, page_count)
+            missing = [page for page in range(page_count) if page not in pages]
+            if missing:
+                pages.update(self._extract_missing(file_path, file_hash, missing))
+            ocr_pages = set(self._apply_ocr(file_path, file_hash, pages, ocr_text))
+
+            logger.info(
+                f"PDF extraído: {file_path} ({page_count} páginas, "
+                f"{page_count - len(missing)} do cache, {len(ocr_pages)} por OCR)"
+            )
+            for page in range(page_count):
+                yield PageText(page + 1, page_count, pages[page], page in ocr_pages)
+
+        except OCRRequired:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao extrair PDF {file_path}: {str(e)}")
+            raise
+
+class PageParallelPDFLoader(StreamingLoader):
+    """Loader de PDF que gera um documento por página, com o número da página nos metadados."""
+
+    # O PDFExtractor já guarda o texto por página no cache
+    cache_parsed_text = False
+
+    def __init__(
+        self,
+        file_path: str,
+        file_hash: Optional[str] = None,
+        ocr_text: Optional[Dict[int, str]] = None,
+        **kwargs
+    ):
+        """
+        Inicializa o loader.
+
+        Args:
+            file_path: Caminho do PDF
+            file_hash: SHA-256 do arquivo, se já conhecido
+            ocr_text: Texto já reconhecido por OCR, por número de página
+        """
+        super().__init__(file_path, **kwargs)
+        self.file_hash = file_hash
+        self.ocr_text = ocr_text
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Extrai as páginas do PDF e gera um documento por página não vazia.
+
+        Returns:
+            Iterador de documentos com source, page, total_pages e ocr
+        """
+        settings = get_settings()
+        extractor = PDFExtractor(
+            max_workers=settings.DOCUMENT_PROCESSING_WORKERS or None,
+            pages_per_task=settings.PDF_PAGES_PER_TASK,
+            cache_ttl=settings.PDF_PAGE_CACHE_TTL,
+            ocr_min_chars=settings.OCR_MIN_TEXT_CHARS if settings.OCR_ENABLED else None
+        )
+        for page in extractor.iter_pages(self.file_path, self.file_hash, self.ocr_text):
+            if not page.text.strip():
+                continue
+            yield Document(
+                page_content=page.text,
+                metadata={
+                    'source': self.file_path,
+                    'page': page.page,
+                    'total_pages': page.total_pages,
+                    'ocr': page.ocr
+                }
+            )
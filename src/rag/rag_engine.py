@@ -1,17 +1,23 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Union, AsyncIterator
 import os
+import time
+import asyncio
 import logging
 from datetime import datetime
 from langchain_openai import AzureChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
+from src.config.settings import get_settings
 from .document_processor import DocumentProcessor
 from .embeddings_manager import EmbeddingsManager
+from .llm_cache import get_llm_cache, llm_cache_disabled
 
 logger = logging.getLogger(__name__)
 
 class RAGEngine:
     """Motor principal do sistema RAG."""
     
+    NO_RESULTS_ANSWER = "Desculpe, não encontrei informações relevantes para responder sua pergunta."
+    
     def __init__(
         self,
         mongodb_uri: str,
@@ -43,9 +49,12 @@ class RAGEngine:
             azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
             deployment_name=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
             openai_api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            cache=get_llm_cache()
         )
         
-        self.document_processor = DocumentProcessor()
+        self.document_processor = DocumentProcessor(
+            max_workers=get_settings().DOCUMENT_PROCESSING_WORKERS or None
+        )
         self.embeddings_manager = EmbeddingsManager(mongodb_uri)
         
         # Template para geração de respostas
@@ -70,7 +79,7 @@ class RAGEngine:
             Lista de IDs dos chunks indexados
         """
         try:
-            chunks = self.document_processor.process_file(file_path)
+            chunks = self.document_processor.iter_chunks(file_path)
             chunk_ids = self.embeddings_manager.store_embeddings(chunks)
             logger.info(f"Arquivo indexado com sucesso: {file_path}")
             return chunk_ids
@@ -94,19 +103,16 @@ class RAGEngine:
             Dicionário com caminhos dos arquivos e IDs dos chunks
         """
         try:
-            chunks = self.document_processor.process_directory(
+            chunks = self.document_processor.iter_directory(
                 directory_path,
-                recursive=recursive
+                recursive=recursive,
+                parallel=True
             )
-            chunk_ids = self.embeddings_manager.store_embeddings(chunks)
             
-            # Organiza os IDs por arquivo
+            # Organiza os IDs por arquivo à medida que os lotes são gravados
             file_chunks = {}
-            for chunk, chunk_id in zip(chunks, chunk_ids):
-                file_path = chunk['metadata']['file_path']
-                if file_path not in file_chunks:
-                    file_chunks[file_path] = []
-                file_chunks[file_path].append(chunk_id)
+            for metadata, chunk_id in self.embeddings_manager.iter_store_embeddings(chunks):
+                file_chunks.setdefault(metadata['file_path'], []).append(chunk_id)
             
             logger.info(f"Diretório indexado com sucesso: {directory_path}")
             return file_chunks
@@ -118,7 +124,8 @@ class RAGEngine:
         self,
         question: str,
         max_results: int = 5,
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = 0.7,
+        use_cache: bool = True
     ) -> Dict:
         """
         Realiza uma consulta no sistema RAG.
@@ -127,6 +134,7 @@ class RAGEngine:
             question: Pergunta do usuário
             max_results: Número máximo de resultados
             similarity_threshold: Limite mínimo de similaridade
+            use_cache: Se deve reutilizar respostas do cache do LLM
             
         Returns:
             Dicionário com resposta e fontes
@@ -141,46 +149,144 @@ class RAGEngine:
             
             if not similar_docs:
                 return {
-                    "answer": "Desculpe, não encontrei informações relevantes para responder sua pergunta.",
+                    "answer": self.NO_RESULTS_ANSWER,
                     "sources": []
                 }
             
-            # Prepara o contexto
-            context = "\n\n".join([
-                f"Documento {i+1}:\n{doc['content']}"
-                for i, doc in enumerate(similar_docs)
-            ])
-            
             # Gera resposta
-            response = await self.llm.agenerate([
-                self.response_template.format_messages(
-                    context=context,
-                    question=question
-                )
-            ])
+            with llm_cache_disabled(not use_cache):
+                response = await self.llm.agenerate([
+                    self._build_messages(question, similar_docs)
+                ])
             
             answer = response.generations[0][0].text
             
-            # Prepara as fontes
-            sources = [
-                {
-                    "file_name": doc["metadata"]["file_name"],
-                    "file_path": doc["metadata"]["file_path"],
-                    "chunk_id": doc["metadata"]["chunk_id"],
-                    "similarity": doc["similarity"]
-                }
-                for doc in similar_docs
-            ]
-            
             return {
                 "answer": answer,
-                "sources": sources
+                "sources": self._format_sources(similar_docs)
             }
             
         except Exception as e:
             logger.error(f"Erro ao processar consulta: {str(e)}")
             raise
 
+    async def stream_query(
+        self,
+        question: str,
+        max_results: int = 5,
+        similarity_threshold: float = 0.7
+    ) -> AsyncIterator[Dict]:
+        """
+        Realiza uma consulta no sistema RAG emitindo a resposta em partes.
+        
+        O primeiro evento contém as fontes assim que a busca termina, seguido
+        pelos tokens da resposta conforme chegam do modelo. O último evento
+        traz os tempos de cada etapa e o uso de tokens.
+        
+        Args:
+            question: Pergunta do usuário
+            max_results: Número máximo de resultados
+            similarity_threshold: Limite mínimo de similaridade
+            
+        Yields:
+            Dicionários com as chaves "event" (sources, token ou done) e "data"
+        """
+        start = time.perf_counter()
+        try:
+            # A busca é síncrona (pymongo); roda fora do event loop
+            similar_docs = await asyncio.to_thread(
+                self.embeddings_manager.search_similar,
+                question,
+                max_results=max_results,
+                similarity_threshold=similarity_threshold
+            )
+            retrieval_ms = (time.perf_counter() - start) * 1000
+            
+            yield {"event": "sources", "data": self._format_sources(similar_docs)}
+            
+            if not similar_docs:
+                yield {"event": "token", "data": self.NO_RESULTS_ANSWER}
+                yield {
+                    "event": "done",
+                    "data": {
+                        "retrieval_ms": retrieval_ms,
+                        "first_token_ms": None,
+                        "generation_ms": 0.0,
+                        "total_ms": (time.perf_counter() - start) * 1000,
+                        "usage": None
+                    }
+                }
+                return
+            
+            generation_start = time.perf_counter()
+            first_token_ms = None
+            aggregate = None
+            async for chunk in self.llm.astream(
+                self._build_messages(question, similar_docs),
+                stream_usage=True
+            ):
+                aggregate = chunk if aggregate is None else aggregate + chunk
+                if chunk.content:
+                    if first_token_ms is None:
+                        first_token_ms = (time.perf_counter() - start) * 1000
+                    yield {"event": "token", "data": chunk.content}
+            
+            usage = getattr(aggregate, "usage_metadata", None) if aggregate else None
+            yield {
+                "event": "done",
+                "data": {
+                    "retrieval_ms": retrieval_ms,
+                    "first_token_ms": first_token_ms,
+                    "generation_ms": (time.perf_counter() - generation_start) * 1000,
+                    "total_ms": (time.perf_counter() - start) * 1000,
+                    "usage": dict(usage) if usage else None
+                }
+            }
+            
+        except Exception as e:
+            logger.error(f"Erro ao processar consulta em streaming: {str(e)}")
+            raise
+
+    def _build_messages(self, question: str, similar_docs: List[Dict]) -> List:
+        """
+        Monta as mensagens do prompt a partir dos documentos recuperados.
+        
+        Args:
+            question: Pergunta do usuário
+            similar_docs: Documentos retornados pela busca
+            
+        Returns:
+            Lista de mensagens formatadas para o modelo
+        """
+        context = "\n\n".join([
+            f"Documento {i+1}:\n{doc['content']}"
+            for i, doc in enumerate(similar_docs)
+        ])
+        return self.response_template.format_messages(
+            context=context,
+            question=question
+        )
+
+    def _format_sources(self, similar_docs: List[Dict]) -> List[Dict]:
+        """
+        Converte os documentos recuperados na lista de fontes da resposta.
+        
+        Args:
+            similar_docs: Documentos retornados pela busca
+            
+        Returns:
+            Lista de fontes
+        """
+        return [
+            {
+                "file_name": doc["metadata"]["file_name"],
+                "file_path": doc["metadata"]["file_path"],
+                "chunk_id": doc["metadata"]["chunk_id"],
+                "similarity": doc["similarity"]
+            }
+            for doc in similar_docs
+        ]
+
     def get_system_stats(self) -> Dict:
         """
         Retorna estatísticas do sistema RAG.
@@ -189,7 +295,8 @@ class RAGEngine:
             Dicionário com estatísticas
         """
         try:
-            stats = self.embeddings_manager.get_document_stats()
+            # Cópia: o resultado memoizado é compartilhado com o cache local
+            stats = dict(self.embeddings_manager.get_document_stats())
             stats.update({
                 "chunk_size": self.document_processor.chunk_size,
                 "chunk_overlap": self.document_processor.chunk_overlap,
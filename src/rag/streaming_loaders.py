@@ -0,0 +1,350 @@
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from abc import abstractmethod
+from importlib.util import find_spec
+import csv
+import logging
+from pathlib import Path
+from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Janela mínima de leitura, em chunks, para que o splitter encontre bons separadores
+WINDOW_CHUNKS = 16
+MIN_READ_SIZE = 65536
+
+# Separador de colunas na representação textual das tabelas
+CELL_SEPARATOR = " | "
+
+def get_token_counter() -> Callable[[str], int]:
+    """
+    Retorna uma função que conta os tokens de um texto.
+
+    Usa o tokenizador do modelo de embeddings; se ele não puder ser carregado,
+    estima um token a cada 4 caracteres.
+
+    Returns:
+        Função de contagem de tokens
+    """
+    try:
+        from src.utils.text_chunker import get_encoding
+        encoding = get_encoding()
+        return lambda text: len(encoding.encode_ordinary(text))
+    except Exception as e:
+        logger.warning(f"Tokenizador indisponível, usando estimativa por caracteres: {str(e)}")
+        return lambda text: len(text) // 4 + 1
+
+def format_row(values: Sequence) -> str:
+    """Converte uma linha da tabela em texto, com células vazias preservadas."""
+    return CELL_SEPARATOR.join(
+        "" if value is None else str(value).strip().replace("\n", " ")
+        for value in values
+    )
+
+def group_rows(
+    header: str,
+    rows: Iterable[Tuple[int, str]],
+    max_tokens: int,
+    count_tokens: Callable[[str], int]
+) -> Iterator[Tuple[str, int, int]]:
+    """
+    Agrupa linhas consecutivas até o limite de tokens, repetindo o cabeçalho.
+
+    Uma linha que sozinha excede o limite forma um grupo próprio.
+
+    Args:
+        header: Cabeçalho já formatado
+        rows: Iterador de (número da linha, linha formatada)
+        max_tokens: Limite de tokens por grupo, incluindo o cabeçalho
+        count_tokens: Função de contagem de tokens
+
+    Returns:
+        Iterador de (conteúdo, primeira linha, última linha)
+    """
+    header_tokens = count_tokens(header) + 1
+    lines: List[str] = []
+    tokens = header_tokens
+    first_row = last_row = 0
+
+    for row_number, line in rows:
+        line_tokens = count_tokens(line) + 1
+        if lines and tokens + line_tokens > max_tokens:
+            yield "\n".join([header, *lines]), first_row, last_row
+            lines = []
+            tokens = header_tokens
+        if not lines:
+            first_row = row_number
+        lines.append(line)
+        tokens += line_tokens
+        last_row = row_number
+
+    if lines:
+        yield "\n".join([header, *lines]), first_row, last_row
+
+class StreamingLoader(BaseLoader):
+    """
+    Base dos loaders que leem o arquivo de forma incremental.
+
+    Loaders com pre_chunked=True já entregam chunks prontos, com os mesmos
+    chunk_size/chunk_overlap do DocumentProcessor, que não os divide de novo.
+    Com cache_parsed_text=False o DocumentProcessor não guarda o texto
+    extraído: ler o arquivo de novo custa o mesmo que ler o cache.
+    """
+
+    pre_chunked = False
+    cache_parsed_text = False
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', **kwargs):
+        """
+        Inicializa o loader.
+
+        Args:
+            file_path: Caminho do arquivo
+            encoding: Codificação do arquivo
+        """
+        self.file_path = str(file_path)
+        self.encoding = encoding
+
+class StreamingTextLoader(StreamingLoader):
+    """Divide arquivos de texto em chunks com uma janela deslizante."""
+
+    pre_chunked = True
+    separators: Optional[List[str]] = None
+
+    def __init__(
+        self,
+        file_path: str,
+        encoding: str = 'utf-8',
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        **kwargs
+    ):
+        """
+        Inicializa o loader.
+
+        Args:
+            file_path: Caminho do arquivo
+            encoding: Codificação do arquivo
+            chunk_size: Tamanho dos chunks de texto
+            chunk_overlap: Sobreposição entre chunks
+        """
+        super().__init__(file_path, encoding)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.read_size = max(chunk_size * WINDOW_CHUNKS, MIN_READ_SIZE)
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            separators=self.separators,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            add_start_index=True,
+        )
+
+    def _split(self, text: str) -> List[Document]:
+        """Divide o texto da janela, com start_index relativo à janela."""
+        return self.text_splitter.create_documents([text])
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Lê o arquivo em blocos e gera os chunks à medida que a janela enche.
+
+        A cada bloco, os chunks completos da janela são emitidos; o último
+        chunk, que pode ter sido cortado no limite do bloco, volta para a
+        janela junto com o restante do texto. A memória usada depende do
+        tamanho do chunk, não do tamanho do arquivo.
+
+        Returns:
+            Iterador de documentos já divididos em chunks
+        """
+        window = ""
+        # Posição (em caracteres) do início da janela dentro do arquivo
+        window_offset = 0
+
+        with open(self.file_path, encoding=self.encoding) as file:
+            while True:
+                block = file.read(self.read_size)
+                window += block
+                if not window:
+                    break
+
+                documents = self._split(window)
+                if block and len(documents) < 2:
+                    # Janela ainda sem um chunk completo: continua lendo
+                    continue
+
+                if block:
+                    keep = documents.pop()
+                    keep_from = keep.metadata['start_index']
+                else:
+                    keep_from = len(window)
+
+                for document in documents:
+                    document.metadata = {
+                        'source': self.file_path,
+                        'start_index': window_offset + document.metadata['start_index']
+                    }
+                    yield document
+
+                window = window[keep_from:]
+                window_offset += keep_from
+                if not block:
+                    break
+
+class StreamingMarkdownLoader(StreamingTextLoader):
+    """Divide arquivos Markdown priorizando cabeçalhos e blocos como separadores."""
+
+    separators = RecursiveCharacterTextSplitter.get_separators_for_language(Language.MARKDOWN)
+
+class StreamingCSVLoader(StreamingLoader):
+    """Gera um documento por linha do CSV, lendo o arquivo linha a linha."""
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Lê o CSV em streaming, no mesmo formato do CSVLoader.
+
+        Returns:
+            Iterador de documentos ("coluna: valor" por linha do conteúdo)
+        """
+        with open(self.file_path, newline='', encoding=self.encoding) as file:
+            for row_number, row in enumerate(csv.DictReader(file)):
+                content = "\n".join(
+                    f"{key.strip() if key is not None else ''}: "
+                    f"{value.strip() if isinstance(value, str) else ','.join(value or [])}"
+                    for key, value in row.items()
+                )
+                yield Document(
+                    page_content=content,
+                    metadata={'source': self.file_path, 'row': row_number}
+                )
+
+class TableLoader(StreamingLoader):
+    """
+    Base dos loaders de tabelas que agrupam linhas em chunks.
+
+    Cada chunk reúne linhas consecutivas até max_tokens, com o cabeçalho
+    repetido, em vez de um documento por linha.
+    """
+
+    pre_chunked = True
+
+    def __init__(
+        self,
+        file_path: str,
+        encoding: str = 'utf-8',
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ):
+        """
+        Inicializa o loader.
+
+        Args:
+            file_path: Caminho do arquivo
+            encoding: Codificação do arquivo
+            max_tokens: Limite de tokens por chunk (padrão: TABLE_CHUNK_MAX_TOKENS)
+        """
+        super().__init__(file_path, encoding)
+        if max_tokens is None:
+            from src.config.settings import get_settings
+            max_tokens = get_settings().TABLE_CHUNK_MAX_TOKENS
+        self.max_tokens = max_tokens
+
+    @abstractmethod
+    def _iter_tables(self) -> Iterator[Tuple[Optional[str], Iterator[Sequence]]]:
+        """Gera (nome da planilha, iterador de linhas) para cada tabela do arquivo."""
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Lê as linhas em streaming e gera um documento por grupo de linhas.
+
+        Returns:
+            Iterador de documentos com source, sheet, row_start e row_end
+        """
+        count_tokens = get_token_counter()
+        for sheet, rows in self._iter_tables():
+            # Linhas numeradas a partir de 1, como na planilha; linhas vazias são ignoradas
+            numbered = (
+                (row_number, values)
+                for row_number, values in enumerate(rows, start=1)
+                if any(value not in (None, "") for value in values)
+            )
+            first = next(numbered, None)
+            if first is None:
+                continue
+            header = format_row(first[1])
+            if sheet:
+                header = f"Planilha: {sheet}\n{header}"
+            lines = ((row_number, format_row(values)) for row_number, values in numbered)
+
+            for content, row_start, row_end in group_rows(header, lines, self.max_tokens, count_tokens):
+                metadata = {'source': self.file_path, 'row_start': row_start, 'row_end': row_end}
+                if sheet:
+                    metadata['sheet'] = sheet
+                yield Document(page_content=content, metadata=metadata)
+
+class TableCSVLoader(TableLoader):
+    """Agrupa linhas de arquivos CSV, lendo o arquivo linha a linha."""
+
+    def _iter_tables(self) -> Iterator[Tuple[Optional[str], Iterator[Sequence]]]:
+        with open(self.file_path, newline='', encoding=self.encoding) as file:
+            yield None, csv.reader(file)
+
+class TableExcelLoader(TableLoader):
+    """
+    Agrupa linhas de planilhas Excel; .xlsx é lido em modo read_only (streaming).
+
+    Sem o leitor do formato (xlrd para .xls, openpyxl para .xlsx), o arquivo
+    é lido pelo UnstructuredExcelLoader e o texto dividido pelo mesmo limite
+    de tokens.
+    """
+
+    def _reader_module(self) -> str:
+        return 'xlrd' if Path(self.file_path).suffix.lower() == '.xls' else 'openpyxl'
+
+    def lazy_load(self) -> Iterator[Document]:
+        """
+        Lê a planilha em streaming, ou pelo UnstructuredExcelLoader se o
+        leitor do formato não estiver instalado.
+
+        Returns:
+            Iterador de documentos com no máximo max_tokens cada
+        """
+        module = self._reader_module()
+        if find_spec(module) is not None:
+            yield from super().lazy_load()
+            return
+
+        logger.warning(f"{module} não instalado; usando UnstructuredExcelLoader para {self.file_path}")
+        from langchain_community.document_loaders import UnstructuredExcelLoader
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.max_tokens,
+            chunk_overlap=0,
+            length_function=get_token_counter()
+        )
+        for document in splitter.split_documents(UnstructuredExcelLoader(self.file_path).load()):
+            document.metadata = {**document.metadata, 'source': self.file_path}
+            yield document
+
+    def _iter_tables(self) -> Iterator[Tuple[Optional[str], Iterator[Sequence]]]:
+        if self._reader_module() == 'xlrd':
+            import xlrd
+
+            workbook = xlrd.open_workbook(self.file_path, on_demand=True)
+            try:
+                for index in range(workbook.nsheets):
+                    sheet = workbook.sheet_by_index(index)
+                    yield sheet.name, (sheet.row_values(row) for row in range(sheet.nrows))
+                    workbook.unload_sheet(index)
+            finally:
+                workbook.release_resources()
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                yield sheet.title, sheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
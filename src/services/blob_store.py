@@ -0,0 +1,96 @@
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator, List, Optional
+from src.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Hex characters per directory level: 2 gives 256 subdirectories per level
+SHARD_WIDTH = 2
+
+class BlobStore:
+    """
+    Content-addressed file store keyed by sha256.
+
+    A blob lives at {root}/ab/cd/{sha256}{suffix}, so identical uploads share
+    one file and no directory grows past a few hundred entries. The suffix
+    is kept because document loaders are chosen by file extension. The
+    original filename is not part of the path; it is kept by the caller.
+    """
+
+    def __init__(self, root: str, fanout: int = 2):
+        self.root = Path(root)
+        self.fanout = fanout
+        self.temp_dir = self.root / "tmp"
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, file_hash: str, suffix: str = "") -> Path:
+        """Path of the blob for a hash and file extension"""
+        shards = [file_hash[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(self.fanout)]
+        return self.root.joinpath(*shards, f"{file_hash}{suffix.lower()}")
+
+    def contains(self, file_path: str) -> bool:
+        """Whether a path points inside the store"""
+        return Path(file_path).resolve().is_relative_to(self.root.resolve())
+
+    def put(self, source: Path, file_hash: str, suffix: str = "") -> Path:
+        """
+        Move a file into the store under its hash.
+
+        If the blob already exists the source is discarded, so storing the
+        same content twice keeps a single copy. source should be in temp_dir
+        (same filesystem) for the move to be an atomic rename. Blobs
+        modified within the garbage collection grace period are never
+        collected, which covers the gap until the caller records the
+        reference.
+        """
+        target = self.path_for(file_hash, suffix)
+        if target.exists():
+            Path(source).unlink()
+            # Refresh mtime so garbage collection treats the blob as new
+            os.utime(target)
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), str(target))
+        return target
+
+    def iter_shards(self) -> Iterator[List[Path]]:
+        """Yield the blobs of each leaf directory"""
+        pattern = "/".join(["?" * SHARD_WIDTH] * self.fanout)
+        for directory in sorted(self.root.glob(pattern)):
+            if directory.is_dir() and directory != self.temp_dir:
+                yield [path for path in directory.iterdir() if path.is_file()]
+
+    def remove_stale_temp_files(self, max_age: float) -> int:
+        """Remove temporary files left behind by interrupted uploads"""
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.temp_dir.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def delete(self, path: Path) -> None:
+        """Remove a blob and prune its shard directories when they become empty"""
+        path.unlink(missing_ok=True)
+        parent = path.parent
+        while parent != self.root:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = parent.parent
+
+_blob_store: Optional[BlobStore] = None
+
+def get_blob_store() -> BlobStore:
+    """Shared blob store configured from settings"""
+    global _blob_store
+    if _blob_store is None:
+        settings = get_settings()
+        _blob_store = BlobStore(settings.BLOB_STORE_DIR, settings.BLOB_STORE_FANOUT)
+    return _blob_store
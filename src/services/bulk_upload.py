@@ -0,0 +1,88 @@
+import hashlib
+import logging
+import tarfile
+import uuid
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Read/write block size when streaming uploads and archive members to disk
+COPY_BLOCK_SIZE = 1048576
+
+class UploadTooLarge(Exception):
+    """Raised when a stream exceeds the allowed size"""
+
+def is_archive(filename: str) -> bool:
+    """Whether the uploaded file is an archive to unpack"""
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+def _member_name(name: str) -> Optional[str]:
+    """Base name of an archive member, or None for entries that should be skipped"""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if not path.name or path.name.startswith(".") or "__MACOSX" in path.parts:
+        return None
+    return path.name
+
+def iter_archive_members(filename: str, fileobj: BinaryIO) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yield (member file name, stream) for each regular file in an archive.
+
+    Members are decompressed as they are read: nothing is extracted to
+    memory or disk here. Tar archives are read in stream mode, so the
+    upload does not need to be seekable. Directory components are dropped
+    from member names.
+    """
+    if filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                name = _member_name(info.filename)
+                if info.is_dir() or name is None:
+                    continue
+                with archive.open(info) as member:
+                    yield name, member
+        return
+
+    with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+        for info in archive:
+            name = _member_name(info.name)
+            if not info.isfile() or name is None:
+                continue
+            member = archive.extractfile(info)
+            if member is not None:
+                yield name, member
+
+def stream_to_disk(
+    source: BinaryIO,
+    directory: Path,
+    max_size: Optional[int] = None,
+    block_size: int = COPY_BLOCK_SIZE
+) -> Tuple[Path, str, int]:
+    """
+    Copy a stream to a temporary file in directory, hashing it on the way.
+
+    Returns:
+        (temporary path, sha256 hex digest, size in bytes)
+
+    Raises:
+        UploadTooLarge: if the stream is larger than max_size; the partial
+            file is removed
+    """
+    temp_path = directory / f"temp_{uuid.uuid4().hex}"
+    sha256 = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as target:
+            for block in iter(lambda: source.read(block_size), b""):
+                size += len(block)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLarge(f"File exceeds the maximum size of {max_size} bytes")
+                sha256.update(block)
+                target.write(block)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return temp_path, sha256.hexdigest(), size
@@ -1,33 +1,59 @@
 import asyncio
+import time
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import AsyncIterator, BinaryIO, Optional, List, Tuple
 import logging
 from bson import ObjectId
 from pymongo import MongoClient
 import hashlib
 from pathlib import Path
 from src.models.document import DocumentProcessing, ProcessingStatus
+from src.models.job import JobLane
 from src.rag.document_processor import DocumentProcessor
 from src.rag.embeddings_manager import EmbeddingsManager
+from src.rag.ingestion_pipeline import IngestionPipeline
 from src.config.settings import get_settings
-from src.services.background_manager import BackgroundTaskManager
+from src.services.job_queue import JobQueue, lane_for_size
+from src.services.blob_store import get_blob_store
+from src.services.bulk_upload import COPY_BLOCK_SIZE, UploadTooLarge, is_archive, iter_archive_members, stream_to_disk
 from pymongo import IndexModel, ASCENDING
+from pymongo.errors import BulkWriteError, OperationFailure
+from src.config.database import MongoDB
 from src.utils.utils import get_mongodb_client, get_azure_embeddings
 
 logger = logging.getLogger(__name__)
 
+PROCESS_DOCUMENT_JOB = "process_document"
+BLOB_GC_JOB = "gc_blobs"
+
+# Statuses after which a processing record no longer changes
+FINAL_STATUSES = (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED, ProcessingStatus.DUPLICATE)
+
 class DocumentService:
     def __init__(self):
         settings = get_settings()
         self.client = get_mongodb_client(settings.MONGODB_URI)
         self.db = self.client[settings.MONGODB_DB_NAME]
         self.processing_collection = self.db[settings.MONGODB_COLLECTION_NAME]
-        self.document_processor = DocumentProcessor()
+        self.batch_collection = self.db[f"{settings.MONGODB_COLLECTION_NAME}_batches"]
+        self.document_processor = DocumentProcessor(
+            max_workers=settings.DOCUMENT_PROCESSING_WORKERS or None
+        )
         self.embeddings_manager = EmbeddingsManager(
             mongodb_uri=settings.MONGODB_URI,
             embeddings=get_azure_embeddings()
         )
-        self.background_manager = BackgroundTaskManager()
+        self.pipeline = IngestionPipeline(
+            self.document_processor,
+            self.embeddings_manager,
+            parse_workers=settings.INGESTION_PARSE_WORKERS or None,
+            embed_workers=settings.INGESTION_EMBED_WORKERS,
+            embed_batch_size=settings.INGESTION_EMBED_BATCH_SIZE,
+            write_batch_size=settings.INGESTION_WRITE_BATCH_SIZE,
+            queue_size=settings.INGESTION_QUEUE_SIZE
+        )
+        self.job_queue = JobQueue()
+        self.blob_store = get_blob_store()
         
         # Ensure indexes
         self._ensure_indexes()
@@ -45,6 +71,8 @@ class DocumentService:
             IndexModel([("status", ASCENDING)]),
             IndexModel([("created_at", ASCENDING)]),
             IndexModel([("filename", ASCENDING)]),
+            IndexModel([("batch_id", ASCENDING), ("status", ASCENDING)]),
+            IndexModel([("file_path", ASCENDING)]),
             # Unique index on file_hash, but ignore null values
             IndexModel(
                 [("file_hash", ASCENDING)],
@@ -59,13 +87,19 @@ class DocumentService:
         sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
             # Read the file in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
+            for byte_block in iter(lambda: f.read(COPY_BLOCK_SIZE), b""):
                 sha256_hash.update(byte_block)
         return sha256_hash.hexdigest()
 
-    async def check_duplicate_document(self, filename: str, file_path: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    async def check_duplicate_document(
+        self,
+        filename: str,
+        file_path: Optional[str] = None,
+        file_hash: Optional[str] = None
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Check if a document already exists by filename or content hash.
+        The file is only hashed when file_hash is not given.
         Returns (is_duplicate, existing_id, status_message)
         """
         # Check by filename first (quick check)
@@ -75,7 +109,7 @@ class DocumentService:
             return True, doc_id, f"Document with filename '{filename}' already exists (ID: {doc_id})"
 
         # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        file_hash = file_hash or self._calculate_file_hash(file_path)
         
         # Check by content hash
         existing_doc = self.processing_collection.find_one({"file_hash": file_hash})
@@ -85,12 +119,24 @@ class DocumentService:
 
         return False, None, None
 
-    async def create_processing_record(self, filename: str, file_path: str) -> DocumentProcessing:
-        """Create a new document processing record"""
+    async def create_processing_record(
+        self,
+        filename: str,
+        file_path: str,
+        tenant: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        file_size: Optional[int] = None
+    ) -> DocumentProcessing:
+        """
+        Create a new document processing record.
+
+        Pass file_hash and file_size when they were computed while the
+        upload was written, so the file is not read again.
+        """
         # Calculate file hash
-        file_hash = self._calculate_file_hash(file_path)
+        file_hash = file_hash or self._calculate_file_hash(file_path)
         
-        is_duplicate, existing_id, status_message = await self.check_duplicate_document(filename, file_path)
+        is_duplicate, existing_id, status_message = await self.check_duplicate_document(filename, file_hash=file_hash)
         if is_duplicate:
             raise ValueError(status_message)
 
@@ -98,6 +144,8 @@ class DocumentService:
             "filename": filename,
             "file_path": file_path,
             "file_hash": file_hash,
+            "file_size": file_size if file_size is not None else Path(file_path).stat().st_size,
+            "tenant": tenant,
             "status": ProcessingStatus.PENDING,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
@@ -114,8 +162,13 @@ class DocumentService:
                     raise ValueError(f"Document already exists with ID: {existing_doc['_id']}")
             raise
 
-    def _process_document_sync(self, processing_id: str):
-        """Synchronous document processing function"""
+    def _process_document_sync(self, processing_id: str, final_attempt: bool = True):
+        """
+        Synchronous document processing function.
+
+        Errors are re-raised so the job queue can retry; the record is only
+        marked FAILED on the final attempt.
+        """
         try:
             # Get processing record
             record = self.processing_collection.find_one({"_id": ObjectId(processing_id)})
@@ -125,23 +178,42 @@ class DocumentService:
 
             # Update status to processing
             self.update_processing_status(processing_id, ProcessingStatus.PROCESSING)
+            self._start_progress(processing_id, record)
             logger.info(f"[SYNC] Started processing document {processing_id}")
 
-            # Process document
-            logger.info(f"[SYNC] Processing file: {record['file_path']}")
-            chunks = self.document_processor.process_file(record["file_path"])
-            logger.info(f"[SYNC] Generated {len(chunks)} chunks")
+            # Resume from the batches committed by a previous attempt
+            skip_batches = self._resume_batches(processing_id, record)
+            if skip_batches:
+                logger.info(f"[SYNC] Resuming {processing_id}: {len(skip_batches)} batches already stored")
 
-            # Store embeddings
-            logger.info(f"[SYNC] Storing embeddings for {len(chunks)} chunks")
-            stored_ids = self.embeddings_manager.store_embeddings(chunks)
+            # Parse, embed and store through the staged pipeline, overlapping
+            # with the other documents in flight
+            logger.info(f"[SYNC] Processing file: {record['file_path']}")
+            stored_ids = self.pipeline.ingest(
+                record["file_path"],
+                file_hash=record.get("file_hash"),
+                skip_batches=skip_batches,
+                on_progress=lambda batch_index, progress: self._record_progress(
+                    processing_id, batch_index, progress
+                ),
+                file_name=record["filename"]
+            )
             logger.info(f"[SYNC] Stored {len(stored_ids)} embeddings")
 
             # Update status to completed
+            self.processing_collection.update_one(
+                {"_id": ObjectId(processing_id)},
+                {"$set": {
+                    "progress.stage": "completed",
+                    "progress.chunks_total": len(stored_ids),
+                    "progress.chunks_embedded": len(stored_ids),
+                    "progress.eta_seconds": 0.0
+                }}
+            )
             self.update_processing_status(
                 processing_id,
                 ProcessingStatus.COMPLETED,
-                chunks_processed=len(chunks),
+                chunks_processed=len(stored_ids),
                 embeddings_stored=len(stored_ids)
             )
             logger.info(f"[SYNC] Document {processing_id} completed successfully")
@@ -151,9 +223,87 @@ class DocumentService:
             logger.error(f"[SYNC] {error_msg}")
             self.update_processing_status(
                 processing_id,
-                ProcessingStatus.FAILED,
+                ProcessingStatus.FAILED if final_attempt else ProcessingStatus.PENDING,
                 error_message=error_msg
             )
+            raise
+
+    def _resume_batches(self, processing_id: str, record: dict) -> set:
+        """
+        Batches already stored by a previous attempt.
+
+        The checkpoint is only reused when the chunking parameters and batch
+        size match; otherwise it is reset for this attempt.
+        """
+        checkpoint = record.get("checkpoint") or {}
+        signature = self.document_processor.chunk_signature()
+        batch_size = self.pipeline.embed_batch_size
+        if checkpoint.get("signature") == signature and checkpoint.get("batch_size") == batch_size:
+            return set(checkpoint.get("batches", []))
+
+        self.processing_collection.update_one(
+            {"_id": ObjectId(processing_id)},
+            {"$set": {
+                "checkpoint": {"signature": signature, "batch_size": batch_size, "batches": []},
+                "updated_at": datetime.utcnow()
+            }}
+        )
+        return set()
+
+    def _start_progress(self, processing_id: str, record: dict):
+        """Reset the progress fields for a new attempt"""
+        file_size = record.get("file_size")
+        if file_size is None:
+            try:
+                file_size = Path(record["file_path"]).stat().st_size
+            except OSError:
+                file_size = None
+        self.processing_collection.update_one(
+            {"_id": ObjectId(processing_id)},
+            {"$set": {"progress": {
+                "stage": "parsing",
+                "bytes_total": file_size,
+                "bytes_parsed": 0,
+                "chunks_total": None,
+                "chunks_embedded": 0,
+                "stage_timings": {},
+                "eta_seconds": None,
+                "started_at": datetime.utcnow()
+            }}}
+        )
+
+    def _record_progress(self, processing_id: str, batch_index: Optional[int], progress: dict):
+        """
+        Store pipeline progress on the processing record.
+
+        Called once after parsing and after each committed batch; the batch
+        checkpoint is written in the same update.
+        """
+        update = {
+            "$set": {
+                **{f"progress.{field}": value for field, value in progress.items()},
+                "progress.stage": "embedding",
+                "updated_at": datetime.utcnow()
+            }
+        }
+        if batch_index is not None:
+            update["$addToSet"] = {"checkpoint.batches": batch_index}
+        self.processing_collection.update_one({"_id": ObjectId(processing_id)}, update)
+
+    def run_processing_job(self, job: dict):
+        """Job queue handler for process_document jobs"""
+        self._process_document_sync(
+            job["payload"]["processing_id"],
+            final_attempt=job["attempts"] >= job["max_attempts"]
+        )
+
+    def on_processing_job_dead(self, job: dict):
+        """Mark the record as failed when its job is dead-lettered"""
+        self.update_processing_status(
+            job["payload"]["processing_id"],
+            ProcessingStatus.FAILED,
+            error_message=job.get("last_error") or "Processing job dead-lettered"
+        )
 
     def update_processing_status(
         self,
@@ -181,11 +331,233 @@ class DocumentService:
             {"$set": update_doc}
         )
 
-    async def process_document(self, processing_id: str):
+    def _job_item(self, processing_id: str, record: dict) -> dict:
+        """
+        Job description for a processing record.
+
+        The lane is chosen from the file size and the tenant's fair share is
+        charged by size in MB.
+        """
+        file_size = record.get("file_size")
+        if file_size is None:
+            try:
+                file_size = Path(record["file_path"]).stat().st_size
+            except (KeyError, OSError):
+                file_size = 0
+        return {
+            "payload": {"processing_id": processing_id},
+            "key": f"{PROCESS_DOCUMENT_JOB}:{processing_id}",
+            "lane": lane_for_size(file_size),
+            "cost": max(file_size / 1048576, 1.0)
+        }
+
+    async def process_document(self, processing_id: str, record: Optional[dict] = None):
         """Queue document for background processing"""
-        logger.info(f"[ASYNC] Queueing document {processing_id} for background processing")
-        self.background_manager.add_task(self._process_document_sync, processing_id)
-        logger.info(f"[ASYNC] Document {processing_id} queued successfully")
+        record = record or self.processing_collection.find_one({"_id": ObjectId(processing_id)}) or {}
+        item = self._job_item(processing_id, record)
+
+        logger.info(f"[ASYNC] Queueing document {processing_id} for background processing ({item['lane']} lane)")
+        job_id = self.job_queue.enqueue(
+            PROCESS_DOCUMENT_JOB,
+            item["payload"],
+            key=item["key"],
+            lane=item["lane"],
+            tenant=record.get("tenant"),
+            cost=item["cost"]
+        )
+        logger.info(f"[ASYNC] Document {processing_id} queued successfully as job {job_id}")
+        return job_id
+
+    def _iter_upload_files(self, uploads: List[Tuple[str, BinaryIO]]):
+        """Yield (filename, stream) for plain uploads and for each member of uploaded archives"""
+        for filename, fileobj in uploads:
+            if is_archive(filename):
+                yield from iter_archive_members(filename, fileobj)
+            else:
+                yield Path(filename).name, fileobj
+
+    def create_batch(self, uploads: List[Tuple[str, BinaryIO]], tenant: Optional[str] = None) -> dict:
+        """
+        Store many uploaded files (or archive members) and queue them as one batch.
+
+        Each file is streamed into the blob store once while its sha256 is
+        computed.
+        Duplicates inside the batch and against existing records are
+        detected in the same pass, with one query for all hashes and names;
+        the new records are created with a single insert_many and queued
+        with a single job insert.
+
+        Returns:
+            Batch summary with the batch id, accepted documents and skipped files
+        """
+        settings = get_settings()
+        allowed = {ext.strip().lower() for ext in settings.ALLOWED_EXTENSIONS.split(",")}
+
+        stored = []
+        skipped = []
+        seen_hashes = set()
+        seen_names = set()
+        try:
+            for filename, stream in self._iter_upload_files(uploads):
+                if len(stored) >= settings.BULK_UPLOAD_MAX_FILES:
+                    skipped.append({"filename": filename, "reason": "batch file limit reached"})
+                    continue
+                if Path(filename).suffix.lower() not in allowed:
+                    skipped.append({"filename": filename, "reason": "unsupported extension"})
+                    continue
+                try:
+                    temp_path, file_hash, size = stream_to_disk(
+                        stream, self.blob_store.temp_dir, settings.MAX_UPLOAD_SIZE
+                    )
+                except UploadTooLarge as e:
+                    skipped.append({"filename": filename, "reason": str(e)})
+                    continue
+
+                if file_hash in seen_hashes or filename in seen_names:
+                    temp_path.unlink()
+                    skipped.append({"filename": filename, "reason": "duplicate in batch"})
+                    continue
+                seen_hashes.add(file_hash)
+                seen_names.add(filename)
+                stored.append({"filename": filename, "temp_path": temp_path, "file_hash": file_hash, "size": size})
+
+            # One lookup for every duplicate against existing records
+            existing = self.processing_collection.find(
+                {"$or": [
+                    {"file_hash": {"$in": [item["file_hash"] for item in stored]}},
+                    {"filename": {"$in": [item["filename"] for item in stored]}}
+                ]},
+                {"file_hash": 1, "filename": 1}
+            ) if stored else []
+            existing_by_hash = {}
+            existing_by_name = {}
+            for doc in existing:
+                existing_by_hash[doc.get("file_hash")] = str(doc["_id"])
+                existing_by_name[doc["filename"]] = str(doc["_id"])
+
+            now = datetime.utcnow()
+            batch_id = ObjectId()
+            records = []
+            for item in stored:
+                existing_id = existing_by_hash.get(item["file_hash"]) or existing_by_name.get(item["filename"])
+                if existing_id:
+                    item["temp_path"].unlink()
+                    skipped.append({"filename": item["filename"], "reason": "duplicate", "existing_id": existing_id})
+                    continue
+                blob_path = self.blob_store.put(
+                    item["temp_path"], item["file_hash"], Path(item["filename"]).suffix
+                )
+                records.append({
+                    "filename": item["filename"],
+                    "file_path": str(blob_path),
+                    "file_hash": item["file_hash"],
+                    "file_size": item["size"],
+                    "tenant": tenant,
+                    "batch_id": str(batch_id),
+                    "status": ProcessingStatus.PENDING,
+                    "created_at": now,
+                    "updated_at": now
+                })
+        except BaseException:
+            # Files already moved into the blob store are left to garbage collection
+            for item in stored:
+                item["temp_path"].unlink(missing_ok=True)
+            raise
+
+        if records:
+            try:
+                self.processing_collection.insert_many(records, ordered=False)
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != 11000 for error in errors):
+                    raise
+                # Same content uploaded concurrently: drop the records that lost
+                # the race (their blob is shared with the winner)
+                failed = {error["index"] for error in errors}
+                for index in sorted(failed):
+                    skipped.append({"filename": records[index]["filename"], "reason": "duplicate"})
+                records = [record for index, record in enumerate(records) if index not in failed]
+
+        self.job_queue.enqueue_many(
+            PROCESS_DOCUMENT_JOB,
+            [self._job_item(str(record["_id"]), record) for record in records],
+            tenant=tenant
+        )
+        self.batch_collection.insert_one({
+            "_id": batch_id,
+            "tenant": tenant,
+            "documents_total": len(records),
+            "bytes_total": sum(record["file_size"] for record in records),
+            "skipped": skipped,
+            "created_at": now
+        })
+        logger.info(f"[BATCH] Batch {batch_id}: {len(records)} documents queued, {len(skipped)} skipped")
+
+        return {
+            "batch_id": str(batch_id),
+            "documents": [
+                {"id": str(record["_id"]), "filename": record["filename"]}
+                for record in records
+            ],
+            "skipped": skipped
+        }
+
+    def get_batch_progress(self, batch_id: str) -> Optional[dict]:
+        """
+        Aggregate status and progress of the documents in a batch.
+
+        The ETA extrapolates the bytes finished so far over the time since
+        the batch was created, so it accounts for time spent queued.
+        """
+        if not ObjectId.is_valid(batch_id):
+            return None
+        batch = self.batch_collection.find_one({"_id": ObjectId(batch_id)})
+        if not batch:
+            return None
+
+        by_status = {}
+        chunks_total = chunks_embedded = bytes_done = 0
+        for row in self.processing_collection.aggregate([
+            {"$match": {"batch_id": batch_id}},
+            {"$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "bytes": {"$sum": "$file_size"},
+                "chunks_total": {"$sum": "$progress.chunks_total"},
+                "chunks_embedded": {"$sum": "$progress.chunks_embedded"}
+            }}
+        ]):
+            by_status[row["_id"]] = row["count"]
+            chunks_total += row["chunks_total"]
+            chunks_embedded += row["chunks_embedded"]
+            if row["_id"] in FINAL_STATUSES:
+                bytes_done += row["bytes"]
+
+        total = batch["documents_total"]
+        finished = sum(by_status.get(status, 0) for status in FINAL_STATUSES)
+        elapsed = (datetime.utcnow() - batch["created_at"]).total_seconds()
+        bytes_total = batch["bytes_total"]
+        if finished == total:
+            eta = 0.0
+        elif bytes_done > 0:
+            eta = round(elapsed * (bytes_total - bytes_done) / bytes_done, 1)
+        else:
+            eta = None
+
+        return {
+            "batch_id": batch_id,
+            "documents_total": total,
+            "documents_finished": finished,
+            "status_counts": by_status,
+            "chunks_total": chunks_total,
+            "chunks_embedded": chunks_embedded,
+            "bytes_total": bytes_total,
+            "bytes_finished": bytes_done,
+            "percent": round(100 * finished / total, 1) if total else 100.0,
+            "eta_seconds": eta,
+            "skipped": batch.get("skipped", []),
+            "created_at": batch["created_at"]
+        }
 
     async def get_processing_status(self, processing_id: str) -> Optional[DocumentProcessing]:
         """Get the current status of a document processing"""
@@ -195,6 +567,72 @@ class DocumentService:
             return DocumentProcessing(**record)
         return None
 
+    async def watch_processing(self, processing_id: str) -> AsyncIterator[Optional[DocumentProcessing]]:
+        """
+        Yield the processing record each time it changes, until it reaches a final status.
+
+        Uses a MongoDB change stream on the record when the deployment supports
+        it (replica sets, sharded clusters) and falls back to polling
+        updated_at otherwise. None is yielded on idle intervals so callers
+        can send keep-alives.
+        """
+        settings = get_settings()
+        collection = await MongoDB.get_collection(settings.MONGODB_COLLECTION_NAME)
+        object_id = ObjectId(processing_id)
+
+        # The stream starts at the cluster time read before the first snapshot,
+        # so no update between the snapshot and the stream is missed
+        try:
+            hello = await MongoDB.get_database().command("hello")
+        except Exception as e:
+            logger.warning(f"[PROGRESS] Could not detect change stream support: {str(e)}")
+            hello = {}
+        use_stream = "setName" in hello or hello.get("msg") == "isdbgrid"
+        stream = None
+
+        try:
+            record = await collection.find_one({"_id": object_id})
+            while record is not None:
+                record["id"] = str(record.pop("_id"))
+                model = DocumentProcessing(**record)
+                yield model
+                if model.status in FINAL_STATUSES:
+                    return
+
+                if use_stream and stream is None:
+                    try:
+                        stream = collection.watch(
+                            [{"$match": {"documentKey._id": object_id}}],
+                            full_document="updateLookup",
+                            start_at_operation_time=hello.get("operationTime"),
+                            max_await_time_ms=int(settings.PROGRESS_KEEPALIVE_INTERVAL * 1000)
+                        )
+                    except OperationFailure as e:
+                        logger.info(f"[PROGRESS] Change streams unavailable, polling instead: {str(e)}")
+                        use_stream = False
+
+                record = None
+                while record is None:
+                    if stream is not None:
+                        try:
+                            change = await stream.try_next()
+                        except OperationFailure as e:
+                            logger.info(f"[PROGRESS] Change stream failed, polling instead: {str(e)}")
+                            await stream.close()
+                            stream, use_stream = None, False
+                            continue
+                        record = change.get("fullDocument") if change else None
+                    else:
+                        await asyncio.sleep(settings.PROGRESS_POLL_INTERVAL)
+                        record = await collection.find_one(
+                            {"_id": object_id, "updated_at": {"$gt": model.updated_at}}
+                        )
+                    if record is None:
+                        yield None
+        finally:
+            if stream is not None:
+                await stream.close()
+
     async def list_processing_status(self, status: Optional[ProcessingStatus] = None) -> List[DocumentProcessing]:
         """List all document processing records, optionally filtered by status"""
         query = {}
@@ -213,4 +651,84 @@ class DocumentService:
         for record in failed_records:
             processing_id = str(record["_id"])
             logger.info(f"[ASYNC] Requeueing failed document {processing_id}")
-            await self.process_document(processing_id)
+            self.update_processing_status(processing_id, ProcessingStatus.PENDING)
+            await self.process_document(processing_id, record)
+
+    def get_pipeline_stats(self) -> dict:
+        """Per-stage throughput and utilisation of the ingestion pipeline"""
+        return self.pipeline.get_stats()
+
+    def get_lane_stats(self) -> dict:
+        """Queue depth and expected wait per priority lane"""
+        return self.job_queue.lane_stats()
+
+    def collect_unreferenced_blobs(self, grace_period: Optional[float] = None) -> dict:
+        """
+        Delete blobs that no processing record points to.
+
+        Blobs are checked one shard directory at a time, with a single query
+        per directory. Blobs (and upload temp files) younger than the grace
+        period are kept so in-flight uploads are not collected.
+        """
+        if grace_period is None:
+            grace_period = get_settings().BLOB_GC_GRACE_PERIOD
+        cutoff = time.time() - grace_period
+        checked = deleted = freed = 0
+
+        for blobs in self.blob_store.iter_shards():
+            candidates = {}
+            for path in blobs:
+                stat = path.stat()
+                if stat.st_mtime < cutoff:
+                    candidates[str(path)] = (path, stat.st_size)
+            checked += len(blobs)
+            if not candidates:
+                continue
+
+            referenced = {
+                doc["file_path"]
+                for doc in self.processing_collection.find(
+                    {"file_path": {"$in": list(candidates)}}, {"file_path": 1}
+                )
+            }
+            for key, (path, size) in candidates.items():
+                if key not in referenced:
+                    self.blob_store.delete(path)
+                    deleted += 1
+                    freed += size
+
+        temp_files = self.blob_store.remove_stale_temp_files(grace_period)
+        logger.info(f"[GC] Checked {checked} blobs, deleted {deleted} ({freed} bytes), {temp_files} stale temp files")
+        return {
+            "blobs_checked": checked,
+            "blobs_deleted": deleted,
+            "bytes_freed": freed,
+            "temp_files_deleted": temp_files
+        }
+
+    def schedule_blob_gc(self, delay: float = 0) -> Optional[str]:
+        """
+        Queue a blob garbage collection run.
+
+        The job key is the GC interval slot the run falls in, enqueued with
+        enqueue_once, so each slot runs at most once however many workers
+        schedule it, including after its run has finished.
+        """
+        interval = get_settings().BLOB_GC_INTERVAL
+        slot = int((time.time() + delay) // interval)
+        return self.job_queue.enqueue_once(
+            BLOB_GC_JOB,
+            {},
+            key=f"{BLOB_GC_JOB}:{slot}",
+            delay=delay,
+            lane=JobLane.BULK.value
+        )
+
+    def run_blob_gc_job(self, job: dict):
+        """Job queue handler for gc_blobs jobs; schedules the next run"""
+        self.collect_unreferenced_blobs()
+        self.schedule_blob_gc(delay=get_settings().BLOB_GC_INTERVAL)
+
+    def get_job_stats(self) -> dict:
+        """Job queue counters by type and status"""
+        return self.job_queue.stats()
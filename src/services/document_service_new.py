@@ -8,7 +8,7 @@ from src.models.document import DocumentProcessing, ProcessingStatus
 from src.rag.document_processor import DocumentProcessor
 from src.rag.embeddings_manager import EmbeddingsManager
 from src.config import MONGODB_URI
-from src.services.background_manager import BackgroundTaskManager
+from src.services.job_queue import JobQueue
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +19,7 @@ class DocumentService:
         self.processing_collection = self.db.document_processing
         self.document_processor = DocumentProcessor()
         self.embeddings_manager = EmbeddingsManager(mongodb_uri=MONGODB_URI)
-        self.background_manager = BackgroundTaskManager()
+        self.job_queue = JobQueue()
         
         # Ensure indexes
         self.processing_collection.create_index("status")
@@ -109,7 +109,11 @@ class DocumentService:
     async def process_document(self, processing_id: str):
         """Queue document for background processing"""
         logger.info(f"[ASYNC] Queueing document {processing_id} for background processing")
-        self.background_manager.add_task(self._process_document_sync, processing_id)
+        self.job_queue.enqueue(
+            "process_document",
+            {"processing_id": processing_id},
+            key=f"process_document:{processing_id}"
+        )
         logger.info(f"[ASYNC] Document {processing_id} queued successfully")
 
     async def get_processing_status(self, processing_id: str) -> Optional[DocumentProcessing]:
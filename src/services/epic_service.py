@@ -9,6 +9,7 @@ from src.utils.azure_client import get_azure_chat_model, get_azure_embeddings
 import asyncio
 
 from src.models.epic import Epic, UserStory, ExternalReference, EpicSource
+from src.rag.memoize import invalidates
 
 logger = logging.getLogger(__name__)
 
@@ -189,6 +190,7 @@ class EpicService:
             status=epic_dict["status"]
         )
 
+    @invalidates(["epics"])
     async def create_epic(self, epic: Epic) -> str:
         """Create a new epic"""
         try:
@@ -225,6 +227,7 @@ class EpicService:
             logger.error(f"[EPIC] Erro ao buscar épico {epic_id}: {str(e)}")
             raise
 
+    @invalidates(["epics", "epic:{epic_id}"])
     async def update_epic(self, epic_id: str, epic: Epic) -> bool:
         """Update an existing epic"""
         try:
@@ -253,6 +256,7 @@ class EpicService:
             logger.error(f"[EPIC] Erro ao atualizar épico {epic_id}: {str(e)}")
             raise
 
+    @invalidates(["epics", "epic:{epic_id}"])
     async def delete_epic(self, epic_id: str) -> bool:
         """Delete an epic"""
         try:
@@ -377,6 +381,7 @@ class EpicService:
             logger.error(f"[EPIC] Erro na busca por épicos similares: {str(e)}")
             raise
 
+    @invalidates(["epics", "epic:{epic_id}"])
     async def link_external_reference(
         self,
         epic_id: str,
@@ -410,6 +415,7 @@ class EpicService:
             logger.error(f"[EPIC] Erro ao linkar épico {epic_id} to external reference: {str(e)}")
             raise
 
+    @invalidates(["epics", "epic:{epic_id}"])
     async def update_external_reference(
         self,
         epic_id: str,
@@ -0,0 +1,638 @@
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from src.config.settings import get_settings
+from src.models.job import JobLane, JobStatus
+from src.utils.utils import get_mongodb_client
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], None]
+
+DEFAULT_TENANT = "default"
+
+# Lanes in priority order; the weight is how often a worker tries each lane first
+LANE_WEIGHTS = {JobLane.FAST.value: 4, JobLane.STANDARD.value: 2, JobLane.BULK.value: 1}
+
+def lane_for_size(size_bytes: int) -> str:
+    """Pick the lane of a job from the size of the file it processes"""
+    settings = get_settings()
+    if size_bytes <= settings.JOB_FAST_LANE_MAX_BYTES:
+        return JobLane.FAST.value
+    if size_bytes <= settings.JOB_STANDARD_LANE_MAX_BYTES:
+        return JobLane.STANDARD.value
+    return JobLane.BULK.value
+
+def parse_tenant_weights(value: str) -> Dict[str, float]:
+    """Parse "tenant:weight,tenant:weight" into a dict"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        tenant, _, weight = item.rpartition(":")
+        try:
+            weights[tenant] = max(float(weight), 0.01)
+        except ValueError:
+            logger.warning(f"[QUEUE] Ignoring invalid tenant weight: {item}")
+    return weights
+
+class JobQueue:
+    """
+    Persistent job queue stored in MongoDB.
+
+    Workers claim jobs atomically with find_one_and_update and hold a lease
+    (visibility timeout) while they run. A job whose lease expires becomes
+    visible again, failed jobs are retried with exponential backoff and jobs
+    that exhaust their attempts are moved to the dead-letter collection.
+
+    Jobs are split into lanes by size, and within a lane tenants share the
+    workers by weighted fair queuing: each job gets a virtual finish time
+    (tenant's previous finish, or the lane's virtual clock if later, plus
+    cost / weight) and workers claim the lowest one first. A tenant that
+    queues a thousand files only gets its share, not the whole lane.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+            return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        settings = get_settings()
+        self.client = get_mongodb_client(settings.MONGODB_URI)
+        self.db = self.client[settings.MONGODB_DB_NAME]
+        self.collection = self.db[settings.JOB_QUEUE_COLLECTION]
+        self.dead_letter_collection = self.db[f"{settings.JOB_QUEUE_COLLECTION}_dead"]
+        self.scheduler_collection = self.db[f"{settings.JOB_QUEUE_COLLECTION}_scheduler"]
+        self.tenant_weights = parse_tenant_weights(settings.JOB_TENANT_WEIGHTS)
+        self.wait_estimate_window = settings.JOB_WAIT_ESTIMATE_WINDOW
+        self.visibility_timeout = settings.JOB_VISIBILITY_TIMEOUT
+        self.max_attempts = settings.JOB_MAX_ATTEMPTS
+        self.retry_base_delay = settings.JOB_RETRY_BASE_DELAY
+        self.retry_max_delay = settings.JOB_RETRY_MAX_DELAY
+        self._ensure_indexes(settings.JOB_RETENTION)
+        self._initialized = True
+
+    def _ensure_indexes(self, retention: int):
+        """Ensure all required indexes exist"""
+        self.collection.create_indexes([
+            IndexModel([("status", ASCENDING), ("type", ASCENDING), ("lane", ASCENDING), ("virtual_finish", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("lane", ASCENDING), ("finished_at", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)]),
+            # At most one queued or running job per key
+            IndexModel(
+                [("active_key", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"active_key": {"$type": "string"}}
+            ),
+            # Finished jobs are removed after the retention period
+            IndexModel(
+                [("finished_at", ASCENDING)],
+                expireAfterSeconds=retention,
+                partialFilterExpression={"status": JobStatus.SUCCEEDED.value}
+            )
+        ])
+        self.dead_letter_collection.create_index("type")
+
+    def _virtual_finish(self, lane: str, tenant: str, cost: float) -> float:
+        """
+        Advance the tenant's virtual clock in a lane and return the job's finish tag.
+
+        The lane clock is the start tag of the last claimed job, so a tenant
+        that was idle does not get credit for the time it had nothing queued.
+        """
+        lane_clock = self.scheduler_collection.find_one({"_id": f"lane:{lane}"}) or {}
+        now_virtual = lane_clock.get("virtual_time", 0.0)
+        weight = self.tenant_weights.get(tenant, 1.0)
+        state = self.scheduler_collection.find_one_and_update(
+            {"_id": f"tenant:{lane}:{tenant}"},
+            [
+                {"$set": {"last_start": {"$max": ["$last_finish", now_virtual]}}},
+                {"$set": {"last_finish": {"$add": ["$last_start", cost / weight]}}}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return state["last_finish"]
+
+    def _new_job(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        key: Optional[str],
+        max_attempts: Optional[int],
+        delay: float,
+        lane: str,
+        tenant: str,
+        cost: float,
+        virtual_finish: Optional[float] = None
+    ) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        weight = self.tenant_weights.get(tenant, 1.0)
+        if virtual_finish is None:
+            virtual_finish = self._virtual_finish(lane, tenant, cost)
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "status": JobStatus.QUEUED.value,
+            "lane": lane,
+            "tenant": tenant,
+            "cost": cost,
+            "virtual_start": virtual_finish - cost / weight,
+            "virtual_finish": virtual_finish,
+            "attempts": 0,
+            "max_attempts": max_attempts or self.max_attempts,
+            "run_at": now + timedelta(seconds=delay),
+            "created_at": now,
+            "updated_at": now
+        }
+        if key is not None:
+            job["key"] = key
+            job["active_key"] = key
+        return job
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0,
+        lane: str = JobLane.STANDARD.value,
+        tenant: Optional[str] = None,
+        cost: float = 1.0
+    ) -> str:
+        """
+        Add a job to the queue.
+
+        If a queued or running job with the same key already exists, no new
+        job is created and the id of the existing one is returned. cost is
+        the job's share of work for fair queuing (e.g. file size in MB).
+        """
+        if key is not None:
+            # Checked first so a duplicate does not advance the tenant's clock
+            existing = self.collection.find_one({"active_key": key}, {"_id": 1})
+            if existing is not None:
+                logger.info(f"[QUEUE] Job {key} already queued as {existing['_id']}")
+                return str(existing["_id"])
+
+        job = self._new_job(
+            job_type, payload, key, max_attempts, delay,
+            lane, tenant or DEFAULT_TENANT, max(cost, 0.01)
+        )
+        try:
+            result = self.collection.insert_one(job)
+        except DuplicateKeyError:
+            existing = self.collection.find_one({"active_key": key}, {"_id": 1})
+            if existing is None:
+                # The active job finished between the insert and the lookup
+                return self.enqueue(job_type, payload, key, max_attempts, delay, lane, tenant, cost)
+            logger.info(f"[QUEUE] Job {key} already queued as {existing['_id']}")
+            return str(existing["_id"])
+
+        logger.info(f"[QUEUE] Enqueued {job_type} job {result.inserted_id}")
+        return str(result.inserted_id)
+
+    def enqueue_once(self, job_type: str, payload: Dict[str, Any], key: str, **kwargs) -> Optional[str]:
+        """
+        Add a job that runs at most once per key, ever.
+
+        enqueue only deduplicates against queued or running jobs; here a
+        permanent marker in the scheduler collection (unique _id) also
+        rejects keys whose job already finished. Returns None if the key
+        was already used. Other arguments are passed to enqueue.
+        """
+        marker = f"once:{key}"
+        try:
+            self.scheduler_collection.insert_one({"_id": marker, "created_at": datetime.utcnow()})
+        except DuplicateKeyError:
+            logger.info(f"[QUEUE] Job {key} already scheduled once, skipping")
+            return None
+        try:
+            return self.enqueue(job_type, payload, key=key, **kwargs)
+        except Exception:
+            # Without the job the key must stay available
+            self.scheduler_collection.delete_one({"_id": marker})
+            raise
+
+    def enqueue_many(
+        self,
+        job_type: str,
+        items: List[Dict[str, Any]],
+        tenant: Optional[str] = None,
+        max_attempts: Optional[int] = None
+    ) -> List[str]:
+        """
+        Add several jobs with a single insert_many.
+
+        Each item has a payload and optionally key, lane and cost. The
+        tenant's virtual clock is advanced once per lane for the whole
+        batch, and items whose key already has a queued or running job are
+        skipped.
+
+        Returns:
+            Ids of the jobs created
+        """
+        tenant = tenant or DEFAULT_TENANT
+        weight = self.tenant_weights.get(tenant, 1.0)
+        keys = [item["key"] for item in items if item.get("key") is not None]
+        active = {
+            doc["active_key"]
+            for doc in self.collection.find({"active_key": {"$in": keys}}, {"active_key": 1})
+        } if keys else set()
+        items = [item for item in items if item.get("key") not in active]
+        if not items:
+            return []
+
+        lanes: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            lanes.setdefault(item.get("lane", JobLane.STANDARD.value), []).append(item)
+
+        docs = []
+        for lane, lane_items in lanes.items():
+            costs = [max(item.get("cost", 1.0), 0.01) for item in lane_items]
+            # One clock update for the lane, then consecutive tags inside it
+            virtual_finish = self._virtual_finish(lane, tenant, sum(costs)) - sum(costs) / weight
+            for item, cost in zip(lane_items, costs):
+                virtual_finish += cost / weight
+                docs.append(self._new_job(
+                    job_type, item["payload"], item.get("key"), max_attempts, 0,
+                    lane, tenant, cost, virtual_finish
+                ))
+
+        try:
+            result = self.collection.insert_many(docs, ordered=False)
+            inserted_ids = result.inserted_ids
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            # Keys enqueued concurrently by another request
+            failed = {error["index"] for error in errors}
+            inserted_ids = [doc["_id"] for index, doc in enumerate(docs) if index not in failed]
+            logger.info(f"[QUEUE] {len(failed)} {job_type} jobs already queued")
+
+        logger.info(f"[QUEUE] Enqueued {len(inserted_ids)} {job_type} jobs for tenant {tenant}")
+        return [str(job_id) for job_id in inserted_ids]
+
+    def claim(
+        self,
+        worker_id: str,
+        job_types: List[str],
+        lanes: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the next due job of the given types.
+
+        Lanes are tried in the given order; within a lane the job with the
+        lowest virtual finish time wins. Queued jobs whose run_at has passed
+        and running jobs whose lease has expired are both eligible; the
+        claim increments the attempt counter.
+        """
+        for lane in lanes or list(LANE_WEIGHTS):
+            job = self._claim_lane(worker_id, job_types, lane)
+            if job is not None:
+                self.scheduler_collection.update_one(
+                    {"_id": f"lane:{lane}"},
+                    {"$max": {"virtual_time": job.get("virtual_start", 0.0)}},
+                    upsert=True
+                )
+                return job
+        return None
+
+    def _claim_lane(self, worker_id: str, job_types: List[str], lane: str) -> Optional[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {
+                "type": {"$in": job_types},
+                "lane": lane,
+                "$or": [
+                    {"status": JobStatus.QUEUED.value, "run_at": {"$lte": now}},
+                    {"status": JobStatus.RUNNING.value, "lease_expires_at": {"$lte": now}}
+                ]
+            },
+            {
+                "$set": {
+                    "status": JobStatus.RUNNING.value,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.visibility_timeout),
+                    "started_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("virtual_finish", ASCENDING), ("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def extend_leases(self, worker_id: str, job_ids: List[ObjectId]) -> int:
+        """Extend the leases this worker holds on running jobs"""
+        if not job_ids:
+            return 0
+        now = datetime.utcnow()
+        result = self.collection.update_many(
+            {"_id": {"$in": job_ids}, "lease_owner": worker_id, "status": JobStatus.RUNNING.value},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=self.visibility_timeout),
+                "updated_at": now
+            }}
+        )
+        return result.modified_count
+
+    def complete(self, job: Dict[str, Any], worker_id: str) -> bool:
+        """Mark a job as succeeded. Returns False if the lease was lost"""
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": job["_id"], "lease_owner": worker_id},
+            {
+                "$set": {"status": JobStatus.SUCCEEDED.value, "finished_at": now, "updated_at": now},
+                "$unset": {"lease_owner": "", "lease_expires_at": "", "active_key": ""}
+            }
+        )
+        return result.modified_count == 1
+
+    def retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with jitter for the given attempt number"""
+        delay = min(self.retry_max_delay, self.retry_base_delay * 2 ** max(attempts - 1, 0))
+        return delay * random.uniform(0.5, 1.0)
+
+    def fail(self, job: Dict[str, Any], worker_id: str, error: str) -> JobStatus:
+        """
+        Record a failed attempt.
+
+        The job is rescheduled with backoff, or dead-lettered when it has no
+        attempts left.
+        """
+        if job["attempts"] >= job["max_attempts"]:
+            self.dead_letter(job, worker_id, error)
+            return JobStatus.DEAD
+
+        now = datetime.utcnow()
+        delay = self.retry_delay(job["attempts"])
+        self.collection.update_one(
+            {"_id": job["_id"], "lease_owner": worker_id},
+            {
+                "$set": {
+                    "status": JobStatus.QUEUED.value,
+                    "run_at": now + timedelta(seconds=delay),
+                    "last_error": error,
+                    "updated_at": now
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        )
+        logger.warning(
+            f"[QUEUE] Job {job['_id']} failed (attempt {job['attempts']}/{job['max_attempts']}), "
+            f"retrying in {delay:.0f}s: {error}"
+        )
+        return JobStatus.QUEUED
+
+    def dead_letter(self, job: Dict[str, Any], worker_id: str, error: str):
+        """Move a job to the dead-letter collection"""
+        now = datetime.utcnow()
+        dead = {k: v for k, v in job.items() if k not in ("lease_owner", "lease_expires_at", "active_key")}
+        dead.update({"status": JobStatus.DEAD.value, "last_error": error, "finished_at": now, "updated_at": now})
+        self.dead_letter_collection.replace_one({"_id": job["_id"]}, dead, upsert=True)
+        self.collection.delete_one({"_id": job["_id"], "lease_owner": worker_id})
+        logger.error(f"[QUEUE] Job {job['_id']} moved to dead-letter after {job['attempts']} attempts: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Count jobs by status and type"""
+        counts: Dict[str, Dict[str, int]] = {}
+        for row in self.collection.aggregate([
+            {"$group": {"_id": {"status": "$status", "type": "$type"}, "count": {"$sum": 1}}}
+        ]):
+            counts.setdefault(row["_id"]["type"], {})[row["_id"]["status"]] = row["count"]
+        for row in self.dead_letter_collection.aggregate([
+            {"$group": {"_id": "$type", "count": {"$sum": 1}}}
+        ]):
+            counts.setdefault(row["_id"], {})[JobStatus.DEAD.value] = row["count"]
+        return {"jobs": counts}
+
+    def lane_stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, recent throughput and expected wait per lane.
+
+        The expected wait is the number of queued jobs divided by the lane's
+        completion rate over the last JOB_WAIT_ESTIMATE_WINDOW seconds; it is
+        None when nothing completed in the window.
+        """
+        since = datetime.utcnow() - timedelta(seconds=self.wait_estimate_window)
+        rows = self.collection.aggregate([
+            {"$match": {"$or": [
+                {"status": {"$in": [JobStatus.QUEUED.value, JobStatus.RUNNING.value]}},
+                {"status": JobStatus.SUCCEEDED.value, "finished_at": {"$gte": since}}
+            ]}},
+            {"$group": {
+                "_id": "$lane",
+                "queued": {"$sum": {"$cond": [{"$eq": ["$status", JobStatus.QUEUED.value]}, 1, 0]}},
+                "running": {"$sum": {"$cond": [{"$eq": ["$status", JobStatus.RUNNING.value]}, 1, 0]}},
+                "completed": {"$sum": {"$cond": [{"$eq": ["$status", JobStatus.SUCCEEDED.value]}, 1, 0]}},
+                "tenants": {"$addToSet": {"$cond": [
+                    {"$eq": ["$status", JobStatus.QUEUED.value]}, "$tenant", None
+                ]}},
+                "run_ms": {"$avg": {"$cond": [
+                    {"$eq": ["$status", JobStatus.SUCCEEDED.value]},
+                    {"$subtract": ["$finished_at", "$started_at"]},
+                    None
+                ]}}
+            }}
+        ])
+        by_lane = {row["_id"]: row for row in rows}
+
+        lanes = {}
+        for lane in LANE_WEIGHTS:
+            row = by_lane.get(lane, {})
+            queued = row.get("queued", 0)
+            completed = row.get("completed", 0)
+            per_second = completed / self.wait_estimate_window
+            if queued == 0:
+                expected_wait = 0.0
+            elif per_second > 0:
+                expected_wait = round(queued / per_second, 1)
+            else:
+                expected_wait = None
+            lanes[lane] = {
+                "queued": queued,
+                "running": row.get("running", 0),
+                "queued_tenants": len([tenant for tenant in row.get("tenants", []) if tenant is not None]),
+                "completed_recently": completed,
+                "avg_run_seconds": round(row["run_ms"] / 1000, 1) if row.get("run_ms") is not None else None,
+                "expected_wait_seconds": expected_wait
+            }
+        return {"window_seconds": self.wait_estimate_window, "lanes": lanes}
+
+class JobWorker:
+    """
+    Runs jobs from a JobQueue on a fixed number of threads.
+
+    Leases of running jobs are renewed by a heartbeat thread, so a job may
+    run longer than the visibility timeout; if the process dies, the leases
+    expire and other workers pick the jobs up again.
+
+    Each claim tries the lanes in weighted round-robin order (falling back
+    to the others when the preferred lane is empty), and at most
+    max_bulk_running threads run bulk jobs, so large files never hold every
+    thread while small ones wait.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_bulk_running: Optional[int] = None
+    ):
+        settings = get_settings()
+        self.queue = queue
+        self.concurrency = max(1, concurrency or settings.JOB_WORKER_CONCURRENCY)
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        if max_bulk_running is None:
+            max_bulk_running = settings.JOB_BULK_LANE_MAX_RUNNING
+        # Keep at least one thread free for the other lanes
+        self.max_bulk_running = max(1, min(max_bulk_running, self.concurrency - 1)) if self.concurrency > 1 else 1
+        self._lane_cycle = [lane for lane, weight in LANE_WEIGHTS.items() for _ in range(weight)]
+        self._lane_turn = 0
+        self._bulk_running = 0
+        self._lane_lock = threading.Lock()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers: Dict[str, JobHandler] = {}
+        self._dead_handlers: Dict[str, JobHandler] = {}
+        self._running: Dict[ObjectId, Dict[str, Any]] = {}
+        self._running_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def register(self, job_type: str, handler: JobHandler, on_dead: Optional[JobHandler] = None):
+        """
+        Register the handler for a job type.
+
+        The handler receives the claimed job document and signals failure by
+        raising; on_dead is called when the job is dead-lettered.
+        """
+        self._handlers[job_type] = handler
+        if on_dead is not None:
+            self._dead_handlers[job_type] = on_dead
+
+    def _notify_dead(self, job: Dict[str, Any]):
+        on_dead = self._dead_handlers.get(job["type"])
+        if on_dead is not None:
+            try:
+                on_dead(job)
+            except Exception as e:
+                logger.error(f"[WORKER] Error in dead-letter handler for job {job['_id']}: {str(e)}")
+
+    def _run_job(self, job: Dict[str, Any]):
+        if job["attempts"] > job["max_attempts"]:
+            # Lease expired on the last attempt (e.g. the worker crashed)
+            self.queue.dead_letter(job, self.worker_id, job.get("last_error") or "Lease expired")
+            self._notify_dead(job)
+            return
+
+        with self._running_lock:
+            self._running[job["_id"]] = job
+        try:
+            logger.info(f"[WORKER] Running {job['type']} job {job['_id']} (attempt {job['attempts']})")
+            self._handlers[job["type"]](job)
+        except Exception as e:
+            if self.queue.fail(job, self.worker_id, str(e) or type(e).__name__) == JobStatus.DEAD:
+                self._notify_dead(job)
+        else:
+            if not self.queue.complete(job, self.worker_id):
+                logger.warning(f"[WORKER] Lease lost before completing job {job['_id']}")
+        finally:
+            with self._running_lock:
+                self._running.pop(job["_id"], None)
+
+    def _next_lanes(self) -> Tuple[List[str], bool]:
+        """
+        Lane order for the next claim, and whether a bulk slot was reserved.
+        """
+        with self._lane_lock:
+            first = self._lane_cycle[self._lane_turn % len(self._lane_cycle)]
+            self._lane_turn += 1
+            lanes = [first] + [lane for lane in LANE_WEIGHTS if lane != first]
+            if self._bulk_running >= self.max_bulk_running:
+                return [lane for lane in lanes if lane != JobLane.BULK.value], False
+            self._bulk_running += 1
+            return lanes, True
+
+    def _release_bulk(self):
+        with self._lane_lock:
+            self._bulk_running -= 1
+
+    def _work(self):
+        job_types = list(self._handlers)
+        while not self._stop.is_set():
+            lanes, bulk_reserved = self._next_lanes()
+            try:
+                job = self.queue.claim(self.worker_id, job_types, lanes)
+            except Exception as e:
+                logger.error(f"[WORKER] Error claiming job: {str(e)}")
+                job = None
+                self._stop.wait(self.poll_interval * 5)
+
+            runs_bulk = job is not None and job.get("lane") == JobLane.BULK.value
+            if bulk_reserved and not runs_bulk:
+                self._release_bulk()
+
+            if job is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            try:
+                self._run_job(job)
+            finally:
+                if runs_bulk:
+                    self._release_bulk()
+
+    def _heartbeat(self):
+        interval = max(self.queue.visibility_timeout / 3, 1)
+        while not self._stop.wait(interval):
+            with self._running_lock:
+                job_ids = list(self._running)
+            try:
+                self.queue.extend_leases(self.worker_id, job_ids)
+            except Exception as e:
+                logger.error(f"[WORKER] Error extending leases: {str(e)}")
+
+    def start(self):
+        """Start the worker and heartbeat threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        self._threads.append(threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"[WORKER] {self.worker_id} started with concurrency {self.concurrency}")
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop claiming jobs and wait for running ones to finish.
+
+        Jobs still running after the timeout keep their lease until it
+        expires, then become visible to other workers.
+        """
+        self._stop.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        self._threads = []
+        logger.info(f"[WORKER] {self.worker_id} stopped")
@@ -5,7 +5,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 from motor.motor_asyncio import AsyncIOMotorCollection
 from src.models.tracking import APITracking, TrackingType
-from src.core.database import get_collection
+from src.config.database import MongoDB
+from src.rag.cache_metrics import CacheMetrics
 
 class TrackingService:
     _instance: Optional['TrackingService'] = None
@@ -19,7 +20,7 @@ class TrackingService:
     async def initialize(self):
         """Initialize the tracking service with database collection"""
         if self._collection is None:
-            self._collection = await get_collection("tracking")
+            self._collection = await MongoDB.get_collection("tracking")
             # Create indexes
             await self._collection.create_index("tracking_type")
             await self._collection.create_index("timestamp")
@@ -127,3 +128,44 @@ class TrackingService:
             sort=[("timestamp", -1)]
         ).limit(limit)
         return await cursor.to_list(None)
+
+    async def get_cache_metrics(self, start_date: datetime, end_date: datetime):
+        """Gets cache metrics per namespace: flushed history plus this process' live counters"""
+        metrics = CacheMetrics()
+        collection = await MongoDB.get_collection(CacheMetrics.COLLECTION_NAME)
+        cursor = collection.find({
+            "period_start": {"$gte": start_date, "$lte": end_date}
+        })
+        
+        history: Dict[str, Dict[str, Any]] = {}
+        async for doc in cursor:
+            namespace = history.setdefault(doc["namespace"], {
+                "counters": {},
+                "get_latency": {"count": 0, "sum_ms": 0.0, "buckets": {}},
+                "set_latency": {"count": 0, "sum_ms": 0.0, "buckets": {}}
+            })
+            for name, value in doc.get("counters", {}).items():
+                namespace["counters"][name] = namespace["counters"].get(name, 0) + value
+            for field in ("get_latency", "set_latency"):
+                latency = doc.get(field)
+                if not latency:
+                    continue
+                merged = namespace[field]
+                merged["count"] += latency.get("count", 0)
+                merged["sum_ms"] += latency.get("sum_ms", 0.0)
+                for label, count in latency.get("buckets", {}).items():
+                    merged["buckets"][label] = merged["buckets"].get(label, 0) + count
+        
+        for namespace in history.values():
+            counters = namespace["counters"]
+            hits = counters.get("memory_hits", 0) + counters.get("hits", 0)
+            lookups = hits + counters.get("misses", 0)
+            namespace["hit_rate"] = hits / lookups if lookups else 0.0
+            for field in ("get_latency", "set_latency"):
+                latency = namespace[field]
+                latency["avg_ms"] = latency["sum_ms"] / latency["count"] if latency["count"] else 0.0
+        
+        return {
+            "history": history,
+            "live": metrics.snapshot()
+        }
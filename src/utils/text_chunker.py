@@ -1,88 +1,198 @@
 """Utility for chunking text into smaller pieces."""
-from typing import List
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ENCODING = "cl100k_base"
+
+# Positions right after a run of whitespace: where a chunk may end without splitting a word
+_BREAK_PATTERN = re.compile(r"\s+")
+
+@lru_cache(maxsize=None)
+def get_encoding(name: str = DEFAULT_ENCODING):
+    """Load a tiktoken encoding once per process.
+
+    Args:
+        name: tiktoken encoding name
+
+    Returns:
+        The tiktoken Encoding
+    """
+    import tiktoken
+    return tiktoken.get_encoding(name)
+
+class TextChunk(NamedTuple):
+    """A chunk of text with its character span in the source and its token count."""
+    text: str
+    start: int
+    end: int
+    token_count: Optional[int]
+
 class TextChunker:
-    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        length_unit: str = "chars",
+        encoding_name: str = DEFAULT_ENCODING,
+        count_tokens: bool = False
+    ):
         """Initialize text chunker.
-        
+
         Args:
-            chunk_size: Maximum size of each chunk
-            overlap: Number of characters to overlap between chunks
+            chunk_size: Maximum size of each chunk, in length_unit
+            overlap: Size to overlap between chunks, in length_unit
+            length_unit: "chars" or "tokens" (sized with the embedding tokenizer)
+            encoding_name: tiktoken encoding used for token sizing and counts
+            count_tokens: Whether to report token counts in "chars" mode
+                (loads the tiktoken encoding; off by default)
         """
+        if length_unit not in ("chars", "tokens"):
+            raise ValueError(f"Invalid length_unit: {length_unit}")
+        if overlap >= chunk_size:
+            raise ValueError("overlap must be smaller than chunk_size")
         self.chunk_size = chunk_size
         self.overlap = overlap
-        
-    def chunk_text(self, text: str) -> List[str]:
-        """Split text into overlapping chunks.
-        
+        self.length_unit = length_unit
+        self.encoding_name = encoding_name
+        self.count_tokens = count_tokens
+
+    def _spans(self, total: int, breaks: Sequence[int]) -> List[Tuple[int, int]]:
+        """Compute chunk spans over `total` units in one forward pass.
+
+        Each chunk ends at the last break point within chunk_size (or is cut
+        at chunk_size when there is none past the overlap), and the next one
+        starts at the first break point inside the overlap window.
+
+        Args:
+            total: Number of units (characters or tokens)
+            breaks: Sorted unit positions where a chunk may start or end
+
+        Returns:
+            List of (start, end) unit positions
+        """
+        spans = []
+        start = 0
+        while start < total:
+            limit = start + self.chunk_size
+            if limit >= total:
+                end = total
+            else:
+                index = bisect_right(breaks, limit) - 1
+                # A break inside the overlap would make no progress: cut at the limit
+                end = breaks[index] if index >= 0 and breaks[index] > start + self.overlap else limit
+            spans.append((start, end))
+            if end >= total:
+                break
+
+            next_start = max(end - self.overlap, start + 1)
+            index = bisect_left(breaks, next_start)
+            if index < len(breaks) and breaks[index] < end:
+                next_start = breaks[index]
+            start = next_start
+        return spans
+
+    def _split_chars(self, text: str) -> List[TextChunk]:
+        breaks = [match.end() for match in _BREAK_PATTERN.finditer(text)]
+        chunks = [
+            TextChunk(text[start:end], start, end, None)
+            for start, end in self._spans(len(text), breaks)
+        ]
+        if self.count_tokens and chunks:
+            encoded = get_encoding(self.encoding_name).encode_ordinary_batch(
+                [chunk.text for chunk in chunks]
+            )
+            chunks = [chunk._replace(token_count=len(tokens)) for chunk, tokens in zip(chunks, encoded)]
+        return chunks
+
+    def _split_tokens(self, text: str) -> List[TextChunk]:
+        encoding = get_encoding(self.encoding_name)
+        tokens = encoding.encode_ordinary(text)
+        _, offsets = encoding.decode_with_offsets(tokens)
+        # Token boundaries that begin a word: the token starts with or follows whitespace
+        breaks = [
+            index
+            for index, offset in enumerate(offsets)
+            if index > 0 and offset < len(text)
+            and (text[offset].isspace() or text[offset - 1].isspace())
+        ]
+        offsets.append(len(text))
+        return [
+            TextChunk(text[offsets[start]:offsets[end]], offsets[start], offsets[end], end - start)
+            for start, end in self._spans(len(tokens), breaks)
+        ]
+
+    def split(self, text: str) -> List[TextChunk]:
+        """Split text into overlapping chunks with spans and token counts.
+
         Args:
             text: Text to split into chunks
-            
+
         Returns:
-            List of text chunks
+            List of TextChunk; token_count is None in "chars" mode when
+            count_tokens is disabled
         """
         if not text:
             return []
-            
-        chunks = []
-        start = 0
-        text_length = len(text)
-        
-        while start < text_length:
-            end = start + self.chunk_size
-            
-            # Adjust end to not split words
-            if end < text_length:
-                # Look for the last space before the end
-                while end > start and text[end] != ' ':
-                    end -= 1
-                if end == start:  # No space found
-                    end = start + self.chunk_size  # Just cut at max length
-            
-            chunk = text[start:end].strip()
-            if chunk:  # Only add non-empty chunks
-                chunks.append(chunk)
-                logger.debug(f"Created chunk of size {len(chunk)}")
-            
-            # Move start position for next chunk, accounting for overlap
-            start = end - self.overlap
-            
+
+        if self.length_unit == "tokens":
+            chunks = self._split_tokens(text)
+        else:
+            chunks = self._split_chars(text)
+
+        chunks = [chunk for chunk in chunks if chunk.text.strip()]
         logger.info(f"Split text into {len(chunks)} chunks")
         return chunks
-        
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Split text into overlapping chunks.
+
+        Args:
+            text: Text to split into chunks
+
+        Returns:
+            List of text chunks
+        """
+        return [chunk.text.strip() for chunk in self.split(text)]
+
     def chunk_documents(self, documents: List[dict], text_field: str) -> List[dict]:
         """Split documents into chunks based on a text field.
-        
+
         Args:
             documents: List of document dictionaries
             text_field: Field containing text to chunk
-            
+
         Returns:
             List of chunked documents with additional metadata
         """
         chunked_docs = []
-        
+
         for doc in documents:
             if text_field not in doc:
                 logger.warning(f"Document missing {text_field} field, skipping")
                 continue
-                
+
             text = doc[text_field]
-            chunks = self.chunk_text(text)
-            
+            chunks = self.split(text)
+
             for i, chunk in enumerate(chunks):
                 # Create new doc with chunk and metadata
+                chunk_text = chunk.text.strip()
                 chunked_doc = doc.copy()
-                chunked_doc[text_field] = chunk
+                chunked_doc[text_field] = chunk_text
                 chunked_doc['chunk_metadata'] = {
                     'chunk_index': i,
                     'total_chunks': len(chunks),
                     'original_length': len(text),
-                    'chunk_length': len(chunk)
+                    'chunk_length': len(chunk_text),
+                    'start_offset': chunk.start,
+                    'end_offset': chunk.end,
+                    'token_count': chunk.token_count
                 }
                 chunked_docs.append(chunked_doc)
-                
+
         return chunked_docs
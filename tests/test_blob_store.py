@@ -0,0 +1,60 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from src.services.blob_store import BlobStore
+
+HASH = "abcdef" + "0" * 58
+
+def make_temp(store, data=b"data"):
+    path = store.temp_dir / f"temp_{time.monotonic_ns()}"
+    path.write_bytes(data)
+    return path
+
+def test_path_for_shards_by_hash_prefix(tmp_path):
+    store = BlobStore(str(tmp_path))
+
+    assert store.path_for(HASH, ".PDF") == tmp_path / "ab" / "cd" / f"{HASH}.pdf"
+    assert BlobStore(str(tmp_path), fanout=1).path_for(HASH) == tmp_path / "ab" / HASH
+
+def test_put_moves_the_file_into_the_store(tmp_path):
+    store = BlobStore(str(tmp_path))
+    source = make_temp(store)
+
+    target = store.put(source, HASH, ".txt")
+    assert target == store.path_for(HASH, ".txt")
+    assert target.read_bytes() == b"data"
+    assert not source.exists()
+    assert store.contains(str(target))
+    assert not store.contains(str(tmp_path.parent / "elsewhere.txt"))
+
+def test_put_keeps_a_single_copy_and_refreshes_mtime(tmp_path):
+    store = BlobStore(str(tmp_path))
+    target = store.put(make_temp(store), HASH, ".txt")
+    os.utime(target, (0, 0))
+
+    duplicate = make_temp(store)
+    assert store.put(duplicate, HASH, ".txt") == target
+    assert not duplicate.exists()
+    assert target.stat().st_mtime > 0
+    assert [len(blobs) for blobs in store.iter_shards()] == [1]
+
+def test_delete_prunes_empty_shards(tmp_path):
+    store = BlobStore(str(tmp_path))
+    target = store.put(make_temp(store), HASH, ".txt")
+
+    store.delete(target)
+    assert not (tmp_path / "ab").exists()
+    assert store.temp_dir.exists()
+
+def test_remove_stale_temp_files(tmp_path):
+    store = BlobStore(str(tmp_path))
+    stale = make_temp(store)
+    os.utime(stale, (0, 0))
+    fresh = make_temp(store)
+
+    assert store.remove_stale_temp_files(max_age=3600) == 1
+    assert not stale.exists() and fresh.exists()
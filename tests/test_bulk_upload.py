@@ -0,0 +1,54 @@
+import hashlib
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from src.services.bulk_upload import UploadTooLarge, is_archive, iter_archive_members, stream_to_disk
+
+def test_stream_to_disk_hashes_while_copying(tmp_path):
+    data = b"x" * 10000
+    path, digest, size = stream_to_disk(io.BytesIO(data), tmp_path, block_size=1024)
+
+    assert path.parent == tmp_path
+    assert path.read_bytes() == data
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert size == len(data)
+
+def test_stream_to_disk_rejects_oversized_streams(tmp_path):
+    with pytest.raises(UploadTooLarge):
+        stream_to_disk(io.BytesIO(b"x" * 5000), tmp_path, max_size=4096, block_size=1024)
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_is_archive():
+    assert is_archive("docs.ZIP") and is_archive("docs.tar.gz") and is_archive("docs.tgz")
+    assert not is_archive("report.pdf")
+
+def read_members(filename, data):
+    return [(name, member.read()) for name, member in iter_archive_members(filename, io.BytesIO(data))]
+
+def test_iter_zip_members_skips_directories_and_hidden_files():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("docs/", "")
+        archive.writestr("docs/a.txt", "a")
+        archive.writestr("docs/.hidden", "h")
+        archive.writestr("__MACOSX/docs/._a.txt", "m")
+        archive.writestr("b.md", "b")
+
+    assert read_members("upload.zip", buffer.getvalue()) == [("a.txt", b"a"), ("b.md", b"b")]
+
+def test_iter_tar_members_streams_regular_files():
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in (("nested/dir/a.txt", b"a"), ("b.csv", b"b")):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+        directory = tarfile.TarInfo("nested")
+        directory.type = tarfile.DIRTYPE
+        archive.addfile(directory)
+
+    assert read_members("upload.tar.gz", buffer.getvalue()) == [("a.txt", b"a"), ("b.csv", b"b")]
@@ -0,0 +1,74 @@
+import json
+import pickle
+import zlib
+from datetime import date, datetime
+
+import pytest
+from pydantic import BaseModel
+
+from src.models.document import ProcessingProgress
+from src.rag.cache_codec import CODEC_JSON, CODEC_JSON_ZLIB, CODEC_RAW, decode_value, encode_value
+
+def roundtrip(value, threshold=1024):
+    data, codec, _ = encode_value(value, threshold)
+    return decode_value(data, codec)
+
+def test_roundtrip_plain_values():
+    value = {"text": "épico", "count": 3, "ratio": 0.5, "ok": True, "none": None, "items": [1, "a"]}
+    assert roundtrip(value) == value
+
+def test_roundtrip_non_json_types():
+    value = {
+        "pages": [("content", {"page": 1})],
+        "when": datetime(2024, 5, 1, 12, 30),
+        "day": date(2024, 5, 1),
+        "raw": b"\x00\xff",
+        "tags": {"a", "b"},
+        1: "int key",
+        "nested": {"$t": "not a tag"}
+    }
+    assert roundtrip(value) == value
+
+def test_roundtrip_app_model():
+    progress = ProcessingProgress(stage="embed", chunks_embedded=4, started_at=datetime(2024, 5, 1))
+    restored = roundtrip({"data": [progress]})
+    assert restored["data"][0] == progress
+    assert isinstance(restored["data"][0], ProcessingProgress)
+
+def test_compression_above_threshold():
+    value = "palavra " * 1000
+    data, codec, raw_size = encode_value(value, compression_threshold=100)
+    assert codec == CODEC_JSON_ZLIB
+    assert len(data) < raw_size
+    assert decode_value(data, codec) == value
+
+    data, codec, _ = encode_value("short", compression_threshold=100)
+    assert codec == CODEC_JSON
+
+def test_raw_codec_returns_value_unchanged():
+    assert decode_value({"a": 1}, CODEC_RAW) == {"a": 1}
+
+def test_pickle_entries_are_not_loaded():
+    payload = pickle.dumps({"a": 1})
+    for codec in ("pickle", "pickle+zlib", "pickle+zstd"):
+        with pytest.raises(ValueError):
+            decode_value(payload, codec)
+
+def test_models_outside_the_app_are_rejected():
+    class External(BaseModel):
+        x: int = 1
+
+    with pytest.raises(TypeError):
+        encode_value(External())
+
+    forged = {"$t": "model", "cls": "os:system", "v": "echo hi"}
+    with pytest.raises(ValueError):
+        decode_value(json.dumps(forged).encode(), CODEC_JSON)
+
+    not_a_model = {"$t": "model", "cls": "src.rag.cache_codec:encode_value", "v": {}}
+    with pytest.raises(ValueError):
+        decode_value(zlib.compress(json.dumps(not_a_model).encode()), CODEC_JSON_ZLIB)
+
+def test_unsupported_types_raise():
+    with pytest.raises(TypeError):
+        encode_value(object())
@@ -0,0 +1,77 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from src.rag.cache_codec import encode_value
+from src.rag.cache_manager import BaseCacheManager, generate_cache_key
+
+def make_doc(key, value, expires_in, compute_time=2.0):
+    data, codec, raw_size = encode_value(value)
+    return {
+        "key": key,
+        "value": data,
+        "codec": codec,
+        "raw_size": raw_size,
+        "compute_time": compute_time,
+        "expires_at": datetime.utcnow() + timedelta(seconds=expires_in)
+    }
+
+def test_generate_cache_key_is_stable_and_generation_scoped():
+    key = generate_cache_key("epics", 1, {"b": 2, "a": 1})
+    assert key == generate_cache_key("epics", 1, {"a": 1, "b": 2})
+    assert key != generate_cache_key("epics", 2, {"a": 1, "b": 2})
+
+def test_promoted_entry_keeps_mongo_expiry():
+    manager = BaseCacheManager(local_ttl=60)
+    manager._promote("ns", make_doc("ns:k", {"v": 1}, expires_in=3 * 3600))
+
+    entry = manager.local_cache.get("ns:k")
+    assert entry.value == {"v": 1}
+    assert entry.expires_at > time.time() + 3 * 3600 - 5
+    assert entry.evict_at <= time.time() + 60
+
+def test_local_ttl_does_not_trigger_early_refresh():
+    # Hours away from the Mongo expiry: XFetch must not fire every minute
+    manager = BaseCacheManager(local_ttl=60, early_refresh_beta=1.0)
+    manager._promote("ns", make_doc("ns:k", "value", expires_in=3 * 3600, compute_time=2.0))
+    entry = manager.local_cache.get("ns:k")
+
+    assert not any(manager._should_refresh_early(entry) for _ in range(1000))
+
+def test_early_refresh_near_expiry():
+    manager = BaseCacheManager(early_refresh_beta=1.0)
+    manager._promote("ns", make_doc("ns:k", "value", expires_in=1, compute_time=30.0))
+    entry = manager.local_cache.get("ns:k")
+
+    assert any(manager._should_refresh_early(entry) for _ in range(100))
+
+def test_expired_document_is_not_promoted():
+    manager = BaseCacheManager()
+    assert manager._promote("ns", make_doc("ns:k", "value", expires_in=-1)) is None
+    assert manager._promote("ns", None) is None
+
+def test_optional_cache_failure_is_remembered(monkeypatch):
+    from src.rag import cache_manager
+
+    calls = []
+
+    def unreachable():
+        calls.append(1)
+        raise ConnectionError("mongo down")
+
+    clock = [1000.0]
+    monkeypatch.setattr(cache_manager, "get_cache_manager", unreachable)
+    monkeypatch.setattr(cache_manager.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(cache_manager, "_optional_cache_retry_at", 0.0)
+    retry_interval = cache_manager.get_settings().CACHE_RETRY_INTERVAL
+
+    assert cache_manager.get_optional_cache_manager() is None
+    assert cache_manager.get_optional_cache_manager() is None
+    assert len(calls) == 1
+
+    clock[0] += retry_interval
+    assert cache_manager.get_optional_cache_manager() is None
+    assert len(calls) == 2
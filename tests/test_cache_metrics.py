@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+from src.rag.cache_metrics import CacheMetrics, LatencyHistogram, bucket_label
+
+@pytest.fixture
+def metrics():
+    metrics = CacheMetrics()
+    metrics.drain()
+    return metrics
+
+def test_bucket_label():
+    assert bucket_label(2.5) == "le_2_5"
+    assert bucket_label(10) == "le_10"
+    assert bucket_label(None) == "le_inf"
+
+def test_latency_histogram_buckets():
+    histogram = LatencyHistogram()
+    for latency in (0.2, 3, 5000):
+        histogram.observe(latency)
+    data = histogram.to_dict()
+
+    assert data["count"] == 3
+    assert data["max_ms"] == 5000
+    assert data["buckets"]["le_0_5"] == 1
+    assert data["buckets"]["le_5"] == 1
+    assert data["buckets"]["le_inf"] == 1
+
+def test_snapshot_hit_rate(metrics):
+    metrics.increment("test.snapshot", "memory_hits")
+    metrics.increment("test.snapshot", "hits")
+    metrics.increment("test.snapshot", "misses", 2)
+
+    namespace = metrics.snapshot()["namespaces"]["test.snapshot"]
+    assert namespace["hit_rate"] == 0.5
+
+def test_drain_returns_pending_and_resets(metrics):
+    metrics.increment("test.drain", "misses", 3)
+    metrics.observe_get("test.drain", 1.5)
+
+    assert len(metrics.drain()) == 1
+    assert metrics.drain() == []
+    assert metrics.flush_due() is False
+
+def test_flush_due_after_interval(metrics, monkeypatch):
+    monkeypatch.setattr(metrics, "_last_flush", metrics._last_flush - metrics.flush_interval)
+    assert metrics.flush_due() is True
@@ -0,0 +1,88 @@
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from src.rag import ocr
+from src.rag.document_processor import _process_file_in_worker, _result_with_ocr
+from src.rag.pdf_extractor import OCRRequired
+
+class InlineExecutor:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        self.calls.append((fn, args))
+        future = Future()
+        future.set_result(["chunk"])
+        return future
+
+class FakeOCREngine:
+    def __init__(self):
+        self.requests = []
+
+    def ocr_pages(self, file_path, file_hash, pages):
+        self.requests.append((file_path, file_hash, pages))
+        return {page: f"page {page}" for page in pages}
+
+def test_scanned_pages_are_recognized_in_the_parent(monkeypatch):
+    engine = FakeOCREngine()
+    monkeypatch.setattr(ocr, "get_ocr_engine", lambda: engine)
+    failed = Future()
+    failed.set_exception(OCRRequired("abc", [2]))
+    executor = InlineExecutor()
+
+    chunks = _result_with_ocr(executor, failed, object, (), "file.pdf", None, "original.pdf")
+
+    assert chunks == ["chunk"]
+    assert engine.requests == [("file.pdf", "abc", [2])]
+    assert executor.calls == [
+        (_process_file_in_worker, (object, (), "file.pdf", "abc", "original.pdf", {2: "page 2"}))
+    ]
+
+def test_results_without_ocr_are_returned_as_is():
+    done = Future()
+    done.set_result(["chunk"])
+    executor = InlineExecutor()
+
+    assert _result_with_ocr(executor, done, object, (), "file.txt") == ["chunk"]
+    assert executor.calls == []
+
+def test_text_is_normalized_without_the_cache(tmp_path, monkeypatch):
+    from src.rag import document_processor
+    from src.rag.document_processor import DocumentProcessor
+
+    monkeypatch.setattr(document_processor, "get_optional_cache_manager", lambda: None)
+    path = tmp_path / "notes.md"
+    path.write_bytes(b"linha 1\r\nlinha 2\rfim\x00")
+
+    processor = DocumentProcessor(use_text_cache=True)
+    (chunk,) = processor.process_file(str(path))
+    assert chunk["content"] == "linha 1\nlinha 2\nfim"
+
+def test_make_chunk_id_is_deterministic():
+    from src.rag.document_processor import make_chunk_id
+
+    chunk_id = make_chunk_id("abc", 3, "size=1000;overlap=200")
+    assert chunk_id == make_chunk_id("abc", 3, "size=1000;overlap=200")
+    assert len(chunk_id) == 64
+    assert chunk_id != make_chunk_id("abc", 4, "size=1000;overlap=200")
+    assert chunk_id != make_chunk_id("abd", 3, "size=1000;overlap=200")
+    assert chunk_id != make_chunk_id("abc", 3, "size=500;overlap=200")
+
+def test_reprocessing_yields_the_same_chunk_ids(tmp_path, monkeypatch):
+    from src.rag import document_processor
+    from src.rag.document_processor import DocumentProcessor
+
+    monkeypatch.setattr(document_processor, "get_optional_cache_manager", lambda: None)
+    path = tmp_path / "notes.txt"
+    path.write_text("\n\n".join(f"parágrafo {index} " * 20 for index in range(30)))
+
+    first = DocumentProcessor(chunk_size=200, chunk_overlap=20).process_file(str(path))
+    second = DocumentProcessor(chunk_size=200, chunk_overlap=20).process_file(str(path))
+    resized = DocumentProcessor(chunk_size=300, chunk_overlap=20).process_file(str(path))
+
+    assert [chunk["id"] for chunk in first] == [chunk["id"] for chunk in second]
+    assert len({chunk["id"] for chunk in first}) == len(first)
+    assert not {chunk["id"] for chunk in first} & {chunk["id"] for chunk in resized}
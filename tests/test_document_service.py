@@ -0,0 +1,66 @@
+import io
+import itertools
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo.errors import BulkWriteError
+
+from src.services.blob_store import BlobStore
+from src.services.document_service import DocumentService
+
+class FakeCollection:
+    def __init__(self, write_errors=()):
+        self.write_errors = list(write_errors)
+        self.inserted = []
+        self._ids = itertools.count(1)
+
+    def find(self, query, projection=None):
+        return []
+
+    def insert_many(self, docs, ordered=True):
+        failed = {error["index"] for error in self.write_errors}
+        for index, doc in enumerate(docs):
+            doc["_id"] = next(self._ids)
+            if index not in failed:
+                self.inserted.append(doc)
+        if self.write_errors:
+            raise BulkWriteError({"writeErrors": self.write_errors})
+
+    def insert_one(self, doc):
+        self.inserted.append(doc)
+
+class FakeJobQueue:
+    def __init__(self):
+        self.items = []
+
+    def enqueue_many(self, job_type, items, tenant=None):
+        self.items.extend(items)
+        return [str(index) for index, _ in enumerate(items)]
+
+def make_service(tmp_path, write_errors=()):
+    service = object.__new__(DocumentService)
+    service.processing_collection = FakeCollection(write_errors)
+    service.batch_collection = FakeCollection()
+    service.job_queue = FakeJobQueue()
+    service.blob_store = BlobStore(str(tmp_path))
+    return service
+
+def uploads():
+    return [("a.txt", io.BytesIO(b"a")), ("b.txt", io.BytesIO(b"b"))]
+
+def test_lost_duplicate_races_are_skipped(tmp_path):
+    service = make_service(tmp_path, [{"index": 1, "code": 11000}])
+    batch = service.create_batch(uploads())
+
+    assert [document["filename"] for document in batch["documents"]] == ["a.txt"]
+    assert batch["skipped"] == [{"filename": "b.txt", "reason": "duplicate"}]
+    assert len(service.job_queue.items) == 1
+
+def test_other_write_errors_are_raised(tmp_path):
+    service = make_service(tmp_path, [{"index": 0, "code": 11000}, {"index": 1, "code": 121}])
+
+    with pytest.raises(BulkWriteError):
+        service.create_batch(uploads())
+    assert service.job_queue.items == []
@@ -0,0 +1,141 @@
+import queue
+import threading
+import time
+import types
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pymongo")
+
+from src.rag import cache_manager, embeddings_manager
+from src.rag.embeddings_manager import EmbeddingsManager, prefetch_batches
+from src.rag.ingestion_pipeline import IngestionPipeline, IngestionTask, StageMetrics
+
+class FakeCollection:
+    def __init__(self):
+        self.bulk_calls = []
+        self.inserted = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_calls.append((operations, ordered))
+
+    def insert_many(self, docs):
+        ids = [f"generated-{len(self.inserted) + i}" for i in range(len(docs))]
+        self.inserted.extend(docs)
+        return types.SimpleNamespace(inserted_ids=ids)
+
+class FakeCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, namespace):
+        self.invalidated.append(namespace)
+        return 1
+
+def make_manager():
+    manager = object.__new__(EmbeddingsManager)
+    manager.collection = FakeCollection()
+    manager.embeddings = types.SimpleNamespace(
+        embed_documents=lambda texts: [[float(len(text))] for text in texts]
+    )
+    return manager
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(cache_manager, "get_cache_manager", lambda: cache)
+    return cache
+
+def wait_for_prefetch_threads(timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not any(thread.name == "embeddings-prefetch" for thread in threading.enumerate()):
+            return True
+        time.sleep(0.01)
+    return False
+
+@pytest.mark.parametrize("count, expected", [
+    (6, [3, 3]),
+    (7, [3, 3, 1]),
+    (0, []),
+])
+def test_prefetch_batch_boundaries(count, expected):
+    batches = list(prefetch_batches(iter(range(count)), 3))
+
+    assert [len(batch) for batch in batches] == expected
+    assert [item for batch in batches for item in batch] == list(range(count))
+
+def test_prefetch_propagates_source_errors():
+    def source():
+        yield from range(3)
+        raise ValueError("falha no parsing")
+
+    batches = prefetch_batches(source(), 2)
+
+    assert next(batches) == [0, 1]
+    with pytest.raises(ValueError, match="falha no parsing"):
+        next(batches)
+    assert wait_for_prefetch_threads()
+
+def test_prefetch_stops_producer_when_consumer_exits():
+    consumed = []
+
+    def source():
+        while True:
+            consumed.append(len(consumed))
+            yield consumed[-1]
+
+    batches = prefetch_batches(source(), 2, max_pending=1)
+    assert next(batches) == [0, 1]
+    batches.close()
+
+    assert wait_for_prefetch_threads()
+    # Lote consumido, lote na fila e o que aguardava vaga na fila
+    assert len(consumed) <= 2 + 2 + 2
+    settled = len(consumed)
+    time.sleep(0.05)
+    assert len(consumed) == settled
+
+def test_insert_documents_upserts_when_ids_are_deterministic(monkeypatch):
+    monkeypatch.setattr(embeddings_manager, "ReplaceOne", lambda flt, doc, upsert: (flt, doc, upsert))
+    manager = make_manager()
+    docs = [{"_id": "a", "content": "x"}, {"_id": "b", "content": "y"}]
+
+    assert manager.insert_documents(docs) == ["a", "b"]
+    operations, ordered = manager.collection.bulk_calls[0]
+    assert operations == [({"_id": "a"}, docs[0], True), ({"_id": "b"}, docs[1], True)]
+    assert ordered is False
+    assert manager.collection.inserted == []
+
+def test_insert_documents_falls_back_to_insert_many():
+    manager = make_manager()
+    docs = [{"_id": "a", "content": "x"}, {"content": "y"}]
+
+    assert manager.insert_documents(docs) == ["generated-0", "generated-1"]
+    assert manager.collection.bulk_calls == []
+    assert manager.insert_documents([]) == []
+
+def test_store_embeddings_invalidates_once(fake_cache):
+    manager = make_manager()
+    chunks = [{"content": f"chunk {i}", "metadata": {"i": i}} for i in range(5)]
+
+    ids = manager.store_embeddings(iter(chunks), batch_size=2)
+
+    assert len(ids) == 5
+    assert len(manager.collection.inserted) == 5
+    assert fake_cache.invalidated == ["tag:embeddings"]
+
+def test_pipeline_invalidates_once_per_finished_file(fake_cache):
+    pipeline = object.__new__(IngestionPipeline)
+    pipeline.embeddings_manager = make_manager()
+    pipeline.metrics = {"write": StageMetrics("write", 1, queue.Queue())}
+    task = IngestionTask("file.txt", None)
+    task.parsed(batches_total=2, chunks_total=2, bytes_parsed=0)
+
+    pipeline._write_group([(task, 0, [{"content": "a"}])])
+    assert fake_cache.invalidated == []
+
+    pipeline._write_group([(task, 1, [{"content": "b"}])])
+    assert task.done
+    assert fake_cache.invalidated == ["tag:embeddings"]
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+from src.rag import ingestion_pipeline
+from src.rag.ingestion_pipeline import IngestionTask
+
+def test_progress_before_parsing():
+    progress = IngestionTask("file.txt", None).progress()
+
+    assert progress["chunks_total"] is None
+    assert progress["chunks_embedded"] == 0
+    assert progress["eta_seconds"] is None
+
+def test_eta_uses_observed_throughput(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(ingestion_pipeline.time, "monotonic", lambda: clock[0])
+    task = IngestionTask("file.txt", None)
+    task.parsed(batches_total=4, chunks_total=40, bytes_parsed=1234)
+
+    clock[0] = 110.0
+    task.batch_written(0, [f"id{i}" for i in range(10)])
+    progress = task.progress()
+
+    assert progress["chunks_embedded"] == 10
+    assert progress["bytes_parsed"] == 1234
+    assert progress["eta_seconds"] == 30.0
+
+def test_resumed_batches_do_not_count_as_throughput(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(ingestion_pipeline.time, "monotonic", lambda: clock[0])
+    task = IngestionTask("file.txt", None, skip_batches={0})
+    task.parsed(batches_total=2, chunks_total=20, bytes_parsed=0)
+    task.batch_written(0, [f"id{i}" for i in range(10)], resumed=True)
+
+    clock[0] = 5.0
+    assert task.progress()["eta_seconds"] is None
+    task.batch_written(1, [f"id{i}" for i in range(10, 20)])
+
+    assert task.progress()["eta_seconds"] == 0.0
+    assert task.future.result() == [f"id{i}" for i in range(20)]
+
+def test_progress_callback_receives_batch_index():
+    events = []
+    task = IngestionTask("file.txt", None, on_progress=lambda index, progress: events.append((index, progress["chunks_embedded"])))
+    task.parsed(batches_total=1, chunks_total=2, bytes_parsed=0)
+    task.batch_written(0, ["a", "b"])
+
+    assert events == [(None, 0), (0, 2)]
+
+def test_stage_timings_are_rounded():
+    task = IngestionTask("file.txt", None)
+    task.add_time("parse", 0.12345)
+
+    assert task.progress()["stage_timings"] == {"parse": 0.123, "embed": 0.0, "write": 0.0}
@@ -0,0 +1,324 @@
+import itertools
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from src.config.settings import get_settings
+from src.models.job import JobLane, JobStatus
+from src.services.job_queue import JobQueue, lane_for_size, parse_tenant_weights
+
+class FakeSchedulerCollection:
+    """Emulates the scheduler documents and the update pipeline used by _virtual_finish."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    def find_one_and_update(self, query, pipeline, upsert=False, return_document=None):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        lane_clock = pipeline[0]["$set"]["last_start"]["$max"][1]
+        doc["last_start"] = max(doc.get("last_finish", lane_clock), lane_clock)
+        cost_over_weight = pipeline[1]["$set"]["last_finish"]["$add"][1]
+        doc["last_finish"] = doc["last_start"] + cost_over_weight
+        return dict(doc)
+
+    def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError(f"duplicate _id {doc['_id']}")
+        self.docs[doc["_id"]] = dict(doc)
+
+    def delete_one(self, query):
+        self.docs.pop(query["_id"], None)
+
+    def update_one(self, query, update, upsert=False):
+        doc = self.docs.setdefault(query["_id"], {"_id": query["_id"]})
+        for field, value in update["$max"].items():
+            doc[field] = max(doc.get(field, value), value)
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, option) for option in condition):
+                return False
+            continue
+        value = doc.get(field)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$lte" and (value is None or value > operand):
+                return False
+            if op == "$type" and not isinstance(value, str):
+                return False
+    return True
+
+class FakeJobCollection:
+    """In-memory collection with the operators JobQueue uses and a unique active_key."""
+
+    def __init__(self):
+        self.docs = {}
+        self._ids = itertools.count(1)
+
+    def _check_unique(self, doc):
+        key = doc.get("active_key")
+        if isinstance(key, str) and any(other.get("active_key") == key for other in self.docs.values()):
+            raise DuplicateKeyError(f"duplicate active_key {key}")
+
+    def find_one(self, query, projection=None):
+        return next((dict(doc) for doc in self.docs.values() if matches(doc, query)), None)
+
+    def find(self, query, projection=None):
+        return [dict(doc) for doc in self.docs.values() if matches(doc, query)]
+
+    def insert_one(self, doc):
+        self._check_unique(doc)
+        doc.setdefault("_id", next(self._ids))
+        self.docs[doc["_id"]] = dict(doc)
+        return types.SimpleNamespace(inserted_id=doc["_id"])
+
+    def insert_many(self, docs, ordered=True):
+        errors, inserted = [], []
+        for index, doc in enumerate(docs):
+            try:
+                inserted.append(self.insert_one(doc).inserted_id)
+            except DuplicateKeyError:
+                errors.append({"index": index, "code": 11000})
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+        return types.SimpleNamespace(inserted_ids=inserted)
+
+    def _apply(self, doc, update):
+        for field, value in update.get("$set", {}).items():
+            doc[field] = value
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+
+    def find_one_and_update(self, query, update, sort=None, return_document=None):
+        candidates = [doc for doc in self.docs.values() if matches(doc, query)]
+        for field, _ in reversed(sort or []):
+            candidates.sort(key=lambda doc: doc[field])
+        if not candidates:
+            return None
+        self._apply(candidates[0], update)
+        return dict(candidates[0])
+
+    def update_one(self, query, update):
+        doc = self.find_one(query)
+        if doc is not None:
+            self._apply(self.docs[doc["_id"]], update)
+        return types.SimpleNamespace(modified_count=int(doc is not None))
+
+    def update_many(self, query, update):
+        matched = [doc for doc in self.docs.values() if matches(doc, query)]
+        for doc in matched:
+            self._apply(doc, update)
+        return types.SimpleNamespace(modified_count=len(matched))
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = dict(doc)
+
+    def delete_one(self, query):
+        doc = self.find_one(query)
+        if doc is not None:
+            del self.docs[doc["_id"]]
+
+def make_queue(weights=""):
+    queue = object.__new__(JobQueue)
+    queue.tenant_weights = parse_tenant_weights(weights)
+    queue.scheduler_collection = FakeSchedulerCollection()
+    queue.collection = FakeJobCollection()
+    queue.dead_letter_collection = FakeJobCollection()
+    queue.visibility_timeout = 300
+    queue.max_attempts = 3
+    queue.retry_base_delay = 10
+    queue.retry_max_delay = 60
+    return queue
+
+def test_lane_for_size_uses_thresholds():
+    settings = get_settings()
+    assert lane_for_size(0) == JobLane.FAST.value
+    assert lane_for_size(settings.JOB_FAST_LANE_MAX_BYTES) == JobLane.FAST.value
+    assert lane_for_size(settings.JOB_FAST_LANE_MAX_BYTES + 1) == JobLane.STANDARD.value
+    assert lane_for_size(settings.JOB_STANDARD_LANE_MAX_BYTES + 1) == JobLane.BULK.value
+
+def test_parse_tenant_weights_skips_invalid_items():
+    assert parse_tenant_weights("a:2, b:0, c:x,,") == {"a": 2.0, "b": 0.01}
+
+def test_virtual_finish_accumulates_per_tenant():
+    queue = make_queue()
+    assert [queue._virtual_finish("fast", "a", 1.0) for _ in range(3)] == [1.0, 2.0, 3.0]
+    # Another tenant starts from the lane clock, not behind tenant a's backlog
+    assert queue._virtual_finish("fast", "b", 1.0) == 1.0
+
+def test_virtual_finish_scales_by_weight():
+    queue = make_queue("heavy:2")
+    assert queue._virtual_finish("fast", "heavy", 1.0) == 0.5
+    assert queue._virtual_finish("fast", "heavy", 1.0) == 1.0
+
+def test_idle_tenant_starts_at_the_lane_clock():
+    queue = make_queue()
+    queue._virtual_finish("fast", "a", 1.0)
+    queue.scheduler_collection.docs["lane:fast"] = {"virtual_time": 10.0}
+
+    assert queue._virtual_finish("fast", "a", 1.0) == 11.0
+
+def test_enqueue_deduplicates_active_keys():
+    queue = make_queue()
+    job_id = queue.enqueue("process", {"n": 1}, key="doc-1")
+
+    assert queue.enqueue("process", {"n": 2}, key="doc-1") == job_id
+    assert len(queue.collection.docs) == 1
+    # The duplicate does not advance the tenant's clock
+    assert queue.scheduler_collection.docs["tenant:standard:default"]["last_finish"] == 1.0
+
+def test_enqueue_returns_the_job_that_won_an_insert_race():
+    queue = make_queue()
+    winner = queue.enqueue("process", {}, key="doc-1")
+    lookups = iter([None])
+    real_find_one = queue.collection.find_one
+    queue.collection.find_one = lambda query, projection=None: next(lookups, real_find_one(query, projection))
+
+    assert queue.enqueue("process", {}, key="doc-1") == winner
+
+def test_key_can_be_enqueued_again_after_completion():
+    queue = make_queue()
+    first = queue.enqueue("process", {}, key="doc-1")
+    job = queue.claim("w1", ["process"])
+    assert queue.complete(job, "w1") is True
+
+    assert queue.enqueue("process", {}, key="doc-1") != first
+
+def test_enqueue_many_skips_active_keys_and_lost_races():
+    queue = make_queue()
+    queue.enqueue("process", {}, key="a")
+    ids = queue.enqueue_many("process", [{"payload": {}, "key": key} for key in ("a", "b")])
+    assert len(ids) == 1
+
+    # Key "c" is inserted by another request after the active-key lookup
+    queue.collection.insert_one({"active_key": "c", "status": "queued"})
+    queue.collection.find = lambda query, projection=None: []
+    ids = queue.enqueue_many("process", [{"payload": {}, "key": key} for key in ("c", "d")])
+    assert len(ids) == 1
+    assert {doc.get("active_key") for doc in queue.collection.docs.values()} == {"a", "b", "c", "d"}
+
+def test_enqueue_many_reraises_other_write_errors():
+    queue = make_queue()
+
+    def failing_insert_many(docs, ordered=True):
+        raise BulkWriteError({"writeErrors": [{"index": 0, "code": 121}]})
+
+    queue.collection.insert_many = failing_insert_many
+    with pytest.raises(BulkWriteError):
+        queue.enqueue_many("process", [{"payload": {}}])
+
+def test_claim_takes_the_lowest_virtual_finish_and_leases_it():
+    queue = make_queue()
+    for _ in range(3):
+        queue.enqueue("process", {"tenant": "a"}, tenant="a")
+    fair = queue.enqueue("process", {"tenant": "b"}, tenant="b")
+    first = queue.claim("w1", ["process"])
+    second = queue.claim("w1", ["process"])
+
+    assert first["payload"] == {"tenant": "a"}
+    assert str(second["_id"]) == fair
+    assert second["status"] == JobStatus.RUNNING.value
+    assert second["lease_owner"] == "w1" and second["attempts"] == 1
+    assert second["lease_expires_at"] > datetime.utcnow() + timedelta(seconds=290)
+    assert queue.scheduler_collection.docs["lane:standard"]["virtual_time"] == 0.0
+
+def test_claim_skips_future_jobs_and_other_types():
+    queue = make_queue()
+    queue.enqueue("process", {}, delay=60)
+    queue.enqueue("gc", {})
+
+    assert queue.claim("w1", ["process"]) is None
+
+def test_expired_lease_is_claimed_by_another_worker():
+    queue = make_queue()
+    queue.enqueue("process", {})
+    job = queue.claim("w1", ["process"])
+    queue.collection.docs[job["_id"]]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+    reclaimed = queue.claim("w2", ["process"])
+    assert reclaimed["lease_owner"] == "w2" and reclaimed["attempts"] == 2
+    # The first worker lost the lease: its completion is rejected
+    assert queue.complete(job, "w1") is False
+
+def test_extend_leases_only_renews_owned_jobs():
+    queue = make_queue()
+    queue.enqueue("process", {})
+    job = queue.claim("w1", ["process"])
+    doc = queue.collection.docs[job["_id"]]
+    doc["lease_expires_at"] = datetime.utcnow()
+
+    assert queue.extend_leases("w2", [job["_id"]]) == 0
+    assert queue.extend_leases("w1", [job["_id"]]) == 1
+    assert doc["lease_expires_at"] > datetime.utcnow() + timedelta(seconds=290)
+    assert queue.extend_leases("w1", []) == 0
+
+def test_fail_requeues_with_backoff():
+    queue = make_queue()
+    queue.enqueue("process", {}, key="doc-1")
+    job = queue.claim("w1", ["process"])
+
+    assert queue.fail(job, "w1", "boom") == JobStatus.QUEUED
+    doc = queue.collection.docs[job["_id"]]
+    assert doc["status"] == JobStatus.QUEUED.value
+    assert doc["last_error"] == "boom"
+    assert "lease_owner" not in doc and doc["active_key"] == "doc-1"
+    delay = (doc["run_at"] - datetime.utcnow()).total_seconds()
+    assert 4 <= delay <= 10
+
+def test_retry_delay_doubles_up_to_the_cap():
+    queue = make_queue()
+    for attempts, upper in ((1, 10), (2, 20), (3, 40), (10, 60)):
+        assert upper / 2 <= queue.retry_delay(attempts) <= upper
+
+def test_exhausted_job_is_dead_lettered():
+    queue = make_queue()
+    queue.enqueue("process", {}, key="doc-1", max_attempts=1)
+    job = queue.claim("w1", ["process"])
+
+    assert queue.fail(job, "w1", "boom") == JobStatus.DEAD
+    assert queue.collection.docs == {}
+    dead = queue.dead_letter_collection.docs[job["_id"]]
+    assert dead["status"] == JobStatus.DEAD.value and dead["last_error"] == "boom"
+    assert "active_key" not in dead and "lease_owner" not in dead
+    # The key is free again for a new upload
+    queue.enqueue("process", {}, key="doc-1")
+
+def test_enqueue_once_runs_a_key_only_once():
+    queue = make_queue()
+    job_id = queue.enqueue_once("gc", {}, key="gc:1")
+    job = queue.claim("w1", ["gc"])
+    queue.complete(job, "w1")
+
+    assert job_id is not None
+    assert queue.enqueue_once("gc", {}, key="gc:1") is None
+    assert queue.enqueue_once("gc", {}, key="gc:2") is not None
+
+def test_enqueue_once_releases_the_key_when_enqueue_fails():
+    queue = make_queue()
+
+    def failing_insert(doc):
+        raise RuntimeError("mongo down")
+
+    real_insert = queue.collection.insert_one
+    queue.collection.insert_one = failing_insert
+    with pytest.raises(RuntimeError):
+        queue.enqueue_once("gc", {}, key="gc:1")
+    queue.collection.insert_one = real_insert
+
+    assert queue.enqueue_once("gc", {}, key="gc:1") is not None
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("langchain_openai")
+
+from src.rag.llm_cache import MongoLLMCache
+
+class FakeCollection:
+    def __init__(self):
+        self.indexes = []
+
+    def create_index(self, *args, **kwargs):
+        self.indexes.append(args)
+
+    def find_one_and_update(self, *args, **kwargs):
+        return None
+
+    def bulk_write(self, operations, ordered=True):
+        self.indexes.append(("bulk_write", len(operations)))
+
+def test_constructor_does_not_touch_mongo():
+    # Unreachable server: only the first lookup may connect
+    cache = MongoLLMCache("mongodb://127.0.0.1:1")
+    assert cache._indexes_ready is False
+
+def test_indexes_created_once_on_first_lookup():
+    cache = MongoLLMCache("mongodb://127.0.0.1:1")
+    cache.collection = FakeCollection()
+
+    assert cache.lookup("prompt", "llm") is None
+    assert cache.lookup("prompt", "llm") is None
+    assert len(cache.collection.indexes) == 2
+    assert cache._indexes_ready is True
+
+def test_generate_key_depends_on_prompt_and_model():
+    key = MongoLLMCache._generate_key("prompt", "gpt-4")
+    assert key == MongoLLMCache._generate_key("prompt", "gpt-4")
+    assert key != MongoLLMCache._generate_key("prompt", "gpt-4o")
+    assert key != MongoLLMCache._generate_key("other", "gpt-4")
+
+def test_lookups_flush_metrics_without_writes():
+    cache = MongoLLMCache("mongodb://127.0.0.1:1")
+    cache.collection = FakeCollection()
+    cache.metrics_collection = FakeCollection()
+    cache.metrics._last_flush -= cache.metrics.flush_interval
+
+    cache.lookup("prompt", "llm")
+    assert cache.metrics_collection.indexes == [("bulk_write", 1)]
@@ -0,0 +1,43 @@
+import pytest
+
+from src.rag import loader_registry as registry_module
+from src.rag.loader_registry import LoaderRegistry, normalize_extension
+
+class DocxLoader:
+    pass
+
+@pytest.fixture
+def registries(monkeypatch):
+    loaders = LoaderRegistry({".txt": ".streaming_loaders:StreamingTextLoader"})
+    table_loaders = LoaderRegistry({})
+    monkeypatch.setattr(registry_module, "loader_registry", loaders)
+    monkeypatch.setattr(registry_module, "table_loader_registry", table_loaders)
+    return loaders, table_loaders
+
+def test_normalize_extension():
+    assert normalize_extension(" DOCX ") == ".docx"
+    assert normalize_extension(".Md") == ".md"
+
+def test_registered_only_lists_runtime_registrations(registries):
+    loaders, _ = registries
+    assert loaders.registered() == {}
+
+    registry_module.register_loader("DOCX", DocxLoader)
+    assert loaders.registered() == {".docx": DocxLoader}
+    assert loaders["docx"] is DocxLoader
+
+def test_registrations_are_replayed_in_a_fresh_registry(registries, monkeypatch):
+    registry_module.register_loader("docx", DocxLoader)
+    registry_module.register_loader("ods", "pacote.loaders:OdsLoader", table=True)
+    registrations = registry_module.registered_loaders()
+
+    # A spawned worker starts with only the built-in loaders
+    fresh = LoaderRegistry({".txt": ".streaming_loaders:StreamingTextLoader"})
+    fresh_tables = LoaderRegistry({})
+    monkeypatch.setattr(registry_module, "loader_registry", fresh)
+    monkeypatch.setattr(registry_module, "table_loader_registry", fresh_tables)
+    assert ".docx" not in fresh
+
+    registry_module.apply_registered_loaders(registrations)
+    assert fresh[".docx"] is DocxLoader
+    assert fresh_tables.registered() == {".ods": "pacote.loaders:OdsLoader"}
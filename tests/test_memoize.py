@@ -0,0 +1,109 @@
+import asyncio
+
+from src.rag.memoize import invalidates, memoize
+
+class FakeCache:
+    """Cache em memória com gerações, no formato usado por memoize/invalidates."""
+
+    def __init__(self):
+        self.values = {}
+        self.generations = {}
+
+    def get_generations(self, namespaces):
+        return {namespace: self.generations.get(namespace, 0) for namespace in namespaces}
+
+    def get_or_set(self, prefix, params, compute, ttl=None):
+        key = (prefix, repr(params))
+        if key not in self.values:
+            self.values[key] = compute()
+        return self.values[key]
+
+    def invalidate(self, namespace):
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        return 1
+
+class AsyncFakeCache(FakeCache):
+    async def get_generations(self, namespaces):
+        return FakeCache.get_generations(self, namespaces)
+
+    async def get_or_set(self, prefix, params, compute, ttl=None):
+        key = (prefix, repr(params))
+        if key not in self.values:
+            self.values[key] = await compute()
+        return self.values[key]
+
+    async def invalidate(self, namespace):
+        return FakeCache.invalidate(self, namespace)
+
+def make_repository(cache):
+    class Repository:
+        def __init__(self):
+            self.calls = 0
+            self.items = {"1": {"title": "a", "tags": []}}
+
+        @memoize("items.get", tags=["item:{item_id}"], cache_manager=lambda: cache)
+        def get(self, item_id):
+            self.calls += 1
+            return self.items[item_id]
+
+        @invalidates(["item:{item_id}"], cache_manager=lambda: cache)
+        def rename(self, item_id, title):
+            self.items[item_id] = {**self.items[item_id], "title": title}
+
+    return Repository()
+
+def test_memoized_calls_reuse_the_cached_value():
+    repository = make_repository(FakeCache())
+    assert repository.get("1") == repository.get("1")
+    assert repository.calls == 1
+
+def test_memoized_results_are_copies():
+    repository = make_repository(FakeCache())
+    first = repository.get("1")
+    first["tags"].append("mutated")
+
+    assert repository.get("1")["tags"] == []
+
+def test_invalidates_bumps_the_tag_generation():
+    repository = make_repository(FakeCache())
+    repository.get("1")
+    repository.rename("1", "b")
+
+    assert repository.get("1")["title"] == "b"
+    assert repository.calls == 2
+
+def test_async_memoize_returns_copies():
+    cache = AsyncFakeCache()
+
+    class Repository:
+        calls = 0
+
+        @memoize("items.list", tags=["items"], cache_manager=lambda: cache)
+        async def list(self):
+            Repository.calls += 1
+            return [{"id": 1}]
+
+        @invalidates(["items"], cache_manager=lambda: cache)
+        async def clear(self):
+            return True
+
+    async def scenario():
+        repository = Repository()
+        (await repository.list()).append({"id": 2})
+        assert await repository.list() == [{"id": 1}]
+        await repository.clear()
+        await repository.list()
+
+    asyncio.run(scenario())
+    assert Repository.calls == 2
+
+def test_cache_failures_fall_back_to_the_function():
+    def broken():
+        raise RuntimeError("cache down")
+
+    class Repository:
+        @memoize("items.get", cache_manager=broken)
+        def get(self):
+            return "value"
+
+    assert Repository().get() == "value"
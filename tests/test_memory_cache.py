@@ -0,0 +1,76 @@
+import time
+
+from src.rag.memory_cache import CacheEntry, MemoryCache
+
+def test_get_returns_stored_entry():
+    cache = MemoryCache()
+    cache.set("a", {"x": 1}, time.time() + 60, compute_time=0.5, size=10, namespace="ns")
+
+    entry = cache.get("a")
+    assert entry.value == {"x": 1}
+    assert entry.compute_time == 0.5
+    assert entry.namespace == "ns"
+
+def test_expired_entry_is_dropped():
+    cache = MemoryCache()
+    cache.set("a", 1, time.time() - 1, size=1)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["items"] == 0
+
+def test_evict_at_limits_memory_lifetime_but_keeps_expiry():
+    cache = MemoryCache()
+    expires_at = time.time() + 3600
+    cache.set("kept", 1, expires_at, size=1, evict_at=time.time() + 60)
+    cache.set("gone", 2, expires_at, size=1, evict_at=time.time() - 1)
+
+    assert cache.get("kept").expires_at == expires_at
+    assert cache.get("gone") is None
+
+def test_local_deadline():
+    assert CacheEntry(1, 100.0).local_deadline == 100.0
+    assert CacheEntry(1, 100.0, evict_at=50.0).local_deadline == 50.0
+    assert CacheEntry(1, 100.0, evict_at=150.0).local_deadline == 100.0
+
+def test_lru_eviction_by_item_count():
+    evicted = []
+    cache = MemoryCache(max_items=2, on_evict=lambda key, entry: evicted.append(key))
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at, size=1)
+    cache.set("b", 2, expires_at, size=1)
+    cache.get("a")  # "b" becomes the least recently used
+    cache.set("c", 3, expires_at, size=1)
+
+    assert evicted == ["b"]
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_eviction_by_bytes_and_oversized_items():
+    cache = MemoryCache(max_bytes=100, max_item_bytes=60)
+    expires_at = time.time() + 60
+
+    assert cache.set("big", 1, expires_at, size=61) is False
+    cache.set("a", 1, expires_at, size=50)
+    cache.set("b", 2, expires_at, size=50)
+    cache.set("c", 3, expires_at, size=50)
+
+    assert cache.get("a") is None
+    assert cache.get_stats()["bytes"] == 100
+
+def test_replacing_key_updates_byte_count():
+    cache = MemoryCache()
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at, size=40)
+    cache.set("a", 2, expires_at, size=10)
+
+    assert cache.get_stats() == {"items": 1, "bytes": 10, "max_items": 1024, "max_bytes": cache.max_bytes}
+
+def test_clear_by_prefix():
+    cache = MemoryCache()
+    expires_at = time.time() + 60
+    for key in ("epics:1", "epics:2", "docs:1"):
+        cache.set(key, key, expires_at, size=1)
+
+    assert cache.clear("epics:") == 2
+    assert cache.get("docs:1") is not None
+    assert cache.delete("docs:1") is True
+    assert cache.delete("docs:1") is False
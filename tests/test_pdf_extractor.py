@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from src.rag import pdf_extractor
+from src.rag.pdf_extractor import OCRRequired, PDFExtractor, split_ranges
+
+def make_extractor():
+    return PDFExtractor(max_workers=1, use_cache=False, ocr_min_chars=5)
+
+def test_pool_workers_defer_ocr_to_the_parent(monkeypatch):
+    monkeypatch.setattr(pdf_extractor.multiprocessing, "parent_process", lambda: object())
+    pages = {0: "texto suficiente", 1: "", 2: " "}
+
+    with pytest.raises(OCRRequired) as raised:
+        make_extractor()._apply_ocr("file.pdf", "abc", pages)
+
+    assert raised.value.file_hash == "abc"
+    assert raised.value.pages == [2, 3]
+    assert pages[1] == ""
+
+def test_ocr_text_from_the_parent_replaces_scanned_pages(monkeypatch):
+    monkeypatch.setattr(pdf_extractor.multiprocessing, "parent_process", lambda: object())
+    pages = {0: "texto suficiente", 1: "", 2: ""}
+
+    # Página 3 falhou no OCR: mantém o texto extraído, sem novo OCRRequired
+    recognized = make_extractor()._apply_ocr("file.pdf", "abc", pages, {2: "reconhecido"})
+
+    assert recognized == [1]
+    assert pages == {0: "texto suficiente", 1: "reconhecido", 2: ""}
+
+def test_ocr_disabled_keeps_pages():
+    pages = {0: ""}
+    extractor = PDFExtractor(max_workers=1, use_cache=False, ocr_min_chars=None)
+    assert extractor._apply_ocr("file.pdf", "abc", pages) == []
+
+def test_ocr_required_survives_the_process_boundary():
+    error = pickle.loads(pickle.dumps(OCRRequired("abc", [1, 4])))
+    assert (error.file_hash, error.pages) == ("abc", [1, 4])
+
+def test_split_ranges_groups_contiguous_pages():
+    assert split_ranges([0, 1, 2, 5, 6, 9], pages_per_task=8) == [(0, 3), (5, 7), (9, 10)]
+
+def test_split_ranges_respects_pages_per_task():
+    assert split_ranges(list(range(7)), pages_per_task=3) == [(0, 3), (3, 6), (6, 7)]
+
+def test_split_ranges_empty():
+    assert split_ranges([], pages_per_task=4) == []
@@ -0,0 +1,119 @@
+import sys
+import types
+
+import pytest
+from langchain_core.documents import Document
+
+from src.rag import streaming_loaders
+from src.rag.streaming_loaders import (
+    StreamingTextLoader,
+    TableCSVLoader,
+    TableExcelLoader,
+    TableLoader,
+    group_rows
+)
+
+def count_words(text):
+    return len(text.split())
+
+def test_group_rows_repeats_header_within_budget():
+    rows = [(1, "a b"), (2, "c d"), (3, "e f")]
+    groups = list(group_rows("h", rows, max_tokens=8, count_tokens=count_words))
+
+    assert groups == [("h\na b\nc d", 1, 2), ("h\ne f", 3, 3)]
+
+def test_group_rows_keeps_oversized_row_alone():
+    rows = [(1, "a"), (2, "x " * 20), (3, "b")]
+    groups = list(group_rows("h", rows, max_tokens=5, count_tokens=count_words))
+
+    assert [(start, end) for _, start, end in groups] == [(1, 1), (2, 2), (3, 3)]
+
+def test_group_rows_without_rows():
+    assert list(group_rows("h", [], max_tokens=10, count_tokens=count_words)) == []
+
+def test_table_loader_is_abstract():
+    with pytest.raises(TypeError):
+        TableLoader("file.csv", max_tokens=10)
+
+def test_table_csv_loader_skips_empty_rows(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("id,name\n1,a\n,\n2,b\n")
+
+    (document,) = TableCSVLoader(str(path), max_tokens=100).lazy_load()
+    assert document.page_content == "id | name\n1 | a\n2 | b"
+    assert document.metadata == {"source": str(path), "row_start": 2, "row_end": 4}
+
+def test_excel_loader_falls_back_without_reader(tmp_path, monkeypatch):
+    class FakeUnstructuredExcelLoader:
+        def __init__(self, file_path):
+            self.file_path = file_path
+
+        def load(self):
+            return [Document(page_content="id name\n1 a", metadata={"source": self.file_path})]
+
+    monkeypatch.setattr(streaming_loaders, "find_spec", lambda name: None)
+    monkeypatch.setitem(
+        sys.modules,
+        "langchain_community.document_loaders",
+        types.SimpleNamespace(UnstructuredExcelLoader=FakeUnstructuredExcelLoader)
+    )
+    path = str(tmp_path / "data.xls")
+
+    documents = list(TableExcelLoader(path, max_tokens=100).lazy_load())
+    assert [document.page_content for document in documents] == ["id name\n1 a"]
+    assert documents[0].metadata["source"] == path
+
+def test_excel_loader_reads_xlsx_sheets(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Vendas"
+    workbook.active.append(["id", "total"])
+    workbook.active.append([1, 10])
+    path = tmp_path / "data.xlsx"
+    workbook.save(path)
+
+    (document,) = TableExcelLoader(str(path), max_tokens=100).lazy_load()
+    assert document.page_content == "Planilha: Vendas\nid | total\n1 | 10"
+    assert document.metadata["sheet"] == "Vendas"
+
+def make_text():
+    return "\n\n".join(
+        f"Parágrafo {number}. " + " ".join(f"palavra{index}" for index in range(number % 7 + 3))
+        for number in range(200)
+    )
+
+def test_streaming_text_loader_offsets_match_the_file(tmp_path):
+    text = make_text()
+    path = tmp_path / "notes.txt"
+    path.write_text(text, encoding="utf-8")
+
+    loader = StreamingTextLoader(str(path), chunk_size=120, chunk_overlap=20)
+    loader.read_size = 500  # várias janelas
+    documents = list(loader.lazy_load())
+
+    assert len(documents) > 10
+    for document in documents:
+        start = document.metadata["start_index"]
+        assert len(document.page_content) <= 120
+        assert text[start:start + len(document.page_content)] == document.page_content
+        assert document.metadata["source"] == str(path)
+    starts = [document.metadata["start_index"] for document in documents]
+    assert starts == sorted(starts)
+    assert text.endswith(documents[-1].page_content)
+
+def test_streaming_text_loader_matches_the_whole_file_split(tmp_path):
+    text = make_text()
+    path = tmp_path / "notes.txt"
+    path.write_text(text, encoding="utf-8")
+
+    loader = StreamingTextLoader(str(path), chunk_size=120, chunk_overlap=20)
+    expected = [document.page_content for document in loader._split(text)]
+    loader.read_size = 700
+
+    assert [document.page_content for document in loader.lazy_load()] == expected
+
+def test_streaming_text_loader_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+
+    assert list(StreamingTextLoader(str(path)).lazy_load()) == []
@@ -0,0 +1,102 @@
+import re
+
+import pytest
+
+from src.utils import text_chunker
+from src.utils.text_chunker import TextChunker
+
+class FakeEncoding:
+    """Tokens of up to 3 non-space characters, each with its leading whitespace."""
+
+    def __init__(self):
+        self.last_text = ""
+
+    @staticmethod
+    def _pieces(text):
+        return [(match.start(), match.group()) for match in re.finditer(r"\s*\S{1,3}|\s+$", text)]
+
+    def encode_ordinary(self, text):
+        self.last_text = text
+        return [len(piece) for _, piece in self._pieces(text)]
+
+    def encode_ordinary_batch(self, texts):
+        return [[len(piece) for _, piece in self._pieces(text)] for text in texts]
+
+    def decode_with_offsets(self, tokens):
+        return self.last_text, [start for start, _ in self._pieces(self.last_text)]
+
+@pytest.fixture
+def fake_encoding(monkeypatch):
+    encoding = FakeEncoding()
+    monkeypatch.setattr(text_chunker, "get_encoding", lambda name=None: encoding)
+    return encoding
+
+def words(count):
+    return " ".join(f"palavra{index % 13}" for index in range(count))
+
+def test_default_chunker_does_not_load_the_tokenizer(monkeypatch):
+    def unavailable(name=None):
+        raise ConnectionError("encoding not cached")
+
+    monkeypatch.setattr(text_chunker, "get_encoding", unavailable)
+    chunks = TextChunker(chunk_size=50, overlap=10).split(words(40))
+
+    assert chunks and all(chunk.token_count is None for chunk in chunks)
+
+def test_long_runs_without_spaces_make_progress():
+    text = "x" * 10000
+    spans = [(chunk.start, chunk.end) for chunk in TextChunker(chunk_size=100, overlap=20).split(text)]
+
+    assert spans[0] == (0, 100)
+    assert spans[-1][1] == len(text)
+    assert all(end - start <= 100 for start, end in spans)
+    assert all(b[0] > a[0] for a, b in zip(spans, spans[1:]))
+    assert len(spans) <= len(text) // 80 + 1
+
+def test_overlap_stays_within_bounds():
+    text = words(500)
+    chunks = TextChunker(chunk_size=120, overlap=30).split(text)
+
+    for chunk in chunks:
+        assert chunk.end - chunk.start <= 120
+        assert text[chunk.start:chunk.end] == chunk.text
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous.end - 30 <= current.start < previous.end
+        # Chunks start on a word
+        assert text[current.start - 1].isspace()
+    assert chunks[-1].end == len(text)
+
+def test_mixed_text_cuts_inside_unbroken_runs():
+    text = "curto " + "y" * 300 + " fim"
+    chunks = TextChunker(chunk_size=100, overlap=10).split(text)
+
+    assert chunks[-1].end == len(text)
+    assert all(chunk.end - chunk.start <= 100 for chunk in chunks)
+
+def test_token_mode_spans_and_counts(fake_encoding):
+    text = words(200)
+    chunker = TextChunker(chunk_size=40, overlap=8, length_unit="tokens")
+    chunks = chunker.split(text)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.token_count <= 40
+        assert text[chunk.start:chunk.end] == chunk.text
+        assert len(fake_encoding.encode_ordinary(chunk.text)) == chunk.token_count
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.start < previous.end
+        assert text[current.start].isspace() or text[current.start - 1].isspace()
+    assert chunks[-1].end == len(text)
+
+def test_count_tokens_in_char_mode(fake_encoding):
+    chunks = TextChunker(chunk_size=50, overlap=10, count_tokens=True).split(words(30))
+
+    assert [chunk.token_count for chunk in chunks] == [
+        len(fake_encoding.encode_ordinary(chunk.text)) for chunk in chunks
+    ]
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=10, overlap=10)
+    with pytest.raises(ValueError):
+        TextChunker(length_unit="words")
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+
+from src.api.middleware.upload_limit import MULTIPART_OVERHEAD, UploadSizeLimitMiddleware
+
+PATH = "/api/documents/documents/upload"
+
+async def read_body_app(scope, receive, send):
+    while True:
+        message = await receive()
+        if not message.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def run(middleware, path, chunks, content_length=None):
+    headers = [] if content_length is None else [(b"content-length", str(content_length).encode())]
+    scope = {"type": "http", "method": "POST", "path": path, "headers": headers}
+    messages = iter([
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ])
+    read = []
+    sent = []
+
+    async def receive():
+        message = next(messages)
+        read.append(message)
+        return message
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return read, sent
+
+def test_declared_length_over_the_limit_is_rejected_unread():
+    middleware = UploadSizeLimitMiddleware(read_body_app, max_body_size=10, paths=[PATH])
+    read, sent = run(middleware, PATH, [b"x"], content_length=10 + MULTIPART_OVERHEAD + 1)
+
+    assert read == []
+    assert sent[0]["status"] == 413
+
+def test_streamed_body_is_cut_off_at_the_limit():
+    middleware = UploadSizeLimitMiddleware(read_body_app, max_body_size=0, paths=[PATH])
+    chunk = b"x" * (MULTIPART_OVERHEAD // 2)
+
+    with pytest.raises(HTTPException) as raised:
+        run(middleware, PATH, [chunk] * 10)
+
+    assert raised.value.status_code == 413
+
+def test_small_bodies_and_other_paths_pass_through():
+    middleware = UploadSizeLimitMiddleware(read_body_app, max_body_size=0, paths=[PATH])
+    big = [b"x" * (MULTIPART_OVERHEAD + 1)]
+
+    assert run(middleware, PATH, [b"small"], content_length=5)[1][0]["status"] == 200
+    assert run(middleware, "/api/documents/documents/upload/bulk", big)[1][0]["status"] == 200